@@ -0,0 +1,135 @@
+"""
+Compare per-call AsyncClient construction with the pooled YNABClient.
+
+Starts a local stand-in for the YNAB API (optionally over TLS with a throwaway
+self-signed certificate) and times sequential GET /budgets round trips.
+
+    python benchmarks/client_latency.py --requests 200 --tls
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from httpx import AsyncClient  # noqa: E402
+from YNABClient import YNABClient  # noqa: E402
+
+BODY = json.dumps(
+    {"data": {"budgets": [{"id": "last-used", "name": "Benchmark"}]}}
+).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_server(tls: bool) -> tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    scheme = "http"
+    if tls:
+        directory = tempfile.mkdtemp()
+        cert = os.path.join(directory, "cert.pem")
+        key = os.path.join(directory, "key.pem")
+        subprocess.run(
+            [
+                "openssl",
+                "req",
+                "-x509",
+                "-newkey",
+                "rsa:2048",
+                "-nodes",
+                "-keyout",
+                key,
+                "-out",
+                cert,
+                "-days",
+                "1",
+                "-subj",
+                "/CN=localhost",
+                "-addext",
+                "subjectAltName=IP:127.0.0.1",
+            ],
+            check=True,
+            capture_output=True,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        # httpx picks this up for both the per-call and the pooled client.
+        os.environ["SSL_CERT_FILE"] = cert
+        scheme = "https"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"{scheme}://127.0.0.1:{server.server_address[1]}/v1"
+
+
+async def per_call(base_url: str, count: int) -> list[float]:
+    """The previous behaviour: a fresh AsyncClient, and connection, per request."""
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        async with AsyncClient() as client:
+            response = await client.get(f"{base_url}/budgets")
+            response.json()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def pooled(base_url: str, count: int) -> list[float]:
+    timings = []
+    async with YNABClient(api_token="benchmark", base_url=base_url) as ynab:
+        for _ in range(count):
+            start = time.perf_counter()
+            await ynab.Send("GET", "/budgets")
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p50 = statistics.median(timings) * 1000
+    p99 = timings[int(len(timings) * 0.99) - 1] * 1000
+    print(
+        f"{name:<10} p50 {p50:8.3f} ms   p99 {p99:8.3f} ms   total {sum(timings):.3f} s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--tls", action="store_true")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.tls)
+    try:
+        report("per-call", await per_call(base_url, args.requests))
+        report("pooled", await pooled(base_url, args.requests))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,425 @@
+"""
+A local stand-in for the YNAB API, seeded with one synthetic budget.
+
+Serves the endpoints this server uses, including delta requests
+(last_knowledge_of_server) and writes, with optional added latency and
+injected 429 responses. GET /__stats returns request counts and bytes
+transferred since the last GET /__stats?reset=1; GET /__seed returns ids to
+drive tools with.
+
+    python benchmarks/fake_ynab.py --port 8765 --transactions 100000 --latency-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import uuid
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+BUDGET_ID = "00000000-0000-4000-8000-000000000001"
+
+
+class Budget:
+    """A synthetic budget whose entities carry the server_knowledge they last changed at."""
+
+    def __init__(
+        self,
+        transactions: int = 10_000,
+        accounts: int = 10,
+        payees: int = 500,
+        categories: int = 100,
+        months: int = 24,
+        seed: int = 1,
+    ) -> None:
+        self._rng = random.Random(seed)
+        self.knowledge = 1
+        self.accounts = {x["id"]: x for x in map(self._Account, range(accounts))}
+        self.payees = {x["id"]: x for x in map(self._Payee, range(payees))}
+        self.groups = [self._Group(i) for i in range(max(1, categories // 10))]
+        self.categories = {x["id"]: x for x in map(self._Category, range(categories))}
+        self.months = [f"{2026 - i // 12}-{12 - i % 12:02d}-01" for i in range(months)]
+        self.transactions = {
+            x["id"]: x for x in map(self._Transaction, range(transactions))
+        }
+        self._changed: dict[str, int] = {}
+
+    def _Id(self) -> str:
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+
+    def _Account(self, i: int) -> dict[str, Any]:
+        balance = self._rng.randint(-1_000_000, 10_000_000)
+        return {
+            "id": self._Id(),
+            "name": f"Account {i}",
+            "type": self._rng.choice(["checking", "savings", "creditCard"]),
+            "on_budget": True,
+            "closed": False,
+            "note": None,
+            "balance": balance,
+            "cleared_balance": balance,
+            "uncleared_balance": 0,
+            "transfer_payee_id": self._Id(),
+            "last_reconciled_at": None,
+            "debt_original_balance": None,
+            "debt_interest_rates": {},
+            "debt_minimum_payments": {},
+            "debt_escrow_amounts": {},
+            "deleted": False,
+        }
+
+    def _Payee(self, i: int) -> dict[str, Any]:
+        return {
+            "id": self._Id(),
+            "name": f"Payee {i}",
+            "transfer_account_id": None,
+            "deleted": False,
+        }
+
+    def _Group(self, i: int) -> dict[str, Any]:
+        return {"id": self._Id(), "name": f"Group {i}", "hidden": False}
+
+    def _Category(self, i: int) -> dict[str, Any]:
+        group = self.groups[i % len(self.groups)]
+        return {
+            "id": self._Id(),
+            "category_group_id": group["id"],
+            "category_group_name": group["name"],
+            "name": f"Category {i}",
+            "hidden": False,
+            "note": None,
+            "budgeted": self._rng.randint(0, 500_000),
+            "activity": -self._rng.randint(0, 500_000),
+            "balance": self._rng.randint(-50_000, 300_000),
+            "goal_type": None,
+            "deleted": False,
+        }
+
+    def _Transaction(self, i: int) -> dict[str, Any]:
+        account = self._rng.choice(list(self.accounts.values()))
+        payee = self._rng.choice(list(self.payees.values()))
+        category = self._rng.choice(list(self.categories.values()))
+        return {
+            "id": self._Id(),
+            "date": self._rng.choice(self.months)[:8]
+            + f"{self._rng.randint(1, 28):02d}",
+            "amount": self._rng.randint(-500_000, 200_000) // 10 * 10,
+            "memo": self._rng.choice([None, None, "Groceries", "Fuel", "Rent"]),
+            "cleared": self._rng.choice(["cleared", "uncleared", "reconciled"]),
+            "approved": True,
+            "flag_color": None,
+            "flag_name": None,
+            "account_id": account["id"],
+            "account_name": account["name"],
+            "payee_id": payee["id"],
+            "payee_name": payee["name"],
+            "category_id": category["id"],
+            "category_name": category["name"],
+            "transfer_account_id": None,
+            "transfer_transaction_id": None,
+            "matched_transaction_id": None,
+            "import_id": None,
+            "import_payee_name": None,
+            "import_payee_name_original": None,
+            "debt_transaction_type": None,
+            "deleted": False,
+            "subtransactions": [],
+        }
+
+    def Since(self, entities: dict[str, dict[str, Any]], knowledge: int | None) -> list:
+        if knowledge is None:
+            return list(entities.values())
+        return [x for id, x in entities.items() if self._changed.get(id, 0) > knowledge]
+
+    def Change(
+        self, entities: dict[str, dict[str, Any]], entity: dict[str, Any]
+    ) -> None:
+        self.knowledge += 1
+        entities[entity["id"]] = entity
+        self._changed[entity["id"]] = self.knowledge
+
+    def CategoryGroups(self, knowledge: int | None) -> list[dict[str, Any]]:
+        categories = self.Since(self.categories, knowledge)
+        return [
+            {
+                **group,
+                "deleted": False,
+                "categories": [
+                    x for x in categories if x["category_group_id"] == group["id"]
+                ],
+            }
+            for group in self.groups
+        ]
+
+    def Full(self, knowledge: int | None) -> dict[str, Any]:
+        """The budget as /budgets/{id} returns it, entities changed since knowledge."""
+        transactions = self.Since(self.transactions, knowledge)
+        names = ("account_name", "payee_name", "category_name", "subtransactions")
+        return {
+            "id": BUDGET_ID,
+            "name": "Benchmark",
+            "first_month": self.months[-1],
+            "last_month": self.months[0],
+            "accounts": self.Since(self.accounts, knowledge),
+            "payees": self.Since(self.payees, knowledge),
+            "category_groups": [
+                {**x, "deleted": False}
+                for x in (self.groups if knowledge is None else [])
+            ],
+            "categories": [
+                {k: v for k, v in x.items() if k != "category_group_name"}
+                for x in self.Since(self.categories, knowledge)
+            ],
+            "months": [
+                self.Month(x) for x in (self.months if knowledge is None else [])
+            ],
+            "transactions": [
+                {k: v for k, v in x.items() if k not in names} for x in transactions
+            ],
+            "subtransactions": [
+                {"transaction_id": x["id"], **part}
+                for x in transactions
+                for part in x["subtransactions"]
+            ],
+        }
+
+    def Month(self, month: str) -> dict[str, Any]:
+        return {
+            "month": month,
+            "note": None,
+            "income": 5_000_000,
+            "budgeted": 4_000_000,
+            "activity": -3_500_000,
+            "to_be_budgeted": 0,
+            "age_of_money": 30,
+            "deleted": False,
+            "categories": list(self.categories.values()),
+        }
+
+
+class FakeYNAB:
+    """The Starlette app serving a Budget, with latency and 429 injection."""
+
+    def __init__(
+        self, budget: Budget, latency: float = 0.0, throttle_every: int = 0
+    ) -> None:
+        self.budget = budget
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.served = 0
+        self.stats: dict[str, Any] = {}
+        self.Reset()
+        self.app = Starlette(
+            routes=[
+                Route("/__stats", self._Stats),
+                Route("/__seed", self._Seed),
+                Route(
+                    "/v1/{path:path}",
+                    self._Handle,
+                    methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
+                ),
+            ]
+        )
+
+    def Reset(self) -> None:
+        self.stats = {
+            "requests": 0,
+            "throttled": 0,
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "endpoints": {},
+        }
+
+    async def _Stats(self, request: Request) -> Response:
+        body = json.dumps(self.stats)
+        if request.query_params.get("reset"):
+            self.Reset()
+        return Response(body, media_type="application/json")
+
+    async def _Seed(self, request: Request) -> Response:
+        budget = self.budget
+        return Response(
+            json.dumps(
+                {
+                    "budget_id": BUDGET_ID,
+                    "account_ids": list(budget.accounts)[:3],
+                    "payee_ids": list(budget.payees)[:3],
+                    "category_ids": list(budget.categories)[:3],
+                    "transaction_ids": list(budget.transactions)[:3],
+                    "months": budget.months[:3],
+                }
+            ),
+            media_type="application/json",
+        )
+
+    async def _Handle(self, request: Request) -> Response:
+        body = await request.body()
+        self.served += 1
+        self.stats["requests"] += 1
+        self.stats["bytes_in"] += len(body)
+        endpoint = f"{request.method} " + re.sub(
+            r"[0-9a-f]{8}-[0-9a-f-]{27}|\d{4}-\d{2}-\d{2}", "{id}", request.url.path
+        )
+        endpoints = self.stats["endpoints"]
+        endpoints[endpoint] = endpoints.get(endpoint, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.throttle_every and self.served % self.throttle_every == 0:
+            self.stats["throttled"] += 1
+            return self._Json(
+                429,
+                {"error": {"id": "429", "name": "too_many_requests", "detail": ""}},
+                {"Retry-After": "0"},
+            )
+        try:
+            payload = json.loads(body) if body else {}
+            status, data = self._Route(
+                request.method,
+                request.path_params["path"].strip("/").split("/"),
+                request.query_params.get("last_knowledge_of_server"),
+                payload,
+            )
+        except LookupError:
+            status, data = 404, None
+        if data is None:
+            return self._Json(
+                404,
+                {"error": {"id": "404.2", "name": "resource_not_found", "detail": ""}},
+            )
+        return self._Json(status, {"data": data})
+
+    def _Json(
+        self,
+        status: int,
+        content: dict[str, Any],
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        body = json.dumps(content).encode()
+        self.stats["bytes_out"] += len(body)
+        return Response(body, status, headers, media_type="application/json")
+
+    def _Route(
+        self, method: str, segments: list[str], knowledge: str | None, payload: dict
+    ) -> tuple[int, dict[str, Any] | None]:
+        budget = self.budget
+        since = int(knowledge) if knowledge else None
+        if segments == ["budgets"]:
+            return 200, {
+                "budgets": [
+                    {
+                        "id": BUDGET_ID,
+                        "name": "Benchmark",
+                        "first_month": budget.months[-1],
+                        "last_month": budget.months[0],
+                    }
+                ]
+            }
+        if segments[0] != "budgets" or segments[1] not in (BUDGET_ID, "last-used"):
+            return 404, None
+        rest = segments[2:]
+        if method == "GET" and not rest:
+            return 200, {
+                "budget": budget.Full(since),
+                "server_knowledge": budget.knowledge,
+            }
+        if method == "GET" and rest in (["accounts"], ["payees"], ["transactions"]):
+            entities = getattr(budget, rest[0])
+            return 200, {
+                rest[0]: budget.Since(entities, since),
+                "server_knowledge": budget.knowledge,
+            }
+        if method == "GET" and rest == ["categories"]:
+            return 200, {
+                "category_groups": budget.CategoryGroups(since),
+                "server_knowledge": budget.knowledge,
+            }
+        if method == "GET" and rest == ["months"]:
+            return 200, {
+                "months": [
+                    {k: v for k, v in budget.Month(x).items() if k != "categories"}
+                    for x in budget.months
+                ],
+                "server_knowledge": budget.knowledge,
+            }
+        if method == "GET" and len(rest) == 2 and rest[0] == "months":
+            return 200, {"month": budget.Month(rest[1])}
+        if len(rest) == 4 and rest[0] == "months" and rest[2] == "categories":
+            category = budget.categories[rest[3]]
+            if method != "GET":
+                category = {**category, **payload.get("category", {})}
+                budget.Change(budget.categories, category)
+            return 200, {"category": category}
+        if len(rest) == 2 and rest[0] == "categories" and method != "GET":
+            category = {**budget.categories[rest[1]], **payload.get("category", {})}
+            budget.Change(budget.categories, category)
+            return 200, {"category": category}
+        if rest == ["transactions"] and method == "POST":
+            many = "transactions" in payload
+            created = []
+            for x in payload.get("transactions") or [payload.get("transaction", {})]:
+                transaction = {**budget._Transaction(0), **x, "id": budget._Id()}
+                budget.Change(budget.transactions, transaction)
+                created.append(transaction)
+            if many:
+                return 201, {
+                    "transactions": created,
+                    "transaction_ids": [x["id"] for x in created],
+                    "duplicate_import_ids": [],
+                    "server_knowledge": budget.knowledge,
+                }
+            return 201, {"transaction": created[0]}
+        if rest == ["transactions"] and method == "PATCH":
+            updated = []
+            for x in payload.get("transactions", []):
+                transaction = {**budget.transactions[x["id"]], **x}
+                budget.Change(budget.transactions, transaction)
+                updated.append(transaction)
+            return 200, {
+                "transactions": updated,
+                "server_knowledge": budget.knowledge,
+            }
+        if len(rest) == 2 and rest[0] == "transactions":
+            transaction = budget.transactions[rest[1]]
+            if method == "DELETE":
+                transaction = {**transaction, "deleted": True}
+                budget.Change(budget.transactions, transaction)
+            elif method != "GET":
+                transaction = {**transaction, **payload.get("transaction", {})}
+                budget.Change(budget.transactions, transaction)
+            return 200, {"transaction": transaction}
+        return 404, None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--transactions", type=int, default=10_000)
+    parser.add_argument("--accounts", type=int, default=10)
+    parser.add_argument("--payees", type=int, default=500)
+    parser.add_argument("--categories", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--throttle-every", type=int, default=0, help="answer every Nth request 429"
+    )
+    args = parser.parse_args()
+
+    import uvicorn
+
+    fake = FakeYNAB(
+        Budget(args.transactions, args.accounts, args.payees, args.categories),
+        latency=args.latency_ms / 1000,
+        throttle_every=args.throttle_every,
+    )
+    uvicorn.run(fake.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Load test of the streamable-HTTP transport with many concurrent clients.
+
+Starts fake_ynab.py and the server (YNAB_TRANSPORT=streamable-http) in
+subprocesses, then opens --clients MCP sessions at once, each calling a mix of
+read tools --calls times. Reports throughput, p50/p99 latency and how many
+requests reached the stand-in: with one shared context, the upstream count stays
+roughly flat as clients are added instead of growing with them.
+
+    python benchmarks/http_load.py --clients 1 10 50 --calls 20 --workers 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Any
+
+import httpx
+from mcp import ClientSession
+from mcp.client.streamable_http import streamable_http_client
+
+from tools import fetch, free_port, percentile, start_fake
+
+MIX = [
+    ("get_budgets", lambda seed, n: {}),
+    ("get_accounts", lambda seed, n: {"budget": {"id": seed["budget_id"]}}),
+    ("get_payees", lambda seed, n: {}),
+    ("get_categories", lambda seed, n: {}),
+    (
+        "get_transactions_for_account",
+        lambda seed, n: {
+            "account": {"id": seed["account_ids"][n % len(seed["account_ids"])]},
+            "page_size": 100,
+        },
+    ),
+    ("summarize_transactions", lambda seed, n: {"group_by": ["month"]}),
+]
+
+
+def start_server(args: argparse.Namespace, base: str) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    environment = {
+        **os.environ,
+        "YNAB_API_TOKEN": "benchmark",
+        "YNAB_API_BASE": f"{base}/v1",
+        "YNAB_RATE_LIMIT": "1000000",
+        "YNAB_TRANSPORT": "streamable-http",
+        "YNAB_PORT": str(port),
+        "YNAB_WORKERS": str(args.workers),
+    }
+    environment.pop("YNAB_STORE_PATH", None)
+    process = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=os.path.join(os.path.dirname(__file__), "..", "src"),
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        try:
+            httpx.get(f"{url}/metrics")
+            return process, f"{url}/mcp"
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+async def client(url: str, seed: dict[str, Any], index: int, calls: int) -> list:
+    latencies = []
+    async with httpx.AsyncClient(timeout=120) as http:
+        async with streamable_http_client(url, http_client=http) as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                for n in range(calls):
+                    name, arguments = MIX[(index + n) % len(MIX)]
+                    start = time.perf_counter()
+                    result = await session.call_tool(name, arguments(seed, index + n))
+                    latencies.append((time.perf_counter() - start, result.isError))
+    return latencies
+
+
+async def run(url: str, seed: dict[str, Any], clients: int, calls: int) -> tuple:
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(client(url, seed, i, calls) for i in range(clients))
+    )
+    return [x for latencies in results for x in latencies], time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--transactions", type=int, default=10_000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    args = parser.parse_args()
+
+    fake, base = start_fake(args)
+    server = None
+    try:
+        server, url = start_server(args, base)
+        seed = fetch(f"{base}/__seed")
+        print(
+            f"{'clients':>7} {'calls':>6} {'errors':>6} {'calls/s':>8} {'p50 ms':>8}"
+            f" {'p99 ms':>8} {'upstream':>8}"
+        )
+        for clients in args.clients:
+            fetch(f"{base}/__stats?reset=1")
+            results, elapsed = asyncio.run(run(url, seed, clients, args.calls))
+            stats = fetch(f"{base}/__stats?reset=1")
+            latencies = [seconds * 1000 for seconds, _ in results]
+            print(
+                f"{clients:>7} {len(results):>6} {sum(e for _, e in results):>6}"
+                f" {len(results) / elapsed:>8.1f} {percentile(latencies, 50):>8.1f}"
+                f" {percentile(latencies, 99):>8.1f} {stats['requests']:>8}"
+            )
+    finally:
+        for process in (server, fake):
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Micro-benchmark of building and serializing Transaction, Category and Account
+models from YNAB rows.
+
+Compares per-row keyword construction (Model(**row)), the list validation
+Models.Many uses and, for reference, unvalidated model_construct. Serialization
+compares json.dumps over model_dump with pydantic-core's to_json. With --check
+the script exits non-zero if Models.Many is slower than per-row construction.
+
+    python benchmarks/model_validation.py --rows 10000 100000 --check
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+import uuid
+
+from pydantic_core import to_json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from Account import Account  # noqa: E402
+from Category import Category  # noqa: E402
+from Models import Models  # noqa: E402
+from Transaction import Transaction  # noqa: E402
+from transaction_store import transactions  # noqa: E402
+
+
+def categories(count: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "category_group_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "category_group_name": f"Group {i % 20}",
+            "name": f"Category {i}",
+            "hidden": False,
+            "original_category_group_id": None,
+            "note": None,
+            "budgeted": rng.randint(0, 500_000),
+            "activity": -rng.randint(0, 500_000),
+            "balance": rng.randint(-100_000, 400_000),
+            "goal_type": rng.choice([None, "TB", "TBD", "MF", "NEED"]),
+            "goal_needs_whole_amount": None,
+            "goal_day": None,
+            "goal_cadence": 1,
+            "goal_cadence_frequency": 1,
+            "goal_creation_month": "2024-01-01",
+            "goal_target": 250_000,
+            "goal_target_month": None,
+            "goal_percentage_complete": rng.randint(0, 100),
+            "goal_months_to_budget": 1,
+            "goal_under_funded": 0,
+            "goal_overall_funded": 100_000,
+            "goal_overall_left": 150_000,
+            "goal_snoozed_at": None,
+            "deleted": False,
+        }
+        for i in range(count)
+    ]
+
+
+def accounts(count: int, seed: int = 1) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": f"Account {i}",
+            "type": rng.choice(["checking", "savings", "creditCard", "mortgage"]),
+            "on_budget": True,
+            "closed": False,
+            "note": None,
+            "balance": rng.randint(-1_000_000, 5_000_000),
+            "cleared_balance": rng.randint(-1_000_000, 5_000_000),
+            "uncleared_balance": 0,
+            "transfer_payee_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "direct_import_linked": False,
+            "direct_import_in_error": False,
+            "last_reconciled_at": "2024-05-01T10:00:00Z",
+            "debt_original_balance": None,
+            "debt_interest_rates": {"2024-01-01": 3250},
+            "debt_minimum_payments": {"2024-01-01": 150_000},
+            "debt_escrow_amounts": {},
+            "deleted": False,
+        }
+        for i in range(count)
+    ]
+
+
+def best(function, repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    print(
+        f"{'model':<12} {'rows':>7} {'Model(**x)':>11} {'Models.Many':>12}"
+        f" {'construct':>10} {'json.dumps':>11} {'to_json':>8}   (ms)"
+    )
+    regressions = []
+    for model, generate in (
+        (Transaction, lambda n: list(transactions(n))),
+        (Category, categories),
+        (Account, accounts),
+    ):
+        for count in args.rows:
+            rows = generate(count)
+            models = Models.Many(model, rows)
+            timings = [
+                best(lambda: [model(**x) for x in rows], args.repeat),
+                best(lambda: Models.Many(model, rows), args.repeat),
+                best(lambda: [model.model_construct(**x) for x in rows], args.repeat),
+                best(
+                    lambda: json.dumps([x.model_dump(mode="json") for x in models]),
+                    args.repeat,
+                ),
+                best(lambda: to_json(models), args.repeat),
+            ]
+            print(
+                f"{model.__name__:<12} {count:>7}"
+                + "".join(
+                    f" {x * 1000:>{width}.1f}"
+                    for x, width in zip(timings, (11, 12, 10, 11, 8))
+                )
+            )
+            if timings[1] > timings[0]:
+                regressions.append(f"{model.__name__} x {count}")
+
+    if args.check and regressions:
+        print(f"Models.Many slower than Model(**x) for: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
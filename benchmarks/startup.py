@@ -0,0 +1,139 @@
+"""
+Cold-start benchmark of the stdio server.
+
+Spawns src/main.py the way a desktop client does and times, from spawn, the
+initialize response, tools/list and the first tool call (get_budgets, against
+fake_ynab.py). Runs with and without the tool definition cache, and prints the
+modules that take longest to import.
+
+The target: initialize must answer within --budget-ms of the floor, which is
+the time to spawn Python and import the MCP SDK's server alone. With --check
+the script exits non-zero when the median misses it.
+
+    python benchmarks/startup.py --runs 5 --check
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from tools import start_fake
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+async def start(environment: dict[str, str]) -> tuple[float, float, float]:
+    parameters = StdioServerParameters(
+        command=sys.executable, args=["main.py"], cwd=SRC, env=environment
+    )
+    began = time.perf_counter()
+    with open(os.devnull, "w") as errors:
+        async with stdio_client(parameters, errlog=errors) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                initialized = time.perf_counter()
+                await session.list_tools()
+                listed = time.perf_counter()
+                await session.call_tool("get_budgets", {})
+                called = time.perf_counter()
+    return initialized - began, listed - began, called - began
+
+
+def floor(runs: int) -> float:
+    """Median seconds to spawn Python and import the MCP server package."""
+    times = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import mcp.server.fastmcp; print(flush=True)"],
+            stdout=subprocess.PIPE,
+        )
+        process.stdout.readline()
+        times.append(time.perf_counter() - began)
+        process.wait()
+    return statistics.median(times)
+
+
+def imports(count: int) -> list[tuple[int, str]]:
+    """The slowest top-level imports of main, in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "YNAB_API_TOKEN": "benchmark"},
+    )
+    # Children are listed before their parent, indented two more spaces.
+    children: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        depth = len(name) - len(name.lstrip())
+        if depth == 1:
+            if name.strip() == "main":
+                return sorted(children, reverse=True)[:count]
+            children = []
+        elif depth == 3:
+            children.append((int(cumulative), name.strip()))
+    return []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    fake, base = start_fake(
+        argparse.Namespace(transactions=1000, latency_ms=0.0, throttle_every=0)
+    )
+    cache = os.path.join(tempfile.mkdtemp(), "tools.json")
+    environment = {
+        **os.environ,
+        "YNAB_API_TOKEN": "benchmark",
+        "YNAB_API_BASE": f"{base}/v1",
+        "YNAB_TOOL_CACHE": cache,
+    }
+    environment.pop("YNAB_STORE_PATH", None)
+    try:
+        print(f"{'mode':<12} {'initialize':>10} {'tools/list':>10} {'first call':>10}")
+        medians = {}
+        for mode in ("no cache", "cached"):
+            runs = []
+            for _ in range(args.runs):
+                if mode == "no cache" and os.path.exists(cache):
+                    os.remove(cache)
+                runs.append(asyncio.run(start(environment)))
+            medians[mode] = [statistics.median(x) * 1000 for x in zip(*runs)]
+            print(f"{mode:<12}" + "".join(f" {x:>10.0f}" for x in medians[mode]))
+    finally:
+        fake.terminate()
+        fake.wait()
+
+    print("\nslowest imports of main (cumulative ms):")
+    for cumulative, name in imports(8):
+        print(f"  {cumulative / 1000:>8.1f}  {name}")
+
+    base_ms = floor(args.runs) * 1000
+    target = base_ms + args.budget_ms
+    initialize = medians["cached"][0]
+    print(
+        f"\nfloor (python + import mcp.server.fastmcp): {base_ms:.0f} ms;"
+        f" target for initialize: {target:.0f} ms; measured {initialize:.0f} ms"
+    )
+    if args.check and initialize > target:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
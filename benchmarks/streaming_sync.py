@@ -0,0 +1,103 @@
+"""
+Compare peak memory of a full transactions sync that decodes the whole response
+body at once with the streamed sync YNABClient.Sync does.
+
+Serves synthetic budgets (see transaction_store.py) from an in-process transport
+that generates the body as it is read, so the body itself is never held in
+memory by the server side, and reports tracemalloc's peak and what the local
+copy keeps afterwards.
+
+    python benchmarks/streaming_sync.py --transactions 25000 50000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from typing import AsyncIterator
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DeltaSync import DeltaSync  # noqa: E402
+from transaction_store import transactions  # noqa: E402
+from YNABClient import YNABClient  # noqa: E402
+
+PATH = "/budgets/last-used/transactions"
+
+
+class Body(httpx.AsyncByteStream):
+    """A YNAB transactions response generated in chunks as it is read."""
+
+    def __init__(self, count: int, chunk_size: int = 64 * 1024) -> None:
+        self._count = count
+        self._chunk_size = chunk_size
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        pieces = [b'{"data":{"transactions":[']
+        size = len(pieces[0])
+        for i, transaction in enumerate(transactions(self._count)):
+            piece = (b"," if i else b"") + json.dumps(transaction).encode()
+            pieces.append(piece)
+            size += len(piece)
+            if size >= self._chunk_size:
+                yield b"".join(pieces)
+                pieces, size = [], 0
+        pieces.append(b'],"server_knowledge":1}}')
+        yield b"".join(pieces)
+
+
+def transport(count: int) -> httpx.MockTransport:
+    return httpx.MockTransport(lambda request: httpx.Response(200, stream=Body(count)))
+
+
+async def buffered(count: int) -> DeltaSync:
+    """The previous path: read and decode the whole body, then merge it."""
+    async with httpx.AsyncClient(transport=transport(count)) as client:
+        response = await client.get(f"https://api.ynab.com/v1{PATH}")
+        data = response.json()["data"]
+        sync = DeltaSync()
+        sync.Extend(PATH, "transactions", data["transactions"], full=True)
+        sync.Commit(PATH, data["server_knowledge"])
+        return sync
+
+
+async def streamed(count: int) -> DeltaSync:
+    async with YNABClient(api_token="benchmark", transport=transport(count)) as ynab:
+        await ynab.Sync(PATH, "transactions")
+        return ynab.sync
+
+
+def measure(name: str, count: int, sync) -> None:
+    gc.collect()
+    tracemalloc.start()
+    result = asyncio.run(sync(count))
+    gc.collect()
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(
+        f"{count:>8} {name:<10} peak {peak / 2**20:8.1f} MiB  kept {kept / 2**20:8.1f}"
+        f" MiB  transient {(peak - kept) / 2**20:8.1f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--transactions", type=int, nargs="+", default=[25_000, 50_000, 100_000]
+    )
+    args = parser.parse_args()
+    for count in args.transactions:
+        measure("buffered", count, buffered)
+        measure("streamed", count, streamed)
+
+
+if __name__ == "__main__":
+    main()
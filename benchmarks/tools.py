@@ -0,0 +1,262 @@
+"""
+Drive every tool registered in main.py against a local stand-in for the YNAB API.
+
+Starts fake_ynab.py in a subprocess, runs the MCP server in-process through an
+in-memory client session and calls each tool --iterations times. Reports per
+tool the p50/p99 latency (and the first, uncached call), the upstream requests
+and 429s it caused and the bytes transferred, then the server's peak RSS.
+
+    python benchmarks/tools.py --transactions 100000 --latency-ms 50 --throttle-every 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Tool name -> arguments for the nth call, given the ids /__seed returned.
+SCENARIOS: dict[str, Callable[[dict[str, Any], int], dict[str, Any]]] = {
+    "get_budgets": lambda seed, n: {},
+    "get_accounts": lambda seed, n: {"budget": {"id": seed["budget_id"]}},
+    "get_budget_snapshot": lambda seed, n: {"budget": {"id": seed["budget_id"]}},
+    "get_payees": lambda seed, n: {},
+    "get_months": lambda seed, n: {},
+    "get_categories": lambda seed, n: {},
+    "get_category_for_month": lambda seed, n: {
+        "month": {"month": seed["months"][0]},
+        "category": {"id": seed["category_ids"][0]},
+    },
+    "get_category_history": lambda seed, n: {
+        "categories": [{"id": x} for x in seed["category_ids"][:3]],
+        "start": {"month": seed["months"][-1]},
+        "end": {"month": seed["months"][0]},
+    },
+    "get_all_transactions": lambda seed, n: {"page_size": 500},
+    "get_transactions_for_account": lambda seed, n: {
+        "account": {"id": seed["account_ids"][n % len(seed["account_ids"])]}
+    },
+    "get_transactions_for_category": lambda seed, n: {
+        "category": {"id": seed["category_ids"][n % len(seed["category_ids"])]}
+    },
+    "get_transactions_for_payee": lambda seed, n: {
+        "payee": {"id": seed["payee_ids"][n % len(seed["payee_ids"])]}
+    },
+    "get_transactions_for_month": lambda seed, n: {
+        "month": {"month": seed["months"][n % len(seed["months"])]}
+    },
+    "search_transactions": lambda seed, n: {
+        "query": ["groceries", "fule", "payee 1"][n % 3],
+        "filter": {"max_amount": 0},
+        "page_size": 50,
+    },
+    "summarize_transactions": lambda seed, n: {"group_by": ["category", "month"]},
+    "get_status": lambda seed, n: {},
+    "resolve": lambda seed, n: {"name": ["Payee 12", "categroy 7", "acount"][n % 3]},
+    "get_metrics": lambda seed, n: {},
+    "new_transaction": lambda seed, n: {
+        "transaction": {
+            "account_id": seed["account_ids"][0],
+            "amount": -1000 - n,
+            "date": "2026-01-15",
+            "memo": f"benchmark {n}",
+        }
+    },
+    "new_transactions": lambda seed, n: {
+        "transactions": [
+            {
+                "account_id": seed["account_ids"][0],
+                "amount": -10 * i,
+                "date": "2026-01-15",
+                "import_id": f"BENCH:{n}:{i}",
+            }
+            for i in range(20)
+        ]
+    },
+    "check_duplicates": lambda seed, n: {
+        "transactions": [
+            {
+                "account_id": seed["account_ids"][0],
+                "amount": -10 * i,
+                "date": "2026-01-15",
+            }
+            for i in range(20)
+        ]
+    },
+    "update_transaction": lambda seed, n: {
+        "updated_transaction": {"id": seed["transaction_ids"][0], "memo": f"m{n}"}
+    },
+    "update_transactions": lambda seed, n: {
+        "updated_transactions": [
+            {"id": x, "approved": bool(n % 2)} for x in seed["transaction_ids"]
+        ]
+    },
+    "update_category": lambda seed, n: {
+        "category": {"id": seed["category_ids"][0], "note": f"note {n}"}
+    },
+    "update_category_for_month": lambda seed, n: {
+        "category": {"id": seed["category_ids"][0], "budgeted": 1000 * n},
+        "month": {"month": seed["months"][0]},
+    },
+    "delete_transaction": lambda seed, n: {
+        "transaction": {"id": seed["transaction_ids"][n % len(seed["transaction_ids"])]}
+    },
+}
+# Tools run in the order main.py registers them, except these, which would
+# remove the ids later scenarios use.
+LAST = ["delete_transaction"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def fetch(url: str) -> Any:
+    with urllib.request.urlopen(url) as response:
+        return json.loads(response.read())
+
+
+def start_fake(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(os.path.dirname(__file__), "fake_ynab.py"),
+            "--port",
+            str(port),
+            "--transactions",
+            str(args.transactions),
+            "--latency-ms",
+            str(args.latency_ms),
+            "--throttle-every",
+            str(args.throttle_every),
+        ]
+    )
+    base = f"http://127.0.0.1:{port}"
+    for _ in range(600):
+        try:
+            fetch(f"{base}/__stats")
+            return process, base
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("fake YNAB server did not start")
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+async def drive(args: argparse.Namespace, base: str) -> list[dict[str, Any]]:
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    import main
+
+    seed = fetch(f"{base}/__seed")
+    results = []
+    async with create_connected_server_and_client_session(
+        main.mcp._mcp_server
+    ) as session:
+        tools = [x.name for x in (await session.list_tools()).tools]
+        order = [x for x in tools if x not in LAST] + [x for x in LAST if x in tools]
+        for name in order:
+            if args.tools and name not in args.tools:
+                continue
+            if name not in SCENARIOS:
+                results.append({"tool": name, "skipped": "no scenario"})
+                continue
+            fetch(f"{base}/__stats?reset=1")
+            latencies = []
+            errors = 0
+            for n in range(args.iterations):
+                start = time.perf_counter()
+                result = await session.call_tool(name, SCENARIOS[name](seed, n))
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors += bool(result.isError)
+            stats = fetch(f"{base}/__stats?reset=1")
+            results.append(
+                {
+                    "tool": name,
+                    "calls": len(latencies),
+                    "errors": errors,
+                    "first_ms": latencies[0],
+                    "p50_ms": percentile(latencies, 50),
+                    "p99_ms": percentile(latencies, 99),
+                    "requests": stats["requests"],
+                    "throttled": stats["throttled"],
+                    "bytes_in": stats["bytes_in"],
+                    "bytes_out": stats["bytes_out"],
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transactions", type=int, default=10_000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--tools", nargs="*", help="only drive these tools")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="disable the response cache"
+    )
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    process, base = start_fake(args)
+    os.environ.update(
+        {
+            "YNAB_API_TOKEN": "benchmark",
+            "YNAB_API_BASE": f"{base}/v1",
+            # Pace against the stand-in's 429s, not YNAB's hourly quota.
+            "YNAB_RATE_LIMIT": "1000000",
+        }
+    )
+    os.environ.pop("YNAB_STORE_PATH", None)
+    if args.no_cache:
+        os.environ["YNAB_CACHE_MAX_BYTES"] = "0"
+    try:
+        results = asyncio.run(drive(args, base))
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(
+        f"{'tool':<30} {'calls':>5} {'err':>4} {'first':>8} {'p50':>8} {'p99':>8}"
+        f" {'reqs':>5} {'429':>4} {'KiB down':>9} {'KiB up':>7}"
+    )
+    for x in results:
+        if "skipped" in x:
+            print(f"{x['tool']:<30} skipped: {x['skipped']}")
+            continue
+        print(
+            f"{x['tool']:<30} {x['calls']:>5} {x['errors']:>4} {x['first_ms']:>8.1f}"
+            f" {x['p50_ms']:>8.1f} {x['p99_ms']:>8.1f} {x['requests']:>5}"
+            f" {x['throttled']:>4} {x['bytes_out'] / 1024:>9.1f}"
+            f" {x['bytes_in'] / 1024:>7.1f}"
+        )
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mib = peak / 2**20 if sys.platform == "darwin" else peak / 1024
+    print(f"latencies in ms; peak RSS of the MCP server process: {peak_mib:.1f} MiB")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"results": results, "peak_rss_mib": peak_mib}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
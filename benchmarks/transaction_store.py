@@ -0,0 +1,161 @@
+"""
+Compare the memory and build time of the local transaction copy as row dicts and
+pydantic models against the columnar TransactionStore.
+
+Generates a synthetic budget shaped like a real one (a few accounts, a few
+hundred payees and categories, repeated memos, some split transactions),
+round-trips it through JSON as YNAB would send it, and measures each
+representation with tracemalloc.
+
+    python benchmarks/transaction_store.py --transactions 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from typing import Iterator
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from Transaction import Transaction  # noqa: E402
+from TransactionStore import TransactionStore  # noqa: E402
+
+
+def budget(count: int, seed: int = 1) -> bytes:
+    return json.dumps(
+        {"data": {"transactions": list(transactions(count, seed))}}
+    ).encode()
+
+
+def transactions(count: int, seed: int = 1) -> Iterator[dict]:
+    rng = random.Random(seed)
+    accounts = [
+        (str(uuid.UUID(int=rng.getrandbits(128))), f"Account {i}") for i in range(12)
+    ]
+    payees = [
+        (str(uuid.UUID(int=rng.getrandbits(128))), f"Payee {i}") for i in range(600)
+    ]
+    categories = [
+        (str(uuid.UUID(int=rng.getrandbits(128))), f"Category {i}") for i in range(120)
+    ]
+    memos = [None] * 6 + ["Groceries", "Fuel", "Lunch with team", "Monthly rent"]
+    for i in range(count):
+        account = rng.choice(accounts)
+        payee = rng.choice(payees)
+        category = rng.choice(categories)
+        id = str(uuid.UUID(int=rng.getrandbits(128)))
+        transaction = {
+            "id": id,
+            "date": f"20{rng.randint(18, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "amount": rng.randint(-500_000, 200_000) // 10 * 10,
+            "memo": rng.choice(memos) if i % 50 else f"Invoice {i}",
+            "cleared": rng.choice(["cleared", "uncleared", "reconciled"]),
+            "approved": rng.random() > 0.05,
+            "flag_color": None,
+            "flag_name": None,
+            "account_id": account[0],
+            "account_name": account[1],
+            "payee_id": payee[0],
+            "payee_name": payee[1],
+            "category_id": category[0],
+            "category_name": category[1],
+            "transfer_account_id": None,
+            "transfer_transaction_id": None,
+            "matched_transaction_id": None,
+            "import_id": f"YNAB:-1000:2024-01-01:{i}" if i % 3 == 0 else None,
+            "import_payee_name": payee[1].upper() if i % 3 == 0 else None,
+            "import_payee_name_original": payee[1].upper() if i % 3 == 0 else None,
+            "debt_transaction_type": None,
+            "deleted": False,
+            "subtransactions": [],
+        }
+        if i % 200 == 0:
+            transaction["subtransactions"] = [
+                {
+                    "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                    "transaction_id": id,
+                    "amount": transaction["amount"] // 2,
+                    "memo": None,
+                    "payee_id": None,
+                    "payee_name": None,
+                    "category_id": rng.choice(categories)[0],
+                    "category_name": None,
+                    "transfer_account_id": None,
+                    "transfer_transaction_id": None,
+                    "deleted": False,
+                }
+                for _ in range(2)
+            ]
+        yield transaction
+
+
+def measure(name: str, build) -> object:
+    """Time build, then build again under tracemalloc to see what it keeps alive."""
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<34} {size / 2**20:8.1f} MiB {elapsed * 1000:9.0f} ms")
+    return result
+
+
+def decode(body: bytes) -> dict[str, dict]:
+    return {x["id"]: x for x in json.loads(body)["data"]["transactions"]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transactions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    body = budget(args.transactions)
+    print(f"{args.transactions} transactions, {len(body) / 2**20:.1f} MiB of JSON")
+    print(f"{'':<34} {'memory':>12} {'build':>12}")
+
+    # Each representation is built from the response body, as a sync would.
+    rows = measure("row dicts (before)", lambda: decode(body))
+    measure(
+        "Transaction models (before, Get)",
+        lambda: [Transaction(**x) for x in decode(body).values()],
+    )
+    store = measure("TransactionStore (after)", lambda: build_store(decode(body)))
+
+    # A typical list: one account's transactions, sorted, first page built.
+    account = next(iter(rows.values()))["account_id"]
+    filter = Transaction.Filter(account_ids=[account])
+    for name, source in (("row dicts", list(rows.values())), ("store", store.values())):
+        start = time.perf_counter()
+        selected = filter.Apply(source)
+        if isinstance(selected, TransactionStore.View):
+            selected = selected.SortedBy("date")
+        else:
+            selected = sorted(selected, key=lambda x: x.get("date") or "")
+        page = [Transaction(**x) for x in selected[:500]]
+        elapsed = time.perf_counter() - start
+        print(
+            f"account page from {name:<16} {elapsed * 1000:9.1f} ms ({len(page)} rows)"
+        )
+
+
+def build_store(rows: dict[str, dict]) -> TransactionStore:
+    store = TransactionStore()
+    store.update(rows)
+    return store
+
+
+if __name__ == "__main__":
+    main()
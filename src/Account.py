@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field, computed_field
 from YNABClient import YNABClient
+from Models import Models
 from AppContext import AppContext
 from Budget import Budget
 from mcp import ServerSession
@@ -76,15 +77,10 @@ class Account(BaseModel):
 
     @staticmethod
     async def Get(ynab: YNABClient, budget: Budget) -> list[Account] | YNABClient.Error:
-        response = await ynab.Send(method="GET", path=f"/budgets/{budget.id}/accounts")
-        if isinstance(response, YNABClient.Error):
-            return response
-        elif isinstance(response, YNABClient.Response):
-            if "accounts" in response.data:
-                return [Account(**account) for account in response.data["accounts"]]
-        raise YNABClient.Exceptions.UnexpectedError(
-            "Unexpected response format. No transaction data found."
-        )
+        accounts = await ynab.Sync(f"/budgets/{budget.id}/accounts", "accounts")
+        if isinstance(accounts, YNABClient.Error):
+            return accounts
+        return Models.Many(Account, accounts)
 
     @staticmethod
     def RegisterTools(mcp: FastMCP):
@@ -95,5 +91,5 @@ class Account(BaseModel):
             ctx: Context[ServerSession, AppContext], budget: Budget
         ) -> list[Account] | YNABClient.Error:
             """Fetch accounts from YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
+            client = AppContext.Tenant(ctx).ynab
             return await Account.Get(ynab=client, budget=budget)
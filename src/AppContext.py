@@ -1,8 +1,39 @@
+from __future__ import annotations
 from attr import dataclass
+from mcp.server.fastmcp import Context
 
-from YNABClient import YNABClient
+from ClientPool import ClientPool
+from Warmup import Warmup
+import os
 
 
 @dataclass
 class AppContext:
-    ynab: YNABClient
+    clients: ClientPool
+    warmup: Warmup | None = None
+
+    @staticmethod
+    def Tenant(ctx: Context) -> ClientPool.Tenant:
+        """
+        The client and paginator for the caller's YNAB token. Over HTTP the token is
+        read from the request's X-YNAB-Token or Authorization: Bearer header, and
+        a request without either is refused unless YNAB_ALLOW_SERVER_TOKEN is set,
+        so callers can't spend the server's YNAB_API_TOKEN by leaving them out.
+        Over stdio the server's token is used.
+        """
+        token = None
+        request = ctx.request_context.request
+        headers = getattr(request, "headers", None)
+        if headers is not None:
+            token = headers.get("x-ynab-token")
+            scheme, _, credentials = headers.get("authorization", "").partition(" ")
+            if not token and scheme.lower() == "bearer":
+                token = credentials.strip()
+            if not token and os.environ.get(
+                "YNAB_ALLOW_SERVER_TOKEN", ""
+            ).lower() not in ("1", "true", "yes"):
+                raise ValueError(
+                    "Missing YNAB token: send it as an Authorization: Bearer or "
+                    "X-YNAB-Token header"
+                )
+        return ctx.request_context.lifespan_context.clients.Get(token)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from YNABClient import YNABClient
+from Models import Models
 from AppContext import AppContext
 from mcp import ServerSession
 from mcp.server.fastmcp import Context, FastMCP
@@ -20,7 +21,7 @@ class Budget(BaseModel):
             return response
         elif isinstance(response, YNABClient.Response):
             if "budgets" in response.data:
-                return [Budget(**x) for x in response.data["budgets"]]
+                return Models.Many(Budget, response.data["budgets"])
         raise YNABClient.Exceptions.UnexpectedError(
             "Unexpected response format. No budget data found."
         )
@@ -34,5 +35,5 @@ class Budget(BaseModel):
             ctx: Context[ServerSession, AppContext],
         ) -> list[Budget] | YNABClient.Error:
             """Fetch budgets from YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
+            client = AppContext.Tenant(ctx).ynab
             return await Budget.Get(ynab=client)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+from Account import Account
+from YNABClient import YNABClient
+from Models import Models
+from AppContext import AppContext
+from Budget import Budget
+from Category import Category
+from mcp import ServerSession
+from mcp.server.fastmcp import Context, FastMCP
+from Month import Month
+from pydantic import BaseModel
+
+
+class BudgetSnapshot(BaseModel):
+    """
+    A whole budget from one request: its accounts, categories and months, and how
+    many payees and transactions it has. Amounts are in milliunits.
+    """
+
+    budget: Budget
+    server_knowledge: int | None
+    accounts: list[Account]
+    categories: list[Category]
+    months: list[Month]
+    payee_count: int
+    transaction_count: int
+
+    @staticmethod
+    async def Get(
+        ynab: YNABClient, budget: Budget | None = None
+    ) -> BudgetSnapshot | YNABClient.Error:
+        budget_id = budget.id if budget else "last-used"
+        loaded = await ynab.Snapshot(budget_id)
+        if isinstance(loaded, YNABClient.Error):
+            return loaded
+        path = f"/budgets/{budget_id}"
+        return BudgetSnapshot(
+            budget=Budget(**loaded),
+            server_knowledge=loaded["server_knowledge"],
+            accounts=Models.Many(Account, ynab.sync.Rows(f"{path}/accounts")),
+            categories=Models.Many(Category, ynab.sync.Rows(f"{path}/categories")),
+            months=Models.Many(Month, ynab.sync.Rows(f"{path}/months")),
+            payee_count=len(ynab.sync.Rows(f"{path}/payees")),
+            transaction_count=len(ynab.sync.Rows(f"{path}/transactions")),
+        )
+
+    @staticmethod
+    def RegisterTools(mcp: FastMCP):
+        """Register budget snapshot MCP tools."""
+
+        @mcp.tool()
+        async def get_budget_snapshot(
+            ctx: Context[ServerSession, AppContext], budget: Budget | None = None
+        ) -> BudgetSnapshot | YNABClient.Error:
+            """
+            Load a whole budget in one request: accounts, categories and months,
+            plus payee and transaction counts. Payees and transactions are kept
+            locally, so resolve, get_payees and the transaction tools answer from
+            the local copy afterwards. A good first call in a new conversation.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            return await BudgetSnapshot.Get(client, budget)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from YNABClient import YNABClient
+from Models import Models
 from AppContext import AppContext
 from Budget import Budget
 from mcp import ServerSession
@@ -93,28 +94,21 @@ class Category(BaseModel):
     ) -> list[Category] | Category | YNABClient.Error:
         budget_id = budget.id if budget else "last-used"
 
-        url: str = str()
-        if month and category:
-            url = f"/budgets/{budget_id}/months/{month.month}/categories/{category.id}"
-        else:
-            url = f"/budgets/{budget_id}/categories"
+        if not (month and category):
+            categories = await ynab.Sync(
+                f"/budgets/{budget_id}/categories", "category_groups"
+            )
+            if isinstance(categories, YNABClient.Error):
+                return categories
+            return Models.Many(Category, categories)
 
+        url = f"/budgets/{budget_id}/months/{month.month}/categories/{category.id}"
         response = await ynab.Send(method="GET", path=url)
         if isinstance(response, YNABClient.Error):
             return response
         elif isinstance(response, YNABClient.Response):
             if "category" in response.data:
                 return Category(**response.data["category"])
-            elif "category_groups" in response.data:
-                return [
-                    Category(**category)
-                    for group in response.data["category_groups"]
-                    for category in group["categories"]
-                ]
-            elif "categories" in response.data:
-                return [
-                    Category(**category) for category in response.data["categories"]
-                ]
         raise YNABClient.Exceptions.UnexpectedError(
             "Unexpected response format. No transaction data found."
         )
@@ -161,7 +155,7 @@ class Category(BaseModel):
             ctx: Context[ServerSession, AppContext], budget: Budget | None = None
         ) -> Category | list[Category] | YNABClient.Error:
             """Fetch categories from YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
+            client = AppContext.Tenant(ctx).ynab
             return await Category.Get(ynab=client, budget=budget)
 
         @mcp.tool()
@@ -172,7 +166,7 @@ class Category(BaseModel):
             category: Category | None = None,
         ) -> Category | list[Category] | YNABClient.Error:
             """Fetch categories for a specific month from YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
+            client = AppContext.Tenant(ctx).ynab
             return await Category.Get(
                 ynab=client, budget=budget, month=month, category=category
             )
@@ -184,7 +178,7 @@ class Category(BaseModel):
             budget: Budget | None = None,
         ) -> Category | YNABClient.Error:
             """Update a category in YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
+            client = AppContext.Tenant(ctx).ynab
             return await Category.Update(client, category, budget=budget)
 
         @mcp.tool()
@@ -195,7 +189,7 @@ class Category(BaseModel):
             month: Month | None = None,
         ) -> Category | YNABClient.Error:
             """Update a category for a specific month in YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
+            client = AppContext.Tenant(ctx).ynab
             return await Category.Update(
                 ynab=client, category=category, budget=budget, month=month
             )
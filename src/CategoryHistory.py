@@ -0,0 +1,149 @@
+from __future__ import annotations
+from asyncio import Semaphore, gather
+from YNABClient import YNABClient
+from AppContext import AppContext
+from Budget import Budget
+from Category import Category
+from datetime import date
+from mcp import ServerSession
+from mcp.server.fastmcp import Context, FastMCP
+from Month import Month
+from pydantic import BaseModel
+from typing import Any, ClassVar
+import os
+
+
+class CategoryHistory(BaseModel):
+    """
+    Budgeted, activity and balance of categories month by month, one value per
+    month in months. Amounts are in milliunits; None where a category didn't exist.
+    """
+
+    class Series(BaseModel):
+        id: str
+        name: str | None
+        category_group_name: str | None
+        budgeted: list[int | None]
+        activity: list[int | None]
+        balance: list[int | None]
+
+    months: list[str]
+    categories: list[CategoryHistory.Series]
+
+    # Longest range a single call may ask for. Months not held locally cost a
+    # request each, so this keeps a cold call to an eighth of YNAB's hourly quota.
+    _MAX_MONTHS: ClassVar[int] = 24
+
+    @staticmethod
+    def Months(start: Month, end: Month | None = None) -> list[str]:
+        """First days of the months from start to end (default current), in order."""
+        first, last = (
+            CategoryHistory._First(x.month if x else "current") for x in (start, end)
+        )
+        if first > last:
+            raise ValueError(f"Month range is empty: {first} is after {last}")
+        count = (last.year - first.year) * 12 + last.month - first.month + 1
+        if count > CategoryHistory._MAX_MONTHS:
+            raise ValueError(
+                f"Month range covers {count} months; at most "
+                f"{CategoryHistory._MAX_MONTHS} can be reported at once"
+            )
+        return [
+            date(
+                first.year + (first.month - 1 + i) // 12,
+                (first.month - 1 + i) % 12 + 1,
+                1,
+            ).isoformat()
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def _First(month: str) -> date:
+        if month == "current":
+            return date.today().replace(day=1)
+        try:
+            return date.fromisoformat(month[:7] + "-01")
+        except ValueError:
+            raise ValueError(
+                f"Invalid month {month!r}: use YYYY-MM-DD or 'current'"
+            ) from None
+
+    @staticmethod
+    async def Get(
+        ynab: YNABClient,
+        categories: list[Category],
+        start: Month,
+        end: Month | None = None,
+        budget: Budget | None = None,
+    ) -> CategoryHistory | YNABClient.Error:
+        """
+        Months the budget's local copy holds, from get_budget_snapshot or the
+        warm-up, are read from it as of that load. The rest cost one request each,
+        for every category at once: they are fetched YNAB_HISTORY_CONCURRENCY
+        (default 4) at a time, within the client's rate limit, and months already
+        in its response cache are served from there.
+        """
+        budget_id = budget.id if budget else "last-used"
+        months = CategoryHistory.Months(start, end)
+        path = f"/budgets/{budget_id}"
+        held: dict[str, dict[str, dict[str, Any]]] = {x: {} for x in months}
+        for row in ynab.sync.Rows(f"{path}/month_categories"):
+            if row["month"] in held:
+                held[row["month"]][row["id"]] = row
+        semaphore = Semaphore(int(os.environ.get("YNAB_HISTORY_CONCURRENCY", "4")))
+
+        async def fetch(month: str) -> dict[str, dict[str, Any]] | YNABClient.Error:
+            if held[month]:
+                return held[month]
+            async with semaphore:
+                response = await ynab.Send(method="GET", path=f"{path}/months/{month}")
+            if isinstance(response, YNABClient.Error):
+                return response
+            if "month" not in response.data:
+                raise YNABClient.Exceptions.UnexpectedError(
+                    "Unexpected response format. No month data found."
+                )
+            return {x["id"]: x for x in response.data["month"].get("categories", [])}
+
+        by_month = await gather(*(fetch(x) for x in months))
+        for month in by_month:
+            if isinstance(month, YNABClient.Error):
+                return month
+
+        series = []
+        for category in categories:
+            rows = [x.get(category.id) for x in by_month]
+            named = next((x for x in reversed(rows) if x), None) or {}
+            series.append(
+                CategoryHistory.Series(
+                    id=category.id,
+                    name=named.get("name"),
+                    category_group_name=named.get("category_group_name"),
+                    **{
+                        field: [x.get(field) if x else None for x in rows]
+                        for field in ("budgeted", "activity", "balance")
+                    },
+                )
+            )
+        return CategoryHistory(months=months, categories=series)
+
+    @staticmethod
+    def RegisterTools(mcp: FastMCP):
+        """Register category history MCP tools."""
+
+        @mcp.tool()
+        async def get_category_history(
+            ctx: Context[ServerSession, AppContext],
+            categories: list[Category],
+            start: Month,
+            end: Month | None = None,
+            budget: Budget | None = None,
+        ) -> CategoryHistory | YNABClient.Error:
+            """
+            Fetch budgeted, activity and balance for one or more categories over a
+            range of months (end defaults to the current month), as one time series
+            per category, at most 24 months at once. Use this instead of
+            get_category_for_month month by month.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            return await CategoryHistory.Get(client, categories, start, end, budget)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+from asyncio import Task, get_running_loop
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from mcp.server.fastmcp import FastMCP
+from Paginator import Paginator
+from pydantic import BaseModel
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterator
+import functools
+import hashlib
+import os
+import time
+
+if TYPE_CHECKING:
+    # Clients are made by the factory; importing them here would pull numpy and
+    # the sync machinery into startup.
+    from YNABClient import YNABClient
+
+
+class ClientPool:
+    """
+    One YNABClient and Paginator per YNAB token, so tenants sharing a server keep
+    separate connection pools, caches, rate-limit buckets and page sizes.
+
+    At most max_tenants are kept. Tenants idle for longer than idle seconds, and
+    the least recently used once the pool is full, are evicted, except the
+    server's own token, whose client the warm-up keeps current. An evicted client
+    is closed once the last call holding it, see Scope, has finished.
+    """
+
+    class Tenant:
+        def __init__(self, ynab: YNABClient, pages: Paginator) -> None:
+            self.ynab = ynab
+            self.pages = pages
+            self.used = time.monotonic()
+            # Scopes holding the tenant, and whether it has left the pool.
+            self.holders = 0
+            self.evicted = False
+
+    class Stats(BaseModel):
+        tenants: int
+        max_tenants: int
+        evictions: int
+
+    def __init__(
+        self,
+        factory: Callable[[str], YNABClient],
+        max_tenants: int | None = None,
+        idle: float | None = None,
+        default_token: str | None = None,
+    ) -> None:
+        self._factory = factory
+        self._max_tenants = max_tenants or int(os.environ.get("YNAB_MAX_TENANTS", "32"))
+        self._idle = idle or float(os.environ.get("YNAB_TENANT_IDLE_SECONDS", "1800"))
+        self._default_token = default_token or os.environ.get("YNAB_API_TOKEN")
+        self._tenants: OrderedDict[str, ClientPool.Tenant] = OrderedDict()
+        # Evicted tenants still held by a call, and clients being closed.
+        self._evicted: set[ClientPool.Tenant] = set()
+        self._closing: set[Task[None]] = set()
+        self._evictions = 0
+
+    def Get(self, token: str | None = None) -> ClientPool.Tenant:
+        """
+        Return the tenant for token, creating it if needed. Without a token the
+        server's own YNAB_API_TOKEN is used.
+        """
+        token = token or self._default_token
+        if not token:
+            raise ValueError(
+                "Missing YNAB token: send it as an Authorization: Bearer or "
+                "X-YNAB-Token header, or set YNAB_API_TOKEN"
+            )
+        self._Expire()
+        tenant = self._tenants.get(token)
+        if tenant is None:
+            tenant = ClientPool.Tenant(self._factory(token), Paginator())
+            self._tenants[token] = tenant
+            while len(self._tenants) > self._max_tenants:
+                oldest = next(
+                    (x for x in self._tenants if x not in (token, self._default_token)),
+                    None,
+                )
+                if oldest is None:
+                    break
+                self._Evict(oldest)
+        self._tenants.move_to_end(token)
+        tenant.used = time.monotonic()
+        tenant.ynab.Open()
+        held = _held.get()
+        if held is not None:
+            tenant.holders += 1
+            held.append((self, tenant))
+        return tenant
+
+    @staticmethod
+    @contextmanager
+    def Scope() -> Iterator[None]:
+        """
+        Hold every tenant Get returns within the block until the block ends, so a
+        tenant evicted meanwhile keeps its client open for the call using it.
+        """
+        held: list[tuple[ClientPool, ClientPool.Tenant]] = []
+        reset = _held.set(held)
+        try:
+            yield
+        finally:
+            _held.reset(reset)
+            for pool, tenant in held:
+                tenant.holders -= 1
+                if tenant.evicted and not tenant.holders:
+                    pool._Close(tenant)
+
+    @staticmethod
+    def Instrument(mcp: FastMCP) -> None:
+        """Run every tool registered on mcp from now on in its own Scope."""
+        register_tool = mcp.tool
+
+        def tool(*args: Any, **kwargs: Any) -> Callable[[Any], Any]:
+            register = register_tool(*args, **kwargs)
+
+            def decorator(fn: Callable[..., Awaitable[Any]]) -> Any:
+                # functools.wraps keeps the signature FastMCP builds the schema from.
+                @functools.wraps(fn)
+                async def scoped(*args: Any, **kwargs: Any) -> Any:
+                    with ClientPool.Scope():
+                        return await fn(*args, **kwargs)
+
+                return register(scoped)
+
+            return decorator
+
+        mcp.tool = tool  # type: ignore[method-assign]
+
+    @staticmethod
+    def Prefix(token: str) -> str:
+        """
+        The store prefix for token's data. Empty for the server's own token, so a
+        single-user store written before tenants existed is still read.
+        """
+        if token == os.environ.get("YNAB_API_TOKEN"):
+            return ""
+        return hashlib.sha256(token.encode()).hexdigest()[:16] + ":"
+
+    def _Expire(self) -> None:
+        cutoff = time.monotonic() - self._idle
+        for token, tenant in list(self._tenants.items()):
+            if tenant.used >= cutoff:
+                return
+            if token != self._default_token:
+                self._Evict(token)
+
+    def _Evict(self, token: str) -> None:
+        tenant = self._tenants.pop(token)
+        self._evictions += 1
+        tenant.evicted = True
+        if tenant.holders:
+            self._evicted.add(tenant)
+        else:
+            self._Close(tenant)
+
+    def _Close(self, tenant: ClientPool.Tenant) -> None:
+        self._evicted.discard(tenant)
+        task = get_running_loop().create_task(tenant.ynab.Close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def Close(self) -> None:
+        """Close every client, including evicted ones still held by a call."""
+        tenants = [*self._tenants.values(), *self._evicted]
+        closing = list(self._closing)
+        self._tenants.clear()
+        self._evicted.clear()
+        for tenant in tenants:
+            await tenant.ynab.Close()
+        for task in closing:
+            await task
+
+    def Report(self) -> ClientPool.Stats:
+        return ClientPool.Stats(
+            tenants=len(self._tenants),
+            max_tenants=self._max_tenants,
+            evictions=self._evictions,
+        )
+
+
+# Tenants held by the current call; see ClientPool.Scope.
+_held: ContextVar[list[tuple[ClientPool, ClientPool.Tenant]] | None] = ContextVar(
+    "held", default=None
+)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+from asyncio import Future, Task, get_running_loop
+from typing import Any, Awaitable, Callable, Hashable
+import os
+
+
+class Coalescer:
+    """
+    Merges items submitted under the same key within a short window into one batch.
+
+    The first submitter's flush callable receives every item in the batch and must
+    return one result per item, in order; each submitter gets back its own result.
+    A window of 0 flushes every item on its own.
+    """
+
+    def __init__(self, window: float | None = None, max_batch: int = 100) -> None:
+        self._window = (
+            window
+            if window is not None
+            else float(os.environ.get("YNAB_COALESCE_WINDOW_MS", "5")) / 1000
+        )
+        self._max_batch = max_batch
+        self._pending: dict[Hashable, _Batch] = {}
+        self._tasks: set[Task[None]] = set()
+
+    async def Submit(
+        self,
+        key: Hashable,
+        item: Any,
+        flush: Callable[[list[Any]], Awaitable[list[Any]]],
+    ) -> Any:
+        if self._window <= 0:
+            return (await flush([item]))[0]
+        loop = get_running_loop()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _Batch(flush)
+            batch.timer = loop.call_later(self._window, self._Flush, key, batch)
+        future: Future[Any] = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        if len(batch.items) >= self._max_batch:
+            batch.timer.cancel()
+            self._Flush(key, batch)
+        return await future
+
+    def _Flush(self, key: Hashable, batch: _Batch) -> None:
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        task = get_running_loop().create_task(self._Run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _Run(batch: _Batch) -> None:
+        try:
+            results = await batch.flush(batch.items)
+        except Exception as exception:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exception)
+            return
+        except BaseException:
+            for future in batch.futures:
+                future.cancel()
+            raise
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class _Batch:
+    def __init__(self, flush: Callable[[list[Any]], Awaitable[list[Any]]]) -> None:
+        self.flush = flush
+        self.items: list[Any] = []
+        self.futures: list[Future[Any]] = []
+        self.timer: Any = None
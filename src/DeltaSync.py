@@ -0,0 +1,262 @@
+from __future__ import annotations
+from asyncio import Lock
+from Store import Store
+from TransactionStore import TransactionStore
+from typing import Any, Callable, Iterable
+
+
+class DeltaSync:
+    """
+    Local copies of YNAB collections kept current with delta requests.
+
+    YNAB returns a server_knowledge value with every collection. Passing it back as
+    last_knowledge_of_server returns only the entities changed since then, with
+    deleted entities flagged by deleted: true. Entities are stored per request path,
+    which already identifies the budget and the endpoint. With a Store attached, each
+    path is loaded from disk on first use and every merge is written back.
+    Transactions are kept in a columnar TransactionStore when numpy is installed.
+    Listeners are told about every change, so indexes built from the local copies
+    can be kept current without rescanning them.
+    """
+
+    _ID_FIELDS: dict[str, str] = {"months": "month", "month_categories": "key"}
+    # Rough bytes a field of a dict row holds: its slot and a short value.
+    _FIELD_BYTES = 100
+    # Collections under /budgets/{id} that a /budgets/{id} response also carries.
+    # month_categories has no endpoint of its own: it holds every month's
+    # categories, keyed by month and category id, as /months/{month} returns them.
+    BUDGET_COLLECTIONS: tuple[str, ...] = (
+        "accounts",
+        "payees",
+        "categories",
+        "months",
+        "month_categories",
+        "transactions",
+    )
+
+    def __init__(self, store: Store | None = None) -> None:
+        self._store = store
+        self._knowledge: dict[str, int] = {}
+        self._tables: dict[str, dict[str, dict[str, Any]] | TransactionStore] = {}
+        self._locks: dict[str, Lock] = {}
+        self._listeners: list[
+            Callable[[str, dict[str, dict[str, Any]], list[str], bool], None]
+        ] = []
+
+    def Listen(
+        self,
+        listener: Callable[[str, dict[str, dict[str, Any]], list[str], bool], None],
+    ) -> None:
+        """
+        Call listener(path, upserts, deletes, replace) after each change to a local
+        copy; replace means the path's previous entities are gone.
+        """
+        self._listeners.append(listener)
+
+    def _Notify(
+        self,
+        path: str,
+        upserts: dict[str, dict[str, Any]],
+        deletes: list[str],
+        replace: bool,
+    ) -> None:
+        for listener in self._listeners:
+            listener(path, upserts, deletes, replace)
+
+    def Lock(self, path: str) -> Lock:
+        """Serialises syncs of one path so concurrent callers share a single delta."""
+        if path not in self._locks:
+            self._locks[path] = Lock()
+        return self._locks[path]
+
+    def Knowledge(self, path: str) -> int | None:
+        self._Table(path)
+        return self._knowledge.get(path)
+
+    def Table(self, path: str) -> dict[str, dict[str, Any]] | TransactionStore:
+        """The local copy of path by id. Don't change it; merge responses instead."""
+        return self._Table(path)
+
+    def Bytes(self, path: str) -> int:
+        """Estimated memory the local copy of path holds, for sizing caches."""
+        table = self._Table(path)
+        if isinstance(table, TransactionStore):
+            return table.Bytes()
+        return sum(map(len, table.values())) * self._FIELD_BYTES
+
+    def Rows(self, path: str) -> list[dict[str, Any]] | TransactionStore.View:
+        rows = self._Table(path).values()
+        return rows if isinstance(rows, TransactionStore.View) else list(rows)
+
+    def Extend(
+        self,
+        path: str,
+        collection: str,
+        entities: Iterable[dict[str, Any]],
+        full: bool = False,
+    ) -> None:
+        """
+        Apply some of a response's entities, e.g. one batch of a streamed response.
+        full starts the local copy over, for the first batch of a full response.
+        """
+        table = self._Table(path)
+        if full:
+            table = self._tables[path] = self._Empty(path)
+        id_field = self._ID_FIELDS.get(collection, "id")
+        upserts: dict[str, dict[str, Any]] = {}
+        deletes: list[str] = []
+        for entity in self._Entities(table, collection, entities):
+            id = entity[id_field]
+            if entity.get("deleted"):
+                upserts.pop(id, None)
+                deletes.append(id)
+            else:
+                upserts[id] = entity
+        for id in deletes:
+            table.pop(id, None)
+        table.update(upserts)
+        if isinstance(table, TransactionStore):
+            self._tables[path] = table.Compacted()
+        if self._store is not None:
+            self._store.Save(path, None, upserts.items(), deletes, replace=full)
+        self._Notify(path, upserts, deletes, full)
+
+    def MergeBudget(
+        self,
+        path: str,
+        budget: dict[str, list[dict[str, Any]]],
+        full: bool,
+        server_knowledge: int | None,
+    ) -> dict[str, str]:
+        """
+        Apply a /budgets/{id} response, full or delta, to the local copies of the
+        budget's accounts, payees, categories, months, month categories and
+        transactions, giving them the shape their own endpoints return. Returns the
+        paths merged, by resource.
+
+        The budget endpoint lists categories apart from their groups, months with
+        their categories, and subtransactions apart from their transactions, and
+        leaves out the account, payee and category names of transactions.
+        """
+        paths = {x: f"{path}/{x}" for x in self.BUDGET_COLLECTIONS}
+        for resource in ("accounts", "payees"):
+            self.Extend(paths[resource], resource, budget.get(resource, []), full)
+
+        groups = budget.get("category_groups", [])
+        group_names = {
+            x.get("category_group_id"): x.get("category_group_name")
+            for x in ([] if full else self.Rows(paths["categories"]))
+        }
+        group_names.update({x["id"]: x.get("name") for x in groups})
+        categories = [
+            {
+                **x,
+                "category_group_name": x.get("category_group_name")
+                or group_names.get(x.get("category_group_id")),
+            }
+            for x in budget.get("categories", [])
+        ]
+        # Groups are passed for their deleted flag; the categories follow them.
+        self.Extend(
+            paths["categories"],
+            "category_groups",
+            [*({**x, "categories": []} for x in groups), {"categories": categories}],
+            full,
+        )
+        self.Extend(
+            paths["months"],
+            "months",
+            (
+                {k: v for k, v in x.items() if k != "categories"}
+                for x in budget.get("months", [])
+            ),
+            full,
+        )
+        self.Extend(
+            paths["month_categories"],
+            "month_categories",
+            (
+                {**x, "month": month["month"], "key": f"{month['month']}/{x['id']}"}
+                for month in budget.get("months", [])
+                for x in month.get("categories") or []
+            ),
+            full,
+        )
+
+        names = {
+            field: {x["id"]: x.get("name") for x in self.Rows(paths[resource])}
+            for field, resource in (
+                ("account", "accounts"),
+                ("payee", "payees"),
+                ("category", "categories"),
+            )
+        }
+
+        def named(entity: dict[str, Any]) -> dict[str, Any]:
+            for field, ids in names.items():
+                if f"{field}_id" in entity and f"{field}_name" not in entity:
+                    entity[f"{field}_name"] = ids.get(entity[f"{field}_id"])
+            return entity
+
+        parts: dict[str, dict[str, dict[str, Any]]] = {}
+        for part in budget.get("subtransactions", []):
+            parts.setdefault(part["transaction_id"], {})[part["id"]] = named(dict(part))
+        table = self._Table(paths["transactions"])
+        transactions = {x["id"]: named(dict(x)) for x in budget.get("transactions", [])}
+        # A delta can change subtransactions without their transaction.
+        for id in parts.keys() - transactions.keys():
+            local = None if full else table.get(id)
+            if local is not None:
+                transactions[id] = dict(local)
+        for id, transaction in transactions.items():
+            local = None if full else table.get(id)
+            merged = {x["id"]: x for x in (local or {}).get("subtransactions", [])}
+            merged.update(parts.get(id, {}))
+            transaction["subtransactions"] = list(merged.values())
+        self.Extend(paths["transactions"], "transactions", transactions.values(), full)
+
+        if server_knowledge is not None:
+            for resource_path in paths.values():
+                self.Commit(resource_path, server_knowledge)
+        return paths
+
+    def Commit(self, path: str, server_knowledge: int) -> None:
+        """Record the server_knowledge of a response once all of it is applied."""
+        self._knowledge[path] = server_knowledge
+        if self._store is not None:
+            self._store.Save(path, server_knowledge, (), ())
+
+    def _Table(self, path: str) -> dict[str, dict[str, Any]] | TransactionStore:
+        if path not in self._tables:
+            table = self._Empty(path)
+            if self._store is not None:
+                knowledge, entities = self._store.Load(path)
+                table.update(entities)
+                if knowledge is not None:
+                    self._knowledge[path] = knowledge
+                self._Notify(path, entities, [], True)
+            self._tables[path] = table
+        return self._tables[path]
+
+    @staticmethod
+    def _Empty(path: str) -> dict[str, dict[str, Any]] | TransactionStore:
+        if path.endswith("/transactions") and TransactionStore.Supported():
+            return TransactionStore()
+        return {}
+
+    @staticmethod
+    def _Entities(
+        table: dict[str, dict[str, Any]] | TransactionStore,
+        collection: str,
+        entities: Iterable[dict[str, Any]],
+    ) -> Iterable[dict[str, Any]]:
+        if collection != "category_groups":
+            yield from entities
+            return
+        # Categories are stored flat; a deleted group takes its categories with it.
+        for group in entities:
+            if group.get("deleted"):
+                for category in list(table.values()):
+                    if category.get("category_group_id") == group["id"]:
+                        yield {**category, "deleted": True}
+            yield from group.get("categories", [])
@@ -0,0 +1,143 @@
+from __future__ import annotations
+from datetime import date
+from NameIndex import NameIndex
+from typing import Any, NamedTuple
+
+
+class DuplicateIndex:
+    """
+    Hash index of synced transactions for finding the ones a new transaction may
+    duplicate, kept current by DeltaSync.
+
+    Transactions are indexed by account and amount, and by import_id, so checking a
+    candidate reads only the transactions with the same amount in the same account,
+    never the account's whole history.
+    """
+
+    # Reasons for a match, strongest first.
+    REASONS = ("import_id", "amount_date_payee", "amount_date")
+    WINDOW_DAYS = 5
+
+    class Entry(NamedTuple):
+        account_id: str | None
+        amount: int | None
+        ordinal: int | None
+        payee_id: str | None
+        payees: frozenset[str]
+        import_id: str | None
+
+    class Match(NamedTuple):
+        id: str
+        reason: str
+        days_apart: int | None
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[str, DuplicateIndex.Entry]] = {}
+        self._buckets: dict[str, dict[tuple[Any, Any], set[str]]] = {}
+        self._imports: dict[str, dict[tuple[Any, str], str]] = {}
+
+    @staticmethod
+    def _Ordinal(value: str | None) -> int | None:
+        try:
+            return date.fromisoformat(value[:10]).toordinal() if value else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _Payees(*names: str | None) -> frozenset[str]:
+        return frozenset(NameIndex.Normalize(x) for x in names if x)
+
+    def Update(
+        self,
+        path: str,
+        upserts: dict[str, dict[str, Any]],
+        deletes: list[str],
+        replace: bool = False,
+    ) -> None:
+        """Apply a merge DeltaSync made to path; replace starts the path over."""
+        if not path.endswith("/transactions"):
+            return
+        if replace:
+            self.Forget(path)
+        entries = self._entries.setdefault(path, {})
+        buckets = self._buckets.setdefault(path, {})
+        imports = self._imports.setdefault(path, {})
+        for id in (*deletes, *upserts):
+            entry = entries.pop(id, None)
+            if entry is None:
+                continue
+            bucket = buckets[entry.account_id, entry.amount]
+            bucket.discard(id)
+            if not bucket:
+                del buckets[entry.account_id, entry.amount]
+            if imports.get((entry.account_id, entry.import_id)) == id:
+                del imports[entry.account_id, entry.import_id]
+        for id, row in upserts.items():
+            entry = DuplicateIndex.Entry(
+                row.get("account_id"),
+                row.get("amount"),
+                self._Ordinal(row.get("date")),
+                row.get("payee_id"),
+                self._Payees(
+                    row.get("payee_name"),
+                    row.get("import_payee_name"),
+                    row.get("import_payee_name_original"),
+                ),
+                row.get("import_id"),
+            )
+            entries[id] = entry
+            buckets.setdefault((entry.account_id, entry.amount), set()).add(id)
+            if entry.import_id:
+                imports[entry.account_id, entry.import_id] = id
+
+    def Forget(self, path: str | None = None) -> None:
+        for index in (self._entries, self._buckets, self._imports):
+            if path is None:
+                index.clear()
+            else:
+                index.pop(path, None)
+
+    def Find(
+        self,
+        path: str,
+        transaction: dict[str, Any],
+        days: int | None = None,
+    ) -> list[DuplicateIndex.Match]:
+        """
+        Synced transactions that transaction may duplicate, strongest first: the
+        same import_id in the account, or the same amount in the account within
+        days of its date, with or without the same payee.
+        """
+        days = self.WINDOW_DAYS if days is None else days
+        entries = self._entries.get(path, {})
+        account_id = transaction.get("account_id")
+        matches: dict[str, DuplicateIndex.Match] = {}
+        import_id = transaction.get("import_id")
+        if import_id:
+            id = self._imports.get(path, {}).get((account_id, import_id))
+            if id is not None:
+                matches[id] = DuplicateIndex.Match(id, "import_id", None)
+        ordinal = self._Ordinal(transaction.get("date"))
+        bucket = self._buckets.get(path, {}).get(
+            (account_id, transaction.get("amount")), ()
+        )
+        payee_id = transaction.get("payee_id")
+        payees = self._Payees(
+            transaction.get("payee_name"), transaction.get("import_payee_name")
+        )
+        for id in bucket:
+            entry = entries[id]
+            if id in matches or ordinal is None or entry.ordinal is None:
+                continue
+            apart = abs(entry.ordinal - ordinal)
+            if apart > days:
+                continue
+            same_payee = (payee_id and payee_id == entry.payee_id) or (
+                payees & entry.payees
+            )
+            reason = "amount_date_payee" if same_payee else "amount_date"
+            matches[id] = DuplicateIndex.Match(id, reason, apart)
+        return sorted(
+            matches.values(),
+            key=lambda x: (self.REASONS.index(x.reason), x.days_apart or 0),
+        )
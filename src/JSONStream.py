@@ -0,0 +1,147 @@
+from __future__ import annotations
+from typing import Any, AsyncIterator
+import codecs
+import json
+
+
+class JSONStream:
+    """
+    Decodes a JSON object as its bytes arrive, yielding the elements of the arrays
+    in one nested object (e.g. the "data" of a YNAB response) one at a time rather
+    than building the whole document first. Only the element being decoded and the
+    chunk it came in are held in memory. Every other member ends up in rest, with
+    the streamed arrays left empty.
+    """
+
+    # Characters that can follow the part of a number decoded so far.
+    _NUMBER = frozenset("0123456789.eE+-")
+
+    def __init__(
+        self, chunks: AsyncIterator[bytes], at: tuple[str, ...] = ("data",)
+    ) -> None:
+        self._chunks = aiter(chunks)
+        self._at = at
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._done = False
+        # Bytes read so far.
+        self.size = 0
+        self.rest: dict[str, Any] = {}
+
+    async def Items(self) -> AsyncIterator[tuple[str, Any]]:
+        """(array key, element) for every element of the arrays in the object at `at`."""
+        async for item in self._Members(self.rest, self._at):
+            yield item
+        if await self._Peek(required=False):
+            raise ValueError("Extra data after JSON object")
+
+    async def _Members(
+        self, into: dict[str, Any], at: tuple[str, ...]
+    ) -> AsyncIterator[tuple[str, Any]]:
+        await self._Expect("{")
+        if await self._Peek() == "}":
+            self._position += 1
+            return
+        while True:
+            key = await self._Value()
+            await self._Expect(":")
+            start = await self._Peek()
+            if at and key == at[0] and start == "{":
+                into[key] = {}
+                async for item in self._Members(into[key], at[1:]):
+                    yield item
+            elif not at and start == "[":
+                into[key] = []
+                async for element in self._Elements():
+                    yield key, element
+            else:
+                into[key] = await self._Value()
+            if await self._Separator("}"):
+                return
+
+    async def _Elements(self) -> AsyncIterator[Any]:
+        await self._Expect("[")
+        if await self._Peek() == "]":
+            self._position += 1
+            return
+        while True:
+            yield await self._Value()
+            if await self._Separator("]"):
+                return
+
+    async def _Value(self) -> Any:
+        """Decode the next complete value, reading more of the body as needed."""
+        await self._Peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._done:
+                    raise
+            else:
+                # A number at the end of the buffer, or stopped short of a fraction
+                # or exponent whose rest hasn't arrived ("1." or "1e"), may continue
+                # in the next chunk.
+                partial = isinstance(value, (int, float)) and not isinstance(
+                    value, bool
+                )
+                if self._done or (
+                    end < len(self._buffer)
+                    and not (partial and self._buffer[end] in self._NUMBER)
+                ):
+                    self._position = end
+                    return value
+            # Double what's buffered so a large value isn't re-decoded per chunk.
+            await self._Fill(2 * (len(self._buffer) - self._position))
+
+    async def _Peek(self, required: bool = True) -> str:
+        """The next non-whitespace character, without consuming it."""
+        while True:
+            while (
+                self._position < len(self._buffer)
+                and self._buffer[self._position] in " \t\r\n"
+            ):
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if self._done:
+                if required:
+                    raise ValueError("Unexpected end of JSON")
+                return ""
+            await self._Fill(1)
+
+    async def _Next(self) -> str:
+        char = await self._Peek()
+        self._position += 1
+        return char
+
+    async def _Expect(self, char: str) -> None:
+        found = await self._Next()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON, found {found!r}")
+
+    async def _Separator(self, close: str) -> bool:
+        """Consume a comma, or the closing bracket (returning True)."""
+        found = await self._Next()
+        if found not in (",", close):
+            raise ValueError(f"Expected ',' or {close!r} in JSON, found {found!r}")
+        return found == close
+
+    async def _Fill(self, minimum: int) -> None:
+        self._buffer = self._buffer[self._position :]
+        self._position = 0
+        pieces = [self._buffer]
+        length = len(self._buffer)
+        while length < max(minimum, 1) and not self._done:
+            try:
+                chunk = await anext(self._chunks)
+            except StopAsyncIteration:
+                self._done = True
+                chunk = b""
+            self.size += len(chunk)
+            piece = self._text.decode(chunk, final=self._done)
+            pieces.append(piece)
+            length += len(piece)
+        self._buffer = "".join(pieces)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+from importlib.metadata import version
+from mcp.server.fastmcp import FastMCP
+from mcp.types import Tool as MCPTool
+from pydantic import TypeAdapter
+from typing import Any, Callable
+import glob
+import hashlib
+import os
+import time
+
+
+class LazyFastMCP(FastMCP):
+    """
+    FastMCP that registers its tools, resources and routes on first use instead
+    of at import.
+
+    Registering imports every tool module (and numpy with them) and builds each
+    tool's argument model and JSON schemas, which would otherwise all happen
+    before the server can answer initialize. tools/list is answered from a JSON
+    cache of the tool definitions when one matches the current sources and
+    library versions, so registration waits until a tool is actually called.
+    The cache lives at YNAB_TOOL_CACHE, by default next to the bytecode cache;
+    an empty value disables it.
+    """
+
+    _TOOLS = TypeAdapter(list[MCPTool])
+
+    def __init__(
+        self,
+        *args: Any,
+        register: Callable[[FastMCP], None],
+        on_register: Callable[[float], None] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._register: Callable[[FastMCP], None] | None = register
+        self._on_register = on_register
+        source = os.path.dirname(os.path.abspath(__file__))
+        self._cache_path = os.environ.get(
+            "YNAB_TOOL_CACHE", os.path.join(source, "__pycache__", "tools.json")
+        )
+        self._source = source
+
+    def Register(self) -> None:
+        """Register everything now, if that hasn't happened yet."""
+        if self._register is None:
+            return
+        register, self._register = self._register, None
+        start = time.perf_counter()
+        register(self)
+        if self._on_register is not None:
+            self._on_register(time.perf_counter() - start)
+
+    async def list_tools(self) -> list[MCPTool]:
+        if self._register is not None:
+            cached = self._Cached()
+            if cached is not None:
+                return cached
+            self.Register()
+            tools = await super().list_tools()
+            self._Save(tools)
+            return tools
+        return await super().list_tools()
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]) -> Any:
+        self.Register()
+        return await super().call_tool(name, arguments)
+
+    async def list_resources(self) -> Any:
+        self.Register()
+        return await super().list_resources()
+
+    async def list_resource_templates(self) -> Any:
+        self.Register()
+        return await super().list_resource_templates()
+
+    async def read_resource(self, uri: Any) -> Any:
+        self.Register()
+        return await super().read_resource(uri)
+
+    def streamable_http_app(self) -> Any:
+        # Custom routes are collected when the app is built.
+        self.Register()
+        return super().streamable_http_app()
+
+    def sse_app(self, mount_path: str | None = None) -> Any:
+        self.Register()
+        return super().sse_app(mount_path)
+
+    def _Key(self) -> str:
+        digest = hashlib.sha256()
+        for package in ("mcp", "pydantic"):
+            digest.update(f"{package}={version(package)}\n".encode())
+        for filename in sorted(glob.glob(os.path.join(self._source, "*.py"))):
+            digest.update(f"{os.path.basename(filename)}\n".encode())
+            with open(filename, "rb") as file:
+                digest.update(file.read())
+        return digest.hexdigest()
+
+    def _Cached(self) -> list[MCPTool] | None:
+        if not self._cache_path:
+            return None
+        try:
+            with open(self._cache_path, "rb") as file:
+                key, _, tools = file.read().partition(b"\n")
+        except OSError:
+            return None
+        if key.decode() != self._Key():
+            return None
+        return self._TOOLS.validate_json(tools)
+
+    def _Save(self, tools: list[MCPTool]) -> None:
+        if not self._cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self._cache_path), exist_ok=True)
+            # Written aside and renamed, so concurrent starts never read half a file.
+            partial = f"{self._cache_path}.{os.getpid()}"
+            with open(partial, "wb") as file:
+                file.write(self._Key().encode() + b"\n")
+                file.write(self._TOOLS.dump_json(tools, by_alias=True))
+            os.replace(partial, self._cache_path)
+        except OSError:
+            pass
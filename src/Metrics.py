@@ -0,0 +1,351 @@
+from __future__ import annotations
+from AppContext import AppContext
+from bisect import bisect_left
+from mcp import ServerSession
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from typing import Any, Awaitable, Callable
+import functools
+import os
+import re
+import time
+
+
+class Metrics:
+    """
+    In-process counters and latency histograms for tools and YNAB requests.
+
+    Tool time is split into stages: waiting for rate-limit quota, the YNAB request
+    itself, and decoding its body. Whatever a tool spends beyond those is local
+    work such as filtering and building models. Upstream requests are counted by
+    endpoint, with ids replaced by placeholders, and by status code. YNAB's quota
+    is per token, so the rate limit it reports is kept per tenant.
+    """
+
+    # Upper bounds in seconds: Prometheus' defaults, extended down to 1ms and up to 30s.
+    BUCKETS = (
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+        30.0,
+    )
+
+    _ID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F-]{17}")
+    _MONTH = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+    class Histogram:
+        def __init__(self) -> None:
+            self.counts = [0] * (len(Metrics.BUCKETS) + 1)
+            self.count = 0
+            self.sum = 0.0
+
+        def Observe(self, seconds: float) -> None:
+            self.counts[bisect_left(Metrics.BUCKETS, seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+
+        def Quantile(self, q: float) -> float:
+            """Estimate a quantile by interpolating within its bucket."""
+            if not self.count:
+                return 0.0
+            rank = q * self.count
+            seen = 0
+            for i, count in enumerate(self.counts):
+                if count and seen + count >= rank:
+                    low = Metrics.BUCKETS[i - 1] if i else 0.0
+                    if i == len(Metrics.BUCKETS):
+                        return low
+                    return low + (Metrics.BUCKETS[i] - low) * (rank - seen) / count
+                seen += count
+            return Metrics.BUCKETS[-1]
+
+        def Report(self) -> Metrics.Timing:
+            return Metrics.Timing(
+                count=self.count,
+                total_seconds=self.sum,
+                mean_seconds=self.sum / self.count if self.count else 0.0,
+                p50_seconds=self.Quantile(0.5),
+                p99_seconds=self.Quantile(0.99),
+            )
+
+    class Timing(BaseModel):
+        count: int
+        total_seconds: float
+        mean_seconds: float
+        p50_seconds: float
+        p99_seconds: float
+
+    class Tool(BaseModel):
+        errors: int
+        latency: Metrics.Timing
+
+    class Endpoint(BaseModel):
+        requests: int
+        statuses: dict[str, int]
+        response_bytes: int
+        latency: Metrics.Timing
+
+    class RateLimit(BaseModel):
+        used: int | None
+        limit: int | None
+
+    class Report(BaseModel):
+        uptime_seconds: float
+        tools: dict[str, Metrics.Tool]
+        stages: dict[str, Metrics.Timing]
+        upstream: dict[str, Metrics.Endpoint]
+        rate_limit: Metrics.RateLimit
+
+    def __init__(self) -> None:
+        self._started = time.monotonic()
+        self._tools: dict[str, Metrics.Histogram] = {}
+        self._tool_errors: dict[str, int] = {}
+        self._stages: dict[str, Metrics.Histogram] = {}
+        self._upstream: dict[str, Metrics.Histogram] = {}
+        self._statuses: dict[tuple[str, int], int] = {}
+        self._bytes: dict[str, int] = {}
+        self._rate_limits: dict[str, tuple[int, int]] = {}
+
+    def Instrument(self, mcp: FastMCP) -> None:
+        """Time every tool registered on mcp from now on."""
+        register_tool = mcp.tool
+
+        def tool(*args: Any, **kwargs: Any) -> Callable[[Any], Any]:
+            register = register_tool(*args, **kwargs)
+            name = kwargs.get("name", args[0] if args else None)
+
+            def decorator(fn: Callable[..., Awaitable[Any]]) -> Any:
+                return register(self.Timed(name or fn.__name__, fn))
+
+            return decorator
+
+        mcp.tool = tool  # type: ignore[method-assign]
+
+    def Timed(
+        self, name: str, fn: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        # functools.wraps keeps the signature FastMCP builds the tool's schema from.
+        @functools.wraps(fn)
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                self._tool_errors[name] = self._tool_errors.get(name, 0) + 1
+                raise
+            finally:
+                self._Histogram(self._tools, name).Observe(time.perf_counter() - start)
+
+        return timed
+
+    def Stage(self, stage: str, seconds: float) -> None:
+        self._Histogram(self._stages, stage).Observe(seconds)
+
+    def Request(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        seconds: float,
+        rate_limit: str | None = None,
+        tenant: str = "",
+    ) -> None:
+        """
+        Record one attempt at a YNAB request and the quota header it returned for
+        tenant's token.
+        """
+        endpoint = self.Route(method, url)
+        self._Histogram(self._upstream, endpoint).Observe(seconds)
+        self._statuses[endpoint, status] = self._statuses.get((endpoint, status), 0) + 1
+        self.Stage("upstream", seconds)
+        if rate_limit and "/" in rate_limit:
+            used, limit = rate_limit.split("/", 1)
+            if used.isdigit() and limit.isdigit():
+                self._rate_limits[tenant] = (int(used), int(limit))
+
+    def Received(self, method: str, url: str, size: int) -> None:
+        endpoint = self.Route(method, url)
+        self._bytes[endpoint] = self._bytes.get(endpoint, 0) + size
+
+    @staticmethod
+    def Route(method: str, url: str) -> str:
+        """The endpoint a URL is counted under, e.g. GET /budgets/{id}/months."""
+        path = url.split("?", 1)[0]
+        if "://" in path:
+            path = "/" + path.split("://", 1)[1].split("/", 1)[-1]
+        path = Metrics._MONTH.sub("{month}", Metrics._ID.sub("{id}", path))
+        return f"{method} {path.removeprefix('/v1')}"
+
+    @staticmethod
+    def _Histogram(histograms: dict[str, Histogram], key: str) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Metrics.Histogram()
+        return histogram
+
+    def Get(self, tenant: str | None = "") -> Metrics.Report:
+        """The metrics, with tenant's rate limit; None reports no rate limit."""
+        rate_limit = self._rate_limits.get(tenant) if tenant is not None else None
+        return Metrics.Report(
+            uptime_seconds=time.monotonic() - self._started,
+            tools={
+                name: Metrics.Tool(
+                    errors=self._tool_errors.get(name, 0), latency=x.Report()
+                )
+                for name, x in sorted(self._tools.items())
+            },
+            stages={name: x.Report() for name, x in sorted(self._stages.items())},
+            upstream={
+                endpoint: Metrics.Endpoint(
+                    requests=x.count,
+                    statuses={
+                        str(status): count
+                        for (key, status), count in sorted(self._statuses.items())
+                        if key == endpoint
+                    },
+                    response_bytes=self._bytes.get(endpoint, 0),
+                    latency=x.Report(),
+                )
+                for endpoint, x in sorted(self._upstream.items())
+            },
+            rate_limit=Metrics.RateLimit(
+                used=rate_limit[0] if rate_limit else None,
+                limit=rate_limit[1] if rate_limit else None,
+            ),
+        )
+
+    def Prometheus(self) -> str:
+        """The metrics in Prometheus' text exposition format."""
+        lines: list[str] = []
+
+        def histogram(name: str, help: str, label: str, values: dict) -> None:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, x in sorted(values.items()):
+                labels = label.format(*map(Metrics._Label, key.split(" ", 1)))
+                cumulative = 0
+                for bound, count in zip((*Metrics.BUCKETS, "+Inf"), x.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {x.sum}")
+                lines.append(f"{name}_count{{{labels}}} {x.count}")
+
+        def counter(name: str, help: str, samples: list[tuple[str, int]]) -> None:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{{{labels}}} {value}" for labels, value in samples)
+
+        histogram(
+            "ynab_mcp_tool_duration_seconds",
+            "Time spent in each MCP tool.",
+            'tool="{}"',
+            self._tools,
+        )
+        counter(
+            "ynab_mcp_tool_errors_total",
+            "MCP tool calls that raised.",
+            [
+                (f'tool="{self._Label(name)}"', count)
+                for name, count in sorted(self._tool_errors.items())
+            ],
+        )
+        histogram(
+            "ynab_mcp_stage_duration_seconds",
+            "Time spent waiting for quota, in YNAB requests and decoding responses.",
+            'stage="{}"',
+            self._stages,
+        )
+        histogram(
+            "ynab_mcp_upstream_duration_seconds",
+            "YNAB request latency by endpoint.",
+            'method="{}",endpoint="{}"',
+            self._upstream,
+        )
+        counter(
+            "ynab_mcp_upstream_requests_total",
+            "YNAB requests by endpoint and status code.",
+            [
+                (
+                    'method="{}",endpoint="{}",status="{}"'.format(
+                        *map(self._Label, endpoint.split(" ", 1)), status
+                    ),
+                    count,
+                )
+                for (endpoint, status), count in sorted(self._statuses.items())
+            ],
+        )
+        counter(
+            "ynab_mcp_upstream_response_bytes_total",
+            "Bytes received from YNAB by endpoint.",
+            [
+                (
+                    'method="{}",endpoint="{}"'.format(
+                        *map(self._Label, endpoint.split(" ", 1))
+                    ),
+                    size,
+                )
+                for endpoint, size in sorted(self._bytes.items())
+            ],
+        )
+        for i, name in enumerate(("used", "limit")):
+            if not self._rate_limits:
+                break
+            lines.append(f"# TYPE ynab_mcp_rate_limit_{name} gauge")
+            lines.extend(
+                f'ynab_mcp_rate_limit_{name}{{tenant="{self._Label(tenant)}"}} {x[i]}'
+                for tenant, x in sorted(self._rate_limits.items())
+            )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _Label(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def RegisterTools(mcp: FastMCP, metrics: Metrics):
+        """
+        Register the metrics MCP tool and resource, and a Prometheus endpoint at
+        YNAB_METRICS_PATH (default /metrics, empty to disable) for the HTTP
+        transports.
+        """
+
+        @mcp.tool()
+        async def get_metrics(
+            ctx: Context[ServerSession, AppContext],
+        ) -> Metrics.Report:
+            """
+            Report how long each tool and YNAB endpoint has taken since the server
+            started, the status codes and bytes YNAB returned, and time spent waiting
+            for quota, in requests and decoding responses, along with the caller's
+            own YNAB rate limit.
+            """
+            return metrics.Get(AppContext.Tenant(ctx).ynab.tenant)
+
+        @mcp.resource("ynab://metrics", mime_type="application/json")
+        def metrics_resource() -> str:
+            """
+            Tool and YNAB request metrics since the server started. The rate limit,
+            which is per token, is only reported by get_metrics.
+            """
+            return metrics.Get(None).model_dump_json()
+
+        path = os.environ.get("YNAB_METRICS_PATH", "/metrics")
+        if path:
+
+            @mcp.custom_route(path, methods=["GET"])
+            async def prometheus(request: Request) -> PlainTextResponse:
+                return PlainTextResponse(
+                    metrics.Prometheus(), media_type="text/plain; version=0.0.4"
+                )
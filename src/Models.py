@@ -0,0 +1,21 @@
+from __future__ import annotations
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Iterable, TypeVar
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+class Models:
+    """
+    Builds models from YNAB rows a list at a time. A list is validated in one call
+    through a cached TypeAdapter instead of one keyword-argument call per row.
+    """
+
+    _adapters: dict[type, TypeAdapter[Any]] = {}
+
+    @staticmethod
+    def Many(model: type[Model], rows: Iterable[dict[str, Any]]) -> list[Model]:
+        adapter = Models._adapters.get(model)
+        if adapter is None:
+            adapter = Models._adapters[model] = TypeAdapter(list[model])
+        return adapter.validate_python(rows if isinstance(rows, list) else list(rows))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from YNABClient import YNABClient
+from Models import Models
 from AppContext import AppContext
 from Budget import Budget
 from mcp import ServerSession
@@ -21,18 +22,12 @@ class Month(BaseModel):
     async def Get(
         ynab: YNABClient, budget: Budget | None = None
     ) -> list[Month] | YNABClient.Error:
-        response = await ynab.Send(
-            method="GET",
-            path=f"/budgets/{budget.id if budget else 'last-used'}/months",
-        )
-        if isinstance(response, YNABClient.Error):
-            return response
-        elif isinstance(response, YNABClient.Response):
-            if "months" in response.data:
-                return [Month(**month) for month in response.data["months"]]
-        raise YNABClient.Exceptions.UnexpectedError(
-            "Unexpected response format. No transaction data found."
+        months = await ynab.Sync(
+            f"/budgets/{budget.id if budget else 'last-used'}/months", "months"
         )
+        if isinstance(months, YNABClient.Error):
+            return months
+        return Models.Many(Month, months)
 
     @staticmethod
     def RegisterTools(mcp: FastMCP):
@@ -43,5 +38,5 @@ class Month(BaseModel):
             ctx: Context[ServerSession, AppContext], budget: Budget | None = None
         ) -> list[Month] | YNABClient.Error:
             """Fetch months from YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
+            client = AppContext.Tenant(ctx).ynab
             return await Month.Get(client, budget)
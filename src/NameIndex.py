@@ -0,0 +1,166 @@
+from __future__ import annotations
+from typing import Any, NamedTuple
+import math
+import re
+import unicodedata
+
+
+class NameIndex:
+    """
+    In-memory index of payee, category and account names, kept current by
+    DeltaSync as collections are synced.
+
+    Names are normalized (case-folded, accents and punctuation dropped) and split
+    into trigrams, so a search finds exact names, prefixes, partial words and
+    misspellings without a request or a scan of every entity. Entities are indexed
+    per synced path, which identifies the budget and the collection.
+    """
+
+    # Path suffix -> kind of entity indexed for it.
+    KINDS: dict[str, str] = {
+        "/payees": "payee",
+        "/categories": "category",
+        "/accounts": "account",
+    }
+    # Entity fields kept alongside the name and returned with matches.
+    _EXTRA: dict[str, tuple[str, ...]] = {
+        "payee": ("transfer_account_id",),
+        "category": ("category_group_name", "hidden"),
+        "account": ("transfer_payee_id", "closed"),
+    }
+    _PUNCTUATION = re.compile(r"[\W_]+")
+
+    class Entry(NamedTuple):
+        kind: str
+        id: str
+        name: str
+        normalized: str
+        grams: frozenset[str]
+        extra: dict[str, Any]
+
+    class Match(NamedTuple):
+        score: float
+        entry: NameIndex.Entry
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[str, NameIndex.Entry]] = {}
+        self._postings: dict[str, dict[str, set[str]]] = {}
+
+    @staticmethod
+    def Kind(path: str) -> str | None:
+        for suffix, kind in NameIndex.KINDS.items():
+            if path.endswith(suffix):
+                return kind
+        return None
+
+    @staticmethod
+    def Normalize(text: str) -> str:
+        text = unicodedata.normalize("NFKD", text.casefold())
+        text = "".join(x for x in text if not unicodedata.combining(x))
+        return NameIndex._PUNCTUATION.sub(" ", text).strip()
+
+    @staticmethod
+    def Grams(normalized: str) -> frozenset[str]:
+        padded = f"  {normalized} "
+        return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+    def Update(
+        self,
+        path: str,
+        upserts: dict[str, dict[str, Any]],
+        deletes: list[str],
+        replace: bool = False,
+    ) -> None:
+        """Apply a merge DeltaSync made to path; replace starts the path over."""
+        kind = self.Kind(path)
+        if kind is None:
+            return
+        if replace:
+            self._entries.pop(path, None)
+            self._postings.pop(path, None)
+        entries = self._entries.setdefault(path, {})
+        postings = self._postings.setdefault(path, {})
+        for id in (*deletes, *upserts):
+            entry = entries.pop(id, None)
+            if entry is None:
+                continue
+            for gram in entry.grams:
+                ids = postings[gram]
+                ids.discard(id)
+                if not ids:
+                    del postings[gram]
+        for id, entity in upserts.items():
+            name = entity.get("name")
+            if not name:
+                continue
+            normalized = self.Normalize(name)
+            entry = NameIndex.Entry(
+                kind,
+                id,
+                name,
+                normalized,
+                self.Grams(normalized),
+                {x: entity.get(x) for x in self._EXTRA[kind]},
+            )
+            entries[id] = entry
+            for gram in entry.grams:
+                postings.setdefault(gram, set()).add(id)
+
+    def Forget(self, path: str | None = None) -> None:
+        if path is None:
+            self._entries.clear()
+            self._postings.clear()
+            return
+        self._entries.pop(path, None)
+        self._postings.pop(path, None)
+
+    def Search(
+        self, paths: list[str], query: str, limit: int = 5, minimum: float = 0.3
+    ) -> list[NameIndex.Match]:
+        """
+        The best matches for query among the entities synced for paths, best first.
+
+        An exact name scores 1, a name starting with the query 0.9 and a name
+        containing it 0.8; other names score by trigram overlap, up to 0.75.
+        """
+        normalized = self.Normalize(query)
+        if not normalized:
+            return []
+        grams = self.Grams(normalized)
+        # A name sharing fewer trigrams than this can't score minimum, and one
+        # sharing this many must share one of the rarest len(grams) - needed + 1,
+        # so only their postings need to be read.
+        needed = max(1, math.ceil(minimum * len(grams) / (1.5 - minimum)))
+        matches: list[NameIndex.Match] = []
+        floor = minimum
+        for path in paths:
+            entries = self._entries.get(path, {})
+            postings = self._postings.get(path, {})
+            rarest = sorted(grams, key=lambda x: len(postings.get(x, ())))
+            candidates: set[str] = set()
+            for gram in rarest[: len(grams) - needed + 1]:
+                candidates.update(postings.get(gram, ()))
+            for id in candidates:
+                entry = entries[id]
+                count = len(grams & entry.grams)
+                if entry.normalized == normalized:
+                    score = 1.0
+                elif entry.normalized.startswith(normalized):
+                    score = 0.9
+                elif normalized in entry.normalized:
+                    score = 0.8
+                else:
+                    score = 1.5 * count / (len(grams) + len(entry.grams))
+                if score >= floor:
+                    matches.append(NameIndex.Match(score, entry))
+                    if len(matches) > 4 * limit:
+                        # Keep the best limit and only look for ones at least as good.
+                        self._Rank(matches, limit)
+                        floor = matches[-1].score
+        self._Rank(matches, limit)
+        return matches
+
+    @staticmethod
+    def _Rank(matches: list[NameIndex.Match], limit: int) -> None:
+        matches.sort(key=lambda x: (-x.score, len(x.entry.name), x.entry.name))
+        del matches[limit:]
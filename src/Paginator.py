@@ -0,0 +1,101 @@
+from __future__ import annotations
+from typing import Any, Iterable, NamedTuple
+import base64
+import hashlib
+import json
+import os
+import time
+
+
+class Paginator:
+    """
+    Large results served page by page through self-contained cursors.
+
+    A cursor carries the query that produced the result, the next page's offset
+    and size, and a digest of the ids in the result, so any worker process can
+    serve the next page by running the query again against its synced copy. If
+    the result has changed since the first page the cursor is refused rather than
+    skipping or repeating rows. Cursors expire after ttl seconds.
+    """
+
+    class Exceptions:
+        class InvalidCursor(Exception):
+            pass
+
+    class Page(NamedTuple):
+        rows: Any
+        next_cursor: str | None
+        total: int
+        # Whatever the caller stored in the cursor, e.g. the fields requested.
+        meta: Any = None
+
+    class Position(NamedTuple):
+        # The query to run again, as JSON, and the caller's meta.
+        query: Any
+        meta: Any
+        offset: int
+        size: int
+        digest: str
+        expires: float
+
+    def __init__(self, page_size: int | None = None, ttl: float | None = None) -> None:
+        self.page_size = page_size or int(os.environ.get("YNAB_PAGE_SIZE", "500"))
+        self._ttl = ttl or float(os.environ.get("YNAB_CURSOR_TTL", "600"))
+
+    def Read(self, cursor: str) -> Paginator.Position:
+        """The position a cursor points at."""
+        try:
+            position = Paginator.Position(
+                **json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            )
+        except (ValueError, TypeError):
+            raise Paginator.Exceptions.InvalidCursor(f"Invalid cursor: {cursor}")
+        if position.expires < time.time():
+            raise Paginator.Exceptions.InvalidCursor(
+                "Cursor has expired. Run the query again without a cursor."
+            )
+        return position
+
+    def Serve(
+        self,
+        rows: Any,
+        ids: Iterable[str | None],
+        query: Any,
+        meta: Any = None,
+        position: Paginator.Position | None = None,
+        page_size: int | None = None,
+    ) -> Paginator.Page:
+        """
+        The page of rows position points at, or the first page without one. ids
+        are the rows' ids, in order, and query is the JSON the rows came from.
+        """
+        start = position.offset if position else 0
+        size = max(1, page_size or (position.size if position else self.page_size))
+        end = start + size
+        if position is None and end >= len(rows):
+            return Paginator.Page(rows, None, len(rows), meta)
+        digest = self._Digest(ids)
+        if position is not None and position.digest != digest:
+            raise Paginator.Exceptions.InvalidCursor(
+                "The results have changed since the first page. Run the query "
+                "again without a cursor."
+            )
+        cursor = None
+        if end < len(rows):
+            expires = position.expires if position else time.time() + self._ttl
+            cursor = self._Cursor(
+                Paginator.Position(query, meta, end, size, digest, expires)
+            )
+        return Paginator.Page(rows[start:end], cursor, len(rows), meta)
+
+    @staticmethod
+    def _Digest(ids: Iterable[str | None]) -> str:
+        digest = hashlib.sha256()
+        for id in ids:
+            digest.update(f"{id}\n".encode())
+        return digest.hexdigest()[:16]
+
+    @staticmethod
+    def _Cursor(position: Paginator.Position) -> str:
+        text = json.dumps(position._asdict(), separators=(",", ":"))
+        return base64.urlsafe_b64encode(text.encode()).decode()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from YNABClient import YNABClient
+from Models import Models
 from AppContext import AppContext
 from Budget import Budget
 from mcp import ServerSession
@@ -20,15 +21,10 @@ class Payee(BaseModel):
         budget_id = budget.id if budget else "last-used"
         url = f"/budgets/{budget_id}/payees"
 
-        response = await ynab.Send(method="GET", path=url)
-        if isinstance(response, YNABClient.Error):
-            return response
-        elif isinstance(response, YNABClient.Response):
-            if "payees" in response.data:
-                return [Payee(**x) for x in response.data["payees"]]
-        raise YNABClient.Exceptions.UnexpectedError(
-            "Unexpected response format. No payee data found."
-        )
+        payees = await ynab.Sync(url, "payees")
+        if isinstance(payees, YNABClient.Error):
+            return payees
+        return Models.Many(Payee, payees)
 
     @staticmethod
     def RegisterTools(mcp: FastMCP):
@@ -39,5 +35,5 @@ class Payee(BaseModel):
             ctx: Context[ServerSession, AppContext], budget: Budget | None = None
         ) -> list[Payee] | YNABClient.Error:
             """Fetch payees from YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
+            client = AppContext.Tenant(ctx).ynab
             return await Payee.Get(client, budget)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+from asyncio import Future, Task, get_running_loop, sleep
+from pydantic import BaseModel
+import heapq
+import itertools
+import os
+import random
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket over YNAB's per-token request quota (200 requests per rolling hour).
+
+    Requests wait for a token in priority order, so interactive writes go ahead of
+    reads and reads go ahead of background refreshes. The bucket is corrected from
+    the X-Rate-Limit header ("used/limit") YNAB returns on every response.
+    """
+
+    class Priority:
+        WRITE = 0
+        READ = 1
+        BACKGROUND = 2
+
+    class Status(BaseModel):
+        limit: int
+        remaining: int
+        waiting: int
+        retries: int
+        seconds_until_next_request: float
+
+    def __init__(
+        self,
+        limit: int | None = None,
+        period: float | None = None,
+        max_retries: int | None = None,
+    ) -> None:
+        self._limit = limit or int(os.environ.get("YNAB_RATE_LIMIT", "200"))
+        self._period = period or float(os.environ.get("YNAB_RATE_LIMIT_PERIOD", "3600"))
+        self.max_retries = (
+            max_retries
+            if max_retries is not None
+            else int(os.environ.get("YNAB_MAX_RETRIES", "4"))
+        )
+        self._rate = self._limit / self._period
+        self._tokens = float(self._limit)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, Future[None]]] = []
+        self._sequence = itertools.count()
+        self._waker: Task[None] | None = None
+        self._retries = 0
+
+    def _Refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            float(self._limit), self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def Acquire(self, priority: int = Priority.READ) -> None:
+        """Wait for a request slot."""
+        self._Refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+        future: Future[None] = get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._waker is None or self._waker.done():
+            self._waker = get_running_loop().create_task(self._Wake())
+        await future
+
+    async def _Wake(self) -> None:
+        while self._waiters:
+            self._Refill()
+            if self._tokens < 1:
+                await sleep((1 - self._tokens) / self._rate)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._tokens -= 1
+                future.set_result(None)
+
+    def Update(self, header: str | None) -> None:
+        """Trust YNAB's count of used requests over our own estimate."""
+        if not header or "/" not in header:
+            return
+        used, limit = header.split("/", 1)
+        try:
+            remaining = int(limit) - int(used)
+        except ValueError:
+            return
+        self._Refill()
+        self._tokens = float(max(remaining, 0))
+
+    def Backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        """Seconds to wait before retrying a 429, with full jitter."""
+        self._retries += 1
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return random.uniform(0, min(60.0, 2.0**attempt))
+
+    def Report(self) -> RateLimiter.Status:
+        self._Refill()
+        return RateLimiter.Status(
+            limit=self._limit,
+            remaining=int(self._tokens),
+            waiting=len(self._waiters),
+            retries=self._retries,
+            seconds_until_next_request=(
+                0.0 if self._tokens >= 1 else (1 - self._tokens) / self._rate
+            ),
+        )
@@ -0,0 +1,85 @@
+from __future__ import annotations
+from YNABClient import YNABClient
+from AppContext import AppContext
+from Budget import Budget
+from mcp import ServerSession
+from mcp.server.fastmcp import Context, FastMCP
+from NameIndex import NameIndex
+from pydantic import BaseModel
+from typing import Literal
+
+Kind = Literal["payee", "category", "account"]
+
+
+class Resolve:
+    """Looks up payee, category and account ids by name in the local name index."""
+
+    # Kind -> (path under the budget, collection synced from it).
+    _COLLECTIONS: dict[str, tuple[str, str]] = {
+        "payee": ("payees", "payees"),
+        "category": ("categories", "category_groups"),
+        "account": ("accounts", "accounts"),
+    }
+
+    class Match(BaseModel):
+        kind: Kind
+        id: str
+        name: str
+        score: float
+        category_group_name: str | None = None
+        hidden: bool | None = None
+        closed: bool | None = None
+        # A transfer payee's account, and an account's transfer payee.
+        transfer_account_id: str | None = None
+        transfer_payee_id: str | None = None
+
+    @staticmethod
+    async def Get(
+        ynab: YNABClient,
+        name: str,
+        kinds: list[Kind] | None = None,
+        budget: Budget | None = None,
+        limit: int = 5,
+    ) -> list[Resolve.Match] | YNABClient.Error:
+        budget_id = budget.id if budget else "last-used"
+        paths = []
+        for kind in kinds or list(Resolve._COLLECTIONS):
+            resource, collection = Resolve._COLLECTIONS[kind]
+            path = f"/budgets/{budget_id}/{resource}"
+            # Brings the index up to date; usually a cache hit or a small delta.
+            rows = await ynab.Sync(path, collection)
+            if isinstance(rows, YNABClient.Error):
+                return rows
+            paths.append(path)
+        return [
+            Resolve.Match(
+                kind=match.entry.kind,
+                id=match.entry.id,
+                name=match.entry.name,
+                score=round(match.score, 3),
+                **match.entry.extra,
+            )
+            for match in ynab.names.Search(paths, name, max(1, limit))
+        ]
+
+    @staticmethod
+    def RegisterTools(mcp: FastMCP):
+        """Register name resolution MCP tools."""
+
+        @mcp.tool()
+        async def resolve(
+            ctx: Context[ServerSession, AppContext],
+            name: str,
+            kinds: list[Kind] | None = None,
+            budget: Budget | None = None,
+            limit: int = 5,
+        ) -> list[Resolve.Match] | YNABClient.Error:
+            """
+            Find payee, category and account ids by name, best match first. Matches
+            partial names and tolerates typos, so use this instead of listing every
+            payee or category to find one. kinds narrows the search to payees,
+            categories or accounts. Transfer payees are named "Transfer : <account>";
+            an account's transfer_payee_id is the payee to use for transfers to it.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            return await Resolve.Get(client, name, kinds, budget, limit)
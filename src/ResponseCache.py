@@ -0,0 +1,161 @@
+from __future__ import annotations
+from collections import OrderedDict
+from pydantic import BaseModel
+from typing import Any
+import os
+import time
+
+
+class ResponseCache:
+    """
+    Bounded cache of YNAB reads keyed by request path.
+
+    Entries expire after a per-resource TTL and the least recently used entries are
+    evicted once the cached responses exceed max_bytes. Writes invalidate only the
+    resources they can change, for the budget they were made against.
+    """
+
+    class Stats(BaseModel):
+        hits: int
+        misses: int
+        evictions: int
+        invalidations: int
+        entries: int
+        bytes: int
+        max_bytes: int
+
+    _TTLS: dict[str, float] = {
+        "user": 3600,
+        "budgets": 300,
+        "settings": 3600,
+        "payees": 300,
+        "accounts": 60,
+        "categories": 60,
+        "months": 60,
+        "month_categories": 60,
+        "transactions": 30,
+        "scheduled_transactions": 60,
+    }
+    _DEFAULT_TTL = 60.0
+
+    # Resources a write to the key resource can change.
+    _AFFECTS: dict[str, set[str]] = {
+        "transactions": {
+            "accounts",
+            "categories",
+            "months",
+            "month_categories",
+            "transactions",
+            "payees",
+        },
+        "categories": {"categories", "months", "month_categories"},
+        "payees": {"payees", "transactions"},
+        "accounts": {"accounts", "payees"},
+    }
+
+    def __init__(
+        self, max_bytes: int | None = None, ttls: dict[str, float] | None = None
+    ) -> None:
+        self._max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else int(os.environ.get("YNAB_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        )
+        self._ttls = {**self._TTLS, **(ttls or {})}
+        self._entries: OrderedDict[str, tuple[Any, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        # Writes seen per budget id, and in all, so a read that started before a
+        # write can tell its response is stale.
+        self._writes: dict[str, int] = {}
+        self._all_writes = 0
+
+    @staticmethod
+    def _Parse(path: str) -> tuple[str | None, set[str]]:
+        """Split a path into its budget id and the resources it reads."""
+        segments = path.split("?", 1)[0].strip("/").split("/")
+        if segments[0] != "budgets" or len(segments) < 2:
+            return None, {segments[0]}
+        return segments[1], set(segments[2::2])
+
+    def Get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[2] < time.monotonic():
+            if entry is not None:
+                self._Drop(key)
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[0]
+
+    def Generation(self, key: str) -> int:
+        """Count of writes that can affect key; read it when a request starts."""
+        budget, _ = self._Parse(key)
+        if budget is None:
+            return 0
+        if budget == "last-used":
+            return self._all_writes
+        return self._writes.get(budget, 0) + self._writes.get("last-used", 0)
+
+    def Put(
+        self, key: str, value: Any, size: int, generation: int | None = None
+    ) -> None:
+        """
+        Cache value for key, unless a write that can affect key was invalidated
+        since generation was read: the value may predate it.
+        """
+        if generation is not None and generation != self.Generation(key):
+            return
+        if key in self._entries:
+            self._Drop(key)
+        if size > self._max_bytes:
+            return
+        _, resources = self._Parse(key)
+        ttl = min(
+            (self._ttls.get(x, self._DEFAULT_TTL) for x in resources),
+            default=self._DEFAULT_TTL,
+        )
+        self._entries[key] = (value, size, time.monotonic() + ttl)
+        self._bytes += size
+        while self._bytes > self._max_bytes:
+            self._Drop(next(iter(self._entries)))
+            self._evictions += 1
+
+    def Invalidate(self, path: str) -> None:
+        """Drop entries a write to path may have made stale."""
+        budget, resources = self._Parse(path)
+        if budget is None:
+            return
+        self._writes[budget] = self._writes.get(budget, 0) + 1
+        self._all_writes += 1
+        affected = set().union(*(self._AFFECTS.get(x, {x}) for x in resources))
+        for key in list(self._entries):
+            key_budget, key_resources = self._Parse(key)
+            if key_budget is None:
+                continue
+            # last-used may be an alias for any budget id, in either direction.
+            if budget != key_budget and "last-used" not in (budget, key_budget):
+                continue
+            # The budget itself (/budgets/{id}) contains every resource.
+            if not key_resources or key_resources & affected:
+                self._Drop(key)
+                self._invalidations += 1
+
+    def _Drop(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def Report(self) -> ResponseCache.Stats:
+        return ResponseCache.Stats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            invalidations=self._invalidations,
+            entries=len(self._entries),
+            bytes=self._bytes,
+            max_bytes=self._max_bytes,
+        )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+from AppContext import AppContext
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+
+class SharedContext:
+    """
+    One AppContext shared by every session of the server.
+
+    Over HTTP each session, or each request when stateless, enters the server's
+    lifespan, so without this every client would get its own client pool, and
+    with it its own connections, cache and rate limiter for the same token. The
+    context is created by the first holder and closed when the last one leaves;
+    the HTTP app holds it for its whole lifetime.
+    """
+
+    def __init__(self, factory: Callable[[], AppContext]) -> None:
+        self._factory = factory
+        self._context: AppContext | None = None
+        self._holders = 0
+
+    @property
+    def holders(self) -> int:
+        return self._holders
+
+    @asynccontextmanager
+    async def Hold(self) -> AsyncIterator[AppContext]:
+        if self._context is None:
+            self._context = self._factory()
+            if self._context.warmup is not None:
+                self._context.warmup.Start()
+        self._holders += 1
+        try:
+            yield self._context
+        finally:
+            self._holders -= 1
+            if not self._holders:
+                context, self._context = self._context, None
+                if context.warmup is not None:
+                    await context.warmup.Stop()
+                await context.clients.Close()
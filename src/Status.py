@@ -0,0 +1,30 @@
+from __future__ import annotations
+from YNABClient import YNABClient
+from AppContext import AppContext
+from mcp import ServerSession
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import BaseModel
+from RateLimiter import RateLimiter
+from ResponseCache import ResponseCache
+
+
+class Status(BaseModel):
+    rate_limit: RateLimiter.Status
+    cache: ResponseCache.Stats
+
+    @staticmethod
+    def Get(ynab: YNABClient) -> Status:
+        return Status(rate_limit=ynab.rate_limit.Report(), cache=ynab.cache.Report())
+
+    @staticmethod
+    def RegisterTools(mcp: FastMCP):
+        """Register server status MCP tools."""
+
+        @mcp.tool()
+        async def get_status(ctx: Context[ServerSession, AppContext]) -> Status:
+            """
+            Report how much YNAB API request quota is left for this session and how
+            well the response cache is working.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            return Status.Get(ynab=client)
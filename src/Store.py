@@ -0,0 +1,89 @@
+from __future__ import annotations
+from pydantic_core import from_json, to_json
+from typing import Any, Iterable
+import os
+import sqlite3
+
+
+class Store:
+    """
+    On-disk mirror of DeltaSync's collections, so a restarted server resumes with a
+    delta request per path instead of downloading every collection again.
+
+    Entities are stored as JSON keyed by (path, id) alongside each path's
+    server_knowledge cursor. Enabled by pointing YNAB_STORE_PATH at a file on a
+    mounted volume. Clients for different tokens share the file under different
+    path prefixes.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cursors (
+            path TEXT PRIMARY KEY,
+            server_knowledge INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS entities (
+            path TEXT NOT NULL,
+            id TEXT NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (path, id)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, filename: str, prefix: str = "") -> None:
+        self._prefix = prefix
+        self._connection = sqlite3.connect(filename)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(self._SCHEMA)
+
+    @classmethod
+    def FromEnvironment(cls, prefix: str = "") -> Store | None:
+        filename = os.environ.get("YNAB_STORE_PATH")
+        return cls(filename, prefix) if filename else None
+
+    def Load(self, path: str) -> tuple[int | None, dict[str, dict[str, Any]]]:
+        """Return the stored cursor and entities for path."""
+        path = self._prefix + path
+        row = self._connection.execute(
+            "SELECT server_knowledge FROM cursors WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None, {}
+        entities = self._connection.execute(
+            "SELECT id, data FROM entities WHERE path = ?", (path,)
+        )
+        return row[0], {id: from_json(data) for id, data in entities}
+
+    def Save(
+        self,
+        path: str,
+        server_knowledge: int | None,
+        upserts: Iterable[tuple[str, dict[str, Any]]],
+        deletes: Iterable[str],
+        replace: bool = False,
+    ) -> None:
+        """
+        Write one merged response, or part of one; replace drops the path's rows
+        first. The cursor is only moved once server_knowledge is known.
+        """
+        path = self._prefix + path
+        with self._connection:
+            if replace:
+                self._connection.execute("DELETE FROM entities WHERE path = ?", (path,))
+            self._connection.executemany(
+                "DELETE FROM entities WHERE path = ? AND id = ?",
+                ((path, id) for id in deletes),
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO entities (path, id, data) VALUES (?, ?, ?)",
+                ((path, id, to_json(entity)) for id, entity in upserts),
+            )
+            if server_knowledge is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO cursors (path, server_knowledge) "
+                    "VALUES (?, ?)",
+                    (path, server_knowledge),
+                )
+
+    def Close(self) -> None:
+        self._connection.close()
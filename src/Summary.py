@@ -0,0 +1,189 @@
+from __future__ import annotations
+from YNABClient import YNABClient
+from AppContext import AppContext
+from Budget import Budget
+from mcp import ServerSession
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import BaseModel, computed_field
+from Transaction import Transaction
+from TransactionStore import TransactionStore
+from typing import Any, ClassVar
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None
+
+
+class Summary(BaseModel):
+    """
+    Transaction totals grouped by category, payee, account and/or month.
+    Amounts are in milliunits; outflows are negative.
+    """
+
+    class Row(BaseModel):
+        group: list[str | None]
+        names: list[str | None]
+        total: int
+        inflow: int
+        outflow: int
+        count: int
+
+        @computed_field
+        @property
+        def total_in_currency(self) -> float:
+            return self.total / 1000.0
+
+    group_by: list[str]
+    rows: list[Summary.Row]
+    transaction_count: int
+
+    # Grouping -> (id field, name field) on a YNAB transaction.
+    _GROUPS: ClassVar[dict[str, tuple[str, str | None]]] = {
+        "category": ("category_id", "category_name"),
+        "payee": ("payee_id", "payee_name"),
+        "account": ("account_id", "account_name"),
+        "month": ("date", None),
+    }
+
+    @staticmethod
+    def Summarize(
+        rows: list[dict[str, Any]] | TransactionStore.View,
+        group_by: list[str],
+        parts: list[dict[str, Any]] | None = None,
+    ) -> Summary:
+        """
+        Group and total rows, splitting split transactions into their parts. Parts
+        already split off (see Transaction.Split) can be passed separately.
+        """
+        unknown = [x for x in group_by if x not in Summary._GROUPS]
+        if unknown or not group_by:
+            raise ValueError(
+                f"Cannot group by {', '.join(unknown) or 'nothing'}. "
+                f"Choose from: {', '.join(Summary._GROUPS)}"
+            )
+        fields = [Summary._GROUPS[x] for x in group_by]
+        rows, split = Transaction.Split(rows)
+        parts = split + (parts or [])
+        columns = [
+            Summary._Column(rows, id_field) + Summary._Column(parts, id_field)
+            for id_field, _ in fields
+        ]
+        amounts = Summary._Column(rows, "amount") + Summary._Column(parts, "amount")
+
+        def row(i: int) -> dict[str, Any]:
+            return rows[i] if i < len(rows) else parts[i - len(rows)]
+
+        summary_rows = [
+            Summary.Row(
+                group=[column[first] for column in columns],
+                names=[
+                    row(first).get(name) if name else column[first]
+                    for (_, name), column in zip(fields, columns)
+                ],
+                total=total,
+                inflow=inflow,
+                outflow=outflow,
+                count=count,
+            )
+            for first, total, inflow, outflow, count in Summary._Totals(
+                columns, amounts
+            )
+        ]
+        if group_by == ["month"]:
+            summary_rows.sort(key=lambda x: x.group[0] or "")
+        else:
+            summary_rows.sort(key=lambda x: -abs(x.total))
+        return Summary(
+            group_by=group_by, rows=summary_rows, transaction_count=len(amounts)
+        )
+
+    @staticmethod
+    def _Column(
+        rows: list[dict[str, Any]] | TransactionStore.View, field: str
+    ) -> list[Any]:
+        """One field of every row; date is cut to the month and amount defaults to 0."""
+        if isinstance(rows, TransactionStore.View):
+            return rows.Column("month" if field == "date" else field)
+        if field == "date":
+            return [(x.get("date") or "")[:7] for x in rows]
+        if field == "amount":
+            return [x.get("amount") or 0 for x in rows]
+        return [x.get(field) for x in rows]
+
+    @staticmethod
+    def _Totals(
+        columns: list[list[str | None]], amounts: list[int]
+    ) -> list[tuple[int, int, int, int, int]]:
+        """
+        Per group of equal column values: the index of its first row, total, inflow,
+        outflow and count.
+        """
+        if numpy is None or not amounts:
+            groups: dict[tuple[str | None, ...], list[int]] = {}
+            for i, (key, amount) in enumerate(zip(zip(*columns), amounts)):
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = [i, 0, 0, 0, 0]
+                group[1] += amount
+                group[2 if amount > 0 else 3] += amount
+                group[4] += 1
+            return [tuple(x) for x in groups.values()]
+
+        # Code each column's values as integers and combine them into one group code,
+        # then total each group with a sort and reduceat rather than a Python loop.
+        size = len(amounts)
+        combined = numpy.zeros(size, dtype=numpy.int64)
+        for column in columns:
+            index = {x: i for i, x in enumerate(dict.fromkeys(column))}
+            codes = numpy.asarray(list(map(index.__getitem__, column)), numpy.int64)
+            combined = combined * len(index) + codes
+        _, first, inverse = numpy.unique(
+            combined, return_index=True, return_inverse=True
+        )
+        order = numpy.argsort(inverse, kind="stable")
+        sorted_amounts = numpy.asarray(amounts, dtype=numpy.int64)[order]
+        starts = numpy.flatnonzero(numpy.diff(inverse[order], prepend=-1))
+        total = numpy.add.reduceat(sorted_amounts, starts)
+        inflow = numpy.add.reduceat(numpy.maximum(sorted_amounts, 0), starts)
+        count = numpy.diff(starts, append=size)
+        return list(
+            zip(
+                first.tolist(),
+                total.tolist(),
+                inflow.tolist(),
+                (total - inflow).tolist(),
+                count.tolist(),
+            )
+        )
+
+    @staticmethod
+    def RegisterTools(mcp: FastMCP):
+        """Register summary-related MCP tools."""
+
+        @mcp.tool()
+        async def summarize_transactions(
+            ctx: Context[ServerSession, AppContext],
+            group_by: list[str] | None = None,
+            budget: Budget | None = None,
+            filter: Transaction.Filter | None = None,
+        ) -> Summary | YNABClient.Error:
+            """
+            Total transactions by category, payee, account and/or month (e.g.
+            ["category", "month"]; by category if not given) without fetching
+            them into the conversation. Use filter to restrict dates, accounts,
+            categories etc. first.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            rows = await Transaction.Rows(ynab=client, budget=budget)
+            if isinstance(rows, YNABClient.Error):
+                return rows
+            # Filter split parts rather than whole splits, so category and payee
+            # filters pick out the parts that belong to them.
+            rows, parts = Transaction.Split(rows)
+            if filter:
+                rows = filter.Apply(rows)
+                parts = filter.Apply(parts)
+            if group_by is None:
+                group_by = ["category"]
+            return Summary.Summarize(rows, group_by, parts)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+from bisect import bisect_left
+from functools import lru_cache
+from NameIndex import NameIndex
+from typing import Any
+import math
+
+
+class TextIndex:
+    """
+    Inverted index of the words in synced transactions, kept current by DeltaSync.
+
+    A transaction is indexed under the words of its payee name, memo and imported
+    payee names, and those of its subtransactions. Each query word matches indexed
+    words exactly, by prefix or, for longer words, by trigram similarity, so typos
+    and partial words still find transactions. Rare words count for more than
+    common ones.
+    """
+
+    FIELDS = ("payee_name", "memo", "import_payee_name", "import_payee_name_original")
+    # Weight of a word matched by prefix, and the most words a prefix expands to.
+    _PREFIX_WEIGHT = 0.7
+    _MAX_PREFIXED = 100
+    # Weight of a misspelled word at full similarity, and the least similarity.
+    _FUZZY_WEIGHT = 0.6
+    _MIN_SIMILARITY = 0.5
+
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[str, set[str]]] = {}
+        self._documents: dict[str, dict[str, frozenset[str]]] = {}
+        # Words of each path by trigram, and in order for prefix lookups.
+        self._grams: dict[str, dict[str, set[str]]] = {}
+        self._sorted: dict[str, list[str]] = {}
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def Words(text: str) -> tuple[str, ...]:
+        # Payee names and memos repeat, so most rows are tokenized from the cache.
+        return tuple(NameIndex.Normalize(text).split())
+
+    @staticmethod
+    def _Document(row: dict[str, Any]) -> frozenset[str]:
+        words: set[str] = set()
+        for entity in (row, *(row.get("subtransactions") or [])):
+            if entity.get("deleted") and entity is not row:
+                continue
+            for field in TextIndex.FIELDS:
+                if entity.get(field):
+                    words.update(TextIndex.Words(entity[field]))
+        return frozenset(words)
+
+    def Update(
+        self,
+        path: str,
+        upserts: dict[str, dict[str, Any]],
+        deletes: list[str],
+        replace: bool = False,
+    ) -> None:
+        """Apply a merge DeltaSync made to path; replace starts the path over."""
+        if not path.endswith("/transactions"):
+            return
+        if replace:
+            self.Forget(path)
+        postings = self._postings.setdefault(path, {})
+        documents = self._documents.setdefault(path, {})
+        grams = self._grams.setdefault(path, {})
+        changed = False
+        for id in (*deletes, *upserts):
+            for word in documents.pop(id, ()):
+                ids = postings[word]
+                ids.discard(id)
+                if not ids:
+                    del postings[word]
+                    for gram in NameIndex.Grams(word):
+                        grams[gram].discard(word)
+                        if not grams[gram]:
+                            del grams[gram]
+                    changed = True
+        for id, row in upserts.items():
+            words = self._Document(row)
+            documents[id] = words
+            for word in words:
+                ids = postings.get(word)
+                if ids is None:
+                    ids = postings[word] = set()
+                    for gram in NameIndex.Grams(word):
+                        grams.setdefault(gram, set()).add(word)
+                    changed = True
+                ids.add(id)
+        if changed:
+            self._sorted.pop(path, None)
+
+    def Forget(self, path: str | None = None) -> None:
+        for index in (self._postings, self._documents, self._grams, self._sorted):
+            if path is None:
+                index.clear()
+            else:
+                index.pop(path, None)
+
+    def Search(self, path: str, query: str) -> dict[str, float]:
+        """Scores of the transactions synced for path that match query, by id."""
+        postings = self._postings.get(path, {})
+        total = len(self._documents.get(path, {}))
+        scores: dict[str, float] = {}
+        for term in dict.fromkeys(self.Words(query)):
+            best: dict[str, float] = {}
+            for word, weight in self._Expand(path, term).items():
+                weight *= math.log(1 + total / len(postings[word]))
+                for id in postings[word]:
+                    if best.get(id, 0.0) < weight:
+                        best[id] = weight
+            for id, weight in best.items():
+                scores[id] = scores.get(id, 0.0) + weight
+        return scores
+
+    def _Expand(self, path: str, term: str) -> dict[str, float]:
+        """Indexed words term matches, with the weight of each match."""
+        postings = self._postings.get(path, {})
+        matches: dict[str, float] = {}
+        if len(term) >= 2:
+            words = self._sorted.get(path)
+            if words is None:
+                words = self._sorted[path] = sorted(postings)
+            start = bisect_left(words, term)
+            for word in words[start : start + self._MAX_PREFIXED]:
+                if not word.startswith(term):
+                    break
+                matches[word] = self._PREFIX_WEIGHT
+        if len(term) >= 4:
+            grams = NameIndex.Grams(term)
+            shared: dict[str, int] = {}
+            for gram in grams:
+                for word in self._grams.get(path, {}).get(gram, ()):
+                    shared[word] = shared.get(word, 0) + 1
+            for word, count in shared.items():
+                similarity = 2 * count / (len(grams) + len(word) + 1)
+                if similarity >= self._MIN_SIMILARITY:
+                    weight = self._FUZZY_WEIGHT * similarity
+                    matches[word] = max(matches.get(word, 0.0), weight)
+        if term in postings:
+            matches[term] = 1.0
+        return matches
@@ -4,11 +4,18 @@ from Budget import Budget
 from Category import Category
 from Month import Month
 from YNABClient import YNABClient
+from Models import Models
 from AppContext import AppContext
 from mcp import ServerSession
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import BaseModel, Field, computed_field
-from typing import Any
+from DuplicateIndex import DuplicateIndex
+from TextIndex import TextIndex
+from TransactionStore import TransactionStore
+from typing import Any, Callable, ClassVar, Iterable, Iterator, Literal
+from datetime import date
+from asyncio import gather
+import calendar
 
 from Payee import Payee
 
@@ -23,9 +30,7 @@ class Transaction(BaseModel):
     account_id: str | None = Field(default=None)
     amount: int | None = Field(default=None, description="Amount in milliunits")
     approved: bool | None = Field(default=None)
-    cleared: str | None = Field(
-        default=None, pattern=r"^(cleared|uncleared|reconciled)$"
-    )
+    cleared: Literal["cleared", "uncleared", "reconciled"] | None = Field(default=None)
     date: str | None = Field(default=None)
     deleted: bool | None = Field(default=None)
     # flag_color:
@@ -43,6 +48,162 @@ class Transaction(BaseModel):
     import_payee_name_original: str | None = Field(default=None)
     debt_transaction_type: str | None = Field(default=None)
 
+    class Result(BaseModel):
+        """Outcome of one transaction in a bulk request, by position in the input."""
+
+        index: int
+        status: Literal["created", "updated", "duplicate", "error"]
+        transaction: Transaction | None = Field(default=None)
+        error: YNABClient.Error | None = Field(default=None)
+        # The existing transaction a duplicate was found to match, when known.
+        duplicate_of: str | None = Field(default=None)
+
+    class Duplicate(BaseModel):
+        """
+        An existing transaction that the input transaction at index may duplicate:
+        the same import_id, or the same account and amount within days_apart days,
+        with (amount_date_payee) or without (amount_date) the same payee.
+        """
+
+        index: int
+        transaction_id: str
+        reason: Literal["import_id", "amount_date_payee", "amount_date"]
+        days_apart: int | None = Field(default=None)
+
+    class Page(BaseModel):
+        """
+        One page of a transaction list. Pass next_cursor back as cursor to get the
+        next page; it is null on the last page.
+        """
+
+        transactions: list[dict[str, Any]] | list[Transaction]
+        total: int
+        next_cursor: str | None = Field(default=None)
+
+    class Query(BaseModel):
+        """
+        What a transaction list is made from; cursors carry it so any worker can
+        make the list again. search ranks by the words given instead of date.
+        """
+
+        budget: Budget | None = Field(default=None)
+        category: Category | None = Field(default=None)
+        account: Account | None = Field(default=None)
+        month: Month | None = Field(default=None)
+        payee: Payee | None = Field(default=None)
+        since: str | None = Field(default=None)
+        filter: Transaction.Filter | None = Field(default=None)
+        search: str | None = Field(default=None)
+
+        async def Run(
+            self, ynab: YNABClient
+        ) -> list[dict[str, Any]] | TransactionStore.View | YNABClient.Error:
+            if self.search is not None:
+                return await Transaction.Search(
+                    ynab, self.search, self.budget, self.filter
+                )
+            return await Transaction.Rows(
+                ynab,
+                self.budget,
+                self.category,
+                self.account,
+                self.month,
+                self.payee,
+                self.since,
+                self.filter,
+            )
+
+    class Filter(BaseModel):
+        """
+        Conditions a transaction must meet to be returned; unset conditions match
+        everything. Dates are ISO (YYYY-MM-DD) and inclusive. Amounts are inclusive
+        and in milliunits, with outflows negative.
+        """
+
+        start_date: str | None = Field(default=None)
+        end_date: str | None = Field(default=None)
+        min_amount: int | None = Field(default=None)
+        max_amount: int | None = Field(default=None)
+        cleared: list[str] | None = Field(
+            default=None, description="Any of cleared, uncleared, reconciled"
+        )
+        approved: bool | None = Field(default=None)
+        account_ids: list[str] | None = Field(default=None)
+        category_ids: list[str] | None = Field(default=None)
+        payee_ids: list[str] | None = Field(default=None)
+        memo_contains: str | None = Field(
+            default=None, description="Case-insensitive text to find in the memo"
+        )
+
+        def Apply(
+            self, rows: list[dict[str, Any]] | TransactionStore.View
+        ) -> list[dict[str, Any]] | TransactionStore.View:
+            if isinstance(rows, TransactionStore.View):
+                return rows.Where(*self._Masks(rows))
+            checks: list[Callable[[dict[str, Any]], bool]] = []
+            if self.start_date:
+                start_date = self.start_date
+                checks.append(lambda x: (x.get("date") or "") >= start_date)
+            if self.end_date:
+                end_date = self.end_date
+                checks.append(lambda x: (x.get("date") or "") <= end_date)
+            if self.min_amount is not None:
+                min_amount = self.min_amount
+                checks.append(lambda x: (x.get("amount") or 0) >= min_amount)
+            if self.max_amount is not None:
+                max_amount = self.max_amount
+                checks.append(lambda x: (x.get("amount") or 0) <= max_amount)
+            if self.cleared:
+                cleared = set(self.cleared)
+                checks.append(lambda x: x.get("cleared") in cleared)
+            if self.approved is not None:
+                approved = self.approved
+                checks.append(lambda x: bool(x.get("approved")) == approved)
+            for field, values in (
+                ("account_id", self.account_ids),
+                ("category_id", self.category_ids),
+                ("payee_id", self.payee_ids),
+            ):
+                if values:
+                    checks.append(
+                        lambda x, field=field, ids=set(values): x.get(field) in ids
+                    )
+            if self.memo_contains:
+                text = self.memo_contains.casefold()
+                checks.append(lambda x: text in (x.get("memo") or "").casefold())
+            if not checks:
+                return rows
+            return [x for x in rows if all(check(x) for check in checks)]
+
+        def _Masks(self, rows: TransactionStore.View) -> list[Any]:
+            """The same conditions as Apply, evaluated a column at a time."""
+            masks = []
+            if self.start_date or self.end_date:
+                masks.append(
+                    rows.Range("date", self.start_date or None, self.end_date or None)
+                )
+            if self.min_amount is not None or self.max_amount is not None:
+                masks.append(rows.Range("amount", self.min_amount, self.max_amount))
+            if self.cleared:
+                masks.append(rows.In("cleared", self.cleared))
+            if self.approved is not None:
+                masks.append(rows.In("approved", [self.approved]))
+            for field, values in (
+                ("account_id", self.account_ids),
+                ("category_id", self.category_ids),
+                ("payee_id", self.payee_ids),
+            ):
+                if values:
+                    masks.append(rows.In(field, values))
+            if self.memo_contains:
+                masks.append(rows.Contains("memo", self.memo_contains))
+            return masks
+
+    _BULK_CHUNK_SIZE: ClassVar[int] = 100
+    # Duplicates likely enough to skip creating a transaction for.
+    _LIKELY: ClassVar[tuple[str, ...]] = ("import_id", "amount_date_payee")
+    _PROGRESS_INTERVAL: ClassVar[int] = 500
+
     @computed_field
     @property
     def amount_in_currency(self) -> float | None:
@@ -63,34 +224,157 @@ class Transaction(BaseModel):
         since: str | None = None,
     ) -> Transaction | list[Transaction] | YNABClient.Error:
         budget_id = budget.id if budget else "last-used"
-        url: str
         if transaction:
             url = f"/budgets/{budget_id}/transactions/{transaction.id}"
-        elif category:
-            url = f"/budgets/{budget_id}/categories/{category.id}/transactions"
+            response = await ynab.Send(method="GET", path=url)
+            if isinstance(response, YNABClient.Error):
+                return response
+            elif isinstance(response, YNABClient.Response):
+                if "transaction" in response.data:
+                    return Transaction(**response.data["transaction"])
+            raise YNABClient.Exceptions.UnexpectedError(
+                "Unexpected response format. No transaction data found."
+            )
+
+        rows = await Transaction.Rows(
+            ynab, budget, category, account, month, payee, since
+        )
+        if isinstance(rows, YNABClient.Error):
+            return rows
+        return Models.Many(Transaction, rows)
+
+    @staticmethod
+    async def Rows(
+        ynab: YNABClient,
+        budget: Budget | None = None,
+        category: Category | None = None,
+        account: Account | None = None,
+        month: Month | None = None,
+        payee: Payee | None = None,
+        since: str | None = None,
+        filter: Transaction.Filter | None = None,
+    ) -> list[dict[str, Any]] | TransactionStore.View | YNABClient.Error:
+        """
+        Transactions as raw YNAB dicts, or a View over the columnar copy that builds
+        them only as they are read, sorted by date.
+        """
+        budget_id = budget.id if budget else "last-used"
+        # Every list is derived from one delta-synced copy of the budget's
+        # transactions; the per-account/category/month/payee endpoints can't be
+        # synced safely because entities moving out of them aren't reported.
+        rows = await ynab.Sync(f"/budgets/{budget_id}/transactions", "transactions")
+        if isinstance(rows, YNABClient.Error):
+            return rows
+
+        if category:
+            rows = Transaction._Hybrid(rows, "category_id", category.id)
         elif account:
-            url = f"/budgets/{budget_id}/accounts/{account.id}/transactions"
+            rows = Transaction.Filter(account_ids=[account.id]).Apply(rows)
         elif month:
-            url = f"/budgets/{budget_id}/months/{month.month}/transactions"
+            prefix = (
+                date.today().isoformat() if month.month == "current" else month.month
+            )[:7]
+            year, number = (int(x) for x in prefix.split("-"))
+            last = calendar.monthrange(year, number)[1]
+            rows = Transaction.Filter(
+                start_date=f"{prefix}-01", end_date=f"{prefix}-{last:02d}"
+            ).Apply(rows)
         elif payee:
-            url = f"/budgets/{budget_id}/payees/{payee.id}/transactions"
-        else:
-            url = f"/budgets/{budget_id}/transactions"
+            rows = Transaction._Hybrid(rows, "payee_id", payee.id)
 
         if since:
-            url += f"?since={since}"
+            rows = Transaction.Filter(start_date=since).Apply(rows)
+        if filter:
+            rows = filter.Apply(rows)
+        if isinstance(rows, TransactionStore.View):
+            return rows.SortedBy("date")
+        return sorted(rows, key=lambda x: x.get("date") or "")
 
-        response = await ynab.Send(method="GET", path=url)
-        if isinstance(response, YNABClient.Error):
-            return response
-        elif isinstance(response, YNABClient.Response):
-            if "transaction" in response.data:
-                return Transaction(**response.data["transaction"])
-            elif "transactions" in response.data:
-                return [Transaction(**x) for x in response.data["transactions"]]
-        raise YNABClient.Exceptions.UnexpectedError(
-            "Unexpected response format. No transaction data found."
-        )
+    @staticmethod
+    async def Search(
+        ynab: YNABClient,
+        query: str,
+        budget: Budget | None = None,
+        filter: Transaction.Filter | None = None,
+    ) -> list[dict[str, Any]] | TransactionStore.View | YNABClient.Error:
+        """
+        Transactions matching query in their payee, memo or imported payee names,
+        best match first, as raw YNAB dicts or a View over the columnar copy.
+        """
+        if not TextIndex.Words(query):
+            raise ValueError("Search query has no words")
+        path = f"/budgets/{budget.id if budget else 'last-used'}/transactions"
+        # Syncing brings the index up to date with the local copy.
+        rows = await ynab.Sync(path, "transactions")
+        if isinstance(rows, YNABClient.Error):
+            return rows
+        scores = ynab.text.Search(path, query)
+        ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+        table = ynab.sync.Table(path)
+        if isinstance(table, TransactionStore):
+            matches = table.Select(ranked)
+        else:
+            matches = [table[x] for x in ranked if x in table]
+        return filter.Apply(matches) if filter else matches
+
+    @staticmethod
+    def _Hybrid(
+        rows: list[dict[str, Any]] | TransactionStore.View, field: str, value: str
+    ) -> list[dict[str, Any]]:
+        """
+        Match rows the way YNAB's category and payee transaction endpoints do: a split
+        transaction contributes its matching subtransactions instead of itself.
+        """
+        rows, parts = Transaction.Split(rows)
+        if isinstance(rows, TransactionStore.View):
+            matches = list(rows.Where(rows.In(field, [value])))
+        else:
+            matches = [x for x in rows if x.get(field) == value]
+        return matches + [x for x in parts if x.get(field) == value]
+
+    @staticmethod
+    def Split(
+        rows: list[dict[str, Any]] | TransactionStore.View,
+    ) -> tuple[list[dict[str, Any]] | TransactionStore.View, list[dict[str, Any]]]:
+        """
+        Separate split transactions from the rest: the rows that aren't split, and
+        the parts of those that are, as Expand yields them.
+        """
+        if isinstance(rows, TransactionStore.View):
+            split = rows.Split()
+            return rows.Where(~split), list(Transaction.Expand(rows.Where(split)))
+        plain = []
+        split = []
+        for row in rows:
+            if any(not x.get("deleted") for x in row.get("subtransactions") or []):
+                split.append(row)
+            else:
+                plain.append(row)
+        return plain, list(Transaction.Expand(split))
+
+    @staticmethod
+    def Expand(rows: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """
+        Yield rows with each split transaction replaced by its subtransactions, which
+        inherit the parent's date, account and any field they don't set themselves.
+        """
+        for row in rows:
+            if not row.get("subtransactions"):
+                yield row
+                continue
+            subtransactions = [
+                x for x in row["subtransactions"] if not x.get("deleted")
+            ]
+            if not subtransactions:
+                yield row
+                continue
+            for subtransaction in subtransactions:
+                yield {
+                    **row,
+                    **{k: v for k, v in subtransaction.items() if v is not None},
+                    "parent_transaction_id": row.get("id"),
+                    "subtransactions": [],
+                }
 
     async def Delete(
         self,
@@ -112,26 +396,133 @@ class Transaction(BaseModel):
     async def Update(
         self, ynab: YNABClient, budget_id: str = "last-used"
     ) -> Transaction | YNABClient.Error:
-        url = f"/budgets/{budget_id}/transactions/{self.id}"
+        # Updates to the same budget made within a few milliseconds of each other
+        # are sent together as one bulk PATCH.
+        result: Transaction.Result = await ynab.updates.Submit(
+            key=(budget_id, "transactions"),
+            item=self,
+            flush=lambda batch: Transaction.UpdateMany(ynab, batch, budget_id),
+        )
+        if result.transaction:
+            return result.transaction
+        elif result.error:
+            return result.error
+        raise YNABClient.Exceptions.UnexpectedError(
+            "Unexpected response format. No transaction data found."
+        )
+
+    @staticmethod
+    async def UpdateMany(
+        ynab: YNABClient,
+        transactions: list[Transaction],
+        budget_id: str = "last-used",
+    ) -> list[Transaction.Result]:
+        """
+        Update transactions with one bulk PATCH. Each transaction is identified by id
+        (or import_id); only the fields that were set are changed. If YNAB rejects
+        the PATCH, each transaction is retried alone so one bad update fails only
+        its own result.
+        """
+        url = f"/budgets/{budget_id}/transactions"
+        # YNAB applies one change per transaction, so merge repeated ids.
+        payloads: dict[str, dict[str, Any]] = {}
+        for transaction in transactions:
+            key = transaction.id or transaction.import_id or ""
+            payloads[key] = {
+                **payloads.get(key, {}),
+                **transaction.model_dump(exclude_unset=True),
+            }
 
         response = await ynab.Send(
-            method="PUT",
-            path=url,
-            json={"transaction": self.model_dump(exclude_unset=True)},
+            method="PATCH", path=url, json={"transactions": list(payloads.values())}
         )
+        updated: dict[str, Transaction | YNABClient.Error] = {}
+        if isinstance(response, YNABClient.Error) and len(payloads) > 1:
+            # One invalid update fails the whole PATCH, so send each on its own and
+            # let the rest succeed.
+            outcomes = await gather(
+                *(Transaction._UpdateOne(ynab, url, x) for x in payloads.values())
+            )
+            updated = dict(zip(payloads, outcomes))
+        elif isinstance(response, YNABClient.Error):
+            updated = dict.fromkeys(payloads, response)
+        elif "transactions" not in response.data:
+            raise YNABClient.Exceptions.UnexpectedError(
+                "Unexpected response format. No transaction data found."
+            )
+        else:
+            for transaction in Models.Many(Transaction, response.data["transactions"]):
+                for key in (transaction.id, transaction.import_id):
+                    if key:
+                        updated[key] = transaction
+        results: list[Transaction.Result] = []
+        for i, transaction in enumerate(transactions):
+            key = transaction.id or transaction.import_id
+            match = updated.get(key or "") or YNABClient.Error(
+                id="404",
+                name="resource_not_found",
+                detail=(
+                    f"Transaction {key} was not in YNAB's response; it may not exist"
+                    if key
+                    else "Transaction has neither an id nor an import_id"
+                ),
+            )
+            if isinstance(match, YNABClient.Error):
+                results.append(Transaction.Result(index=i, status="error", error=match))
+            else:
+                results.append(
+                    Transaction.Result(index=i, status="updated", transaction=match)
+                )
+        return results
+
+    @staticmethod
+    async def _UpdateOne(
+        ynab: YNABClient, url: str, payload: dict[str, Any]
+    ) -> Transaction | YNABClient.Error:
+        # PUT needs an id; a transaction known only by import_id is patched alone.
+        if payload.get("id"):
+            response = await ynab.Send(
+                method="PUT",
+                path=f"{url}/{payload['id']}",
+                json={"transaction": payload},
+            )
+            field = "transaction"
+        else:
+            response = await ynab.Send(
+                method="PATCH", path=url, json={"transactions": [payload]}
+            )
+            field = "transactions"
         if isinstance(response, YNABClient.Error):
             return response
-        elif isinstance(response, YNABClient.Response):
-            if "transaction" in response.data:
-                return Transaction(**response.data["transaction"])
-        raise YNABClient.Exceptions.UnexpectedError(
-            "Unexpected response format. No transaction data found."
-        )
+        if not response.data.get(field):
+            raise YNABClient.Exceptions.UnexpectedError(
+                "Unexpected response format. No transaction data found."
+            )
+        data = response.data[field]
+        return Transaction(**(data if field == "transaction" else data[0]))
 
     async def Create(
-        self, ynab: YNABClient, budget_id: str = "last-used"
+        self,
+        ynab: YNABClient,
+        budget_id: str = "last-used",
+        check_duplicates: bool = False,
     ) -> Transaction | YNABClient.Error:
         url = f"/budgets/{budget_id}/transactions"
+        if check_duplicates:
+            duplicates = await Transaction.Duplicates(
+                ynab, [self], budget_id, reasons=Transaction._LIKELY
+            )
+            if isinstance(duplicates, YNABClient.Error):
+                return duplicates
+            if duplicates:
+                duplicate = duplicates[0]
+                return YNABClient.Error(
+                    id="409",
+                    name="duplicate",
+                    detail=f"Likely duplicate of transaction "
+                    f"{duplicate.transaction_id} ({duplicate.reason}). Create it "
+                    "without check_duplicates to add it anyway.",
+                )
 
         response = await ynab.Send(
             method="POST",
@@ -147,6 +538,224 @@ class Transaction(BaseModel):
             "Unexpected response format. No transaction data found."
         )
 
+    @staticmethod
+    async def CreateMany(
+        ynab: YNABClient,
+        transactions: list[Transaction],
+        budget_id: str = "last-used",
+        chunk_size: int | None = None,
+        check_duplicates: bool = False,
+    ) -> list[Transaction.Result]:
+        """
+        Create transactions with as few requests as possible. Transactions whose
+        import_id already exists in the account are reported as duplicates. With
+        check_duplicates, so are likely duplicates of synced transactions, which
+        are then not sent at all.
+        """
+        if check_duplicates:
+            return await Transaction._CreateNew(
+                ynab, transactions, budget_id, chunk_size
+            )
+        url = f"/budgets/{budget_id}/transactions"
+        size = chunk_size or Transaction._BULK_CHUNK_SIZE
+        results: list[Transaction.Result] = []
+        for start in range(0, len(transactions), size):
+            chunk = transactions[start : start + size]
+            response = await ynab.Send(
+                method="POST",
+                path=url,
+                json={
+                    "transactions": [x.model_dump(exclude_unset=True) for x in chunk]
+                },
+            )
+            if isinstance(response, YNABClient.Error):
+                results += [
+                    Transaction.Result(index=start + i, status="error", error=response)
+                    for i in range(len(chunk))
+                ]
+                continue
+            if "transactions" not in response.data:
+                raise YNABClient.Exceptions.UnexpectedError(
+                    "Unexpected response format. No transaction data found."
+                )
+            duplicates = set(response.data.get("duplicate_import_ids") or [])
+            created = Models.Many(Transaction, response.data["transactions"])
+            by_import_id = {x.import_id: x for x in created if x.import_id}
+            unmatched = iter([x for x in created if not x.import_id])
+            for i, transaction in enumerate(chunk):
+                if transaction.import_id in duplicates:
+                    results.append(
+                        Transaction.Result(index=start + i, status="duplicate")
+                    )
+                    continue
+                if transaction.import_id in by_import_id:
+                    match = by_import_id[transaction.import_id]
+                else:
+                    match = next(unmatched, None)
+                if match is None:
+                    error = YNABClient.Error(
+                        id="500",
+                        name="missing_from_response",
+                        detail="Transaction missing from YNAB's response; it may not "
+                        "have been created",
+                    )
+                    results.append(
+                        Transaction.Result(index=start + i, status="error", error=error)
+                    )
+                    continue
+                results.append(
+                    Transaction.Result(
+                        index=start + i, status="created", transaction=match
+                    )
+                )
+        return results
+
+    @staticmethod
+    async def _CreateNew(
+        ynab: YNABClient,
+        transactions: list[Transaction],
+        budget_id: str,
+        chunk_size: int | None,
+    ) -> list[Transaction.Result]:
+        duplicates = await Transaction.Duplicates(
+            ynab, transactions, budget_id, reasons=Transaction._LIKELY
+        )
+        if isinstance(duplicates, YNABClient.Error):
+            return [
+                Transaction.Result(index=i, status="error", error=duplicates)
+                for i in range(len(transactions))
+            ]
+        # Duplicates are ordered by index, strongest match first.
+        found: dict[int, Transaction.Duplicate] = {}
+        for duplicate in duplicates:
+            found.setdefault(duplicate.index, duplicate)
+        new = [i for i in range(len(transactions)) if i not in found]
+        created = await Transaction.CreateMany(
+            ynab, [transactions[i] for i in new], budget_id, chunk_size
+        )
+        results = [
+            Transaction.Result(
+                index=index, status="duplicate", duplicate_of=x.transaction_id
+            )
+            for index, x in found.items()
+        ]
+        results += [x.model_copy(update={"index": new[x.index]}) for x in created]
+        return sorted(results, key=lambda x: x.index)
+
+    @staticmethod
+    async def Duplicates(
+        ynab: YNABClient,
+        transactions: list[Transaction],
+        budget_id: str = "last-used",
+        days: int | None = None,
+        reasons: Iterable[str] | None = None,
+    ) -> list[Transaction.Duplicate] | YNABClient.Error:
+        """
+        Synced transactions that each of transactions may duplicate, by index and
+        strongest first, looked up by hash rather than by reading the history. A
+        payee_id is also matched by its name in the budget's synced payees, so an
+        imported transaction YNAB left without that payee still counts as the same
+        payee.
+        """
+        path = f"/budgets/{budget_id}/transactions"
+        # Syncing brings the index up to date with the local copy.
+        rows = await ynab.Sync(path, "transactions")
+        if isinstance(rows, YNABClient.Error):
+            return rows
+        payees_path = f"/budgets/{budget_id}/payees"
+        if any(x.payee_id for x in transactions):
+            synced = await ynab.Sync(payees_path, "payees")
+            if isinstance(synced, YNABClient.Error):
+                return synced
+        payees = ynab.sync.Table(payees_path)
+        wanted = set(reasons or DuplicateIndex.REASONS)
+        duplicates: list[Transaction.Duplicate] = []
+        for index, transaction in enumerate(transactions):
+            candidate = transaction.model_dump()
+            payee = payees.get(transaction.payee_id or "") or {}
+            candidate["payee_name"] = payee.get("name")
+            duplicates.extend(
+                Transaction.Duplicate(
+                    index=index,
+                    transaction_id=match.id,
+                    reason=match.reason,
+                    days_apart=match.days_apart,
+                )
+                for match in ynab.duplicates.Find(path, candidate, days)
+                if match.reason in wanted
+            )
+        return duplicates
+
+    @staticmethod
+    async def Paginate(
+        ctx: Context[ServerSession, AppContext],
+        ynab: YNABClient,
+        query: Transaction.Query,
+        page_size: int | None = None,
+        cursor: str | None = None,
+        fields: list[str] | None = None,
+    ) -> Transaction.Page | YNABClient.Error:
+        """
+        Serve the rows of query, or of the query a cursor carries, one page at a
+        time. Models are built only for the rows on the page, with progress reported
+        as they are. With fields, rows are projected to those fields without
+        building models.
+        """
+        if fields:
+            known = Transaction.model_fields.keys() | Transaction.model_computed_fields
+            unknown = [x for x in fields if x not in known]
+            if unknown:
+                raise ValueError(
+                    f"Unknown transaction fields: {', '.join(unknown)}. "
+                    f"Choose from: {', '.join(sorted(known))}"
+                )
+        pages = AppContext.Tenant(ctx).pages
+        position = None
+        if cursor:
+            position = pages.Read(cursor)
+            query = Transaction.Query.model_validate(position.query)
+            fields = fields or position.meta
+        rows = await query.Run(ynab)
+        if isinstance(rows, YNABClient.Error):
+            return rows
+        page = pages.Serve(
+            rows,
+            Transaction._Ids(rows),
+            query.model_dump(mode="json", exclude_unset=True),
+            fields,
+            position,
+            page_size,
+        )
+
+        transactions: list[Transaction] | list[dict[str, Any]] = []
+        for start in range(0, len(page.rows), Transaction._PROGRESS_INTERVAL):
+            chunk = page.rows[start : start + Transaction._PROGRESS_INTERVAL]
+            if fields:
+                transactions += [Transaction._Project(x, fields) for x in chunk]
+            else:
+                transactions += Models.Many(Transaction, chunk)
+            await ctx.report_progress(len(transactions), len(page.rows))
+        return Transaction.Page(
+            transactions=transactions, total=page.total, next_cursor=page.next_cursor
+        )
+
+    @staticmethod
+    def _Ids(
+        rows: list[dict[str, Any]] | TransactionStore.View,
+    ) -> Iterator[str | None]:
+        # Read only if a cursor is needed.
+        if isinstance(rows, TransactionStore.View):
+            yield from rows.Column("id")
+        else:
+            yield from (x.get("id") for x in rows)
+
+    @staticmethod
+    def _Project(row: dict[str, Any], fields: list[str]) -> dict[str, Any]:
+        projected = {x: row.get(x) for x in fields}
+        if "amount_in_currency" in projected and row.get("amount") is not None:
+            projected["amount_in_currency"] = row["amount"] / 1000.0
+        return projected
+
     @staticmethod
     def RegisterTools(mcp: FastMCP):
         """Register transaction-related MCP tools."""
@@ -156,10 +765,54 @@ class Transaction(BaseModel):
             ctx: Context[ServerSession, AppContext],
             transaction: Transaction,
             budget_id: str = "last-used",
+            check_duplicates: bool = False,
         ) -> Transaction | YNABClient.Error:
-            """Create a new transaction in YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
-            return await transaction.Create(ynab=client, budget_id=budget_id)
+            """
+            Create a new transaction in YNAB API. With check_duplicates, a likely
+            duplicate of an existing transaction is reported instead of created.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            return await transaction.Create(
+                ynab=client, budget_id=budget_id, check_duplicates=check_duplicates
+            )
+
+        @mcp.tool()
+        async def new_transactions(
+            ctx: Context[ServerSession, AppContext],
+            transactions: list[Transaction],
+            budget_id: str = "last-used",
+            check_duplicates: bool = False,
+        ) -> list[Transaction.Result]:
+            """
+            Create many transactions in YNAB API with a few bulk requests. Returns one
+            result per input transaction; set import_id to have re-imports reported as
+            duplicates instead of being created twice. With check_duplicates, likely
+            duplicates of existing transactions are reported and not created.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            return await Transaction.CreateMany(
+                ynab=client,
+                transactions=transactions,
+                budget_id=budget_id,
+                check_duplicates=check_duplicates,
+            )
+
+        @mcp.tool()
+        async def check_duplicates(
+            ctx: Context[ServerSession, AppContext],
+            transactions: list[Transaction],
+            budget_id: str = "last-used",
+            days: int = DuplicateIndex.WINDOW_DAYS,
+        ) -> list[Transaction.Duplicate] | YNABClient.Error:
+            """
+            Find existing transactions that the given ones may duplicate, before
+            creating them: the same import_id, or the same account and amount within
+            days of the date, noting when the payee matches by id or name. Set
+            account_id, date and amount (and payee_id or import_payee_name if known)
+            on each. Returns only the transactions that have a match.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            return await Transaction.Duplicates(client, transactions, budget_id, days)
 
         @mcp.tool()
         async def update_transaction(
@@ -168,9 +821,24 @@ class Transaction(BaseModel):
             budget_id: str = "last-used",
         ) -> Transaction | YNABClient.Error:
             """Update a transaction in YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
+            client = AppContext.Tenant(ctx).ynab
             return await updated_transaction.Update(ynab=client, budget_id=budget_id)
 
+        @mcp.tool()
+        async def update_transactions(
+            ctx: Context[ServerSession, AppContext],
+            updated_transactions: list[Transaction],
+            budget_id: str = "last-used",
+        ) -> list[Transaction.Result]:
+            """
+            Update many transactions in YNAB API with one request. Only the fields set
+            on each transaction are changed; returns one result per input transaction.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            return await Transaction.UpdateMany(
+                ynab=client, transactions=updated_transactions, budget_id=budget_id
+            )
+
         @mcp.tool()
         async def delete_transaction(
             ctx: Context[ServerSession, AppContext],
@@ -178,7 +846,7 @@ class Transaction(BaseModel):
             budget_id: str = "last-used",
         ) -> Transaction | YNABClient.Error:
             """Delete a transaction in YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
+            client = AppContext.Tenant(ctx).ynab
             return await transaction.Delete(ynab=client, budget_id=budget_id)
 
         @mcp.tool()
@@ -187,11 +855,22 @@ class Transaction(BaseModel):
             category: Category | None = None,
             budget: Budget | None = None,
             since: str | None = None,
-        ) -> list[Transaction] | Transaction | YNABClient.Error:
-            """Fetch transactions from YNAB API for a specific category."""
-            client = ctx.request_context.lifespan_context.ynab
-            return await Transaction.Get(
-                ynab=client, budget=budget, category=category, since=since
+            filter: Transaction.Filter | None = None,
+            fields: list[str] | None = None,
+            page_size: int | None = None,
+            cursor: str | None = None,
+        ) -> Transaction.Page | YNABClient.Error:
+            """
+            Fetch transactions from YNAB API for a specific category, one page at a
+            time. To get the next page, pass next_cursor back as cursor. Use filter to
+            return only matching transactions and fields to return only some fields.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            query = Transaction.Query(
+                budget=budget, category=category, since=since, filter=filter
+            )
+            return await Transaction.Paginate(
+                ctx, client, query, page_size, cursor, fields
             )
 
         @mcp.tool()
@@ -200,11 +879,22 @@ class Transaction(BaseModel):
             account: Account | None = None,
             budget: Budget | None = None,
             since: str | None = None,
-        ) -> list[Transaction] | Transaction | YNABClient.Error:
-            """Fetch transactions for a specific account from YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
-            return await Transaction.Get(
-                ynab=client, budget=budget, account=account, since=since
+            filter: Transaction.Filter | None = None,
+            fields: list[str] | None = None,
+            page_size: int | None = None,
+            cursor: str | None = None,
+        ) -> Transaction.Page | YNABClient.Error:
+            """
+            Fetch transactions for a specific account from YNAB API, one page at a
+            time. To get the next page, pass next_cursor back as cursor. Use filter to
+            return only matching transactions and fields to return only some fields.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            query = Transaction.Query(
+                budget=budget, account=account, since=since, filter=filter
+            )
+            return await Transaction.Paginate(
+                ctx, client, query, page_size, cursor, fields
             )
 
         @mcp.tool()
@@ -212,10 +902,21 @@ class Transaction(BaseModel):
             ctx: Context[ServerSession, AppContext],
             month: Month | None = None,
             budget: Budget | None = None,
-        ) -> list[Transaction] | Transaction | YNABClient.Error:
-            """Fetch transactions for a specific month from YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
-            return await Transaction.Get(ynab=client, budget=budget, month=month)
+            filter: Transaction.Filter | None = None,
+            fields: list[str] | None = None,
+            page_size: int | None = None,
+            cursor: str | None = None,
+        ) -> Transaction.Page | YNABClient.Error:
+            """
+            Fetch transactions for a specific month from YNAB API, one page at a time.
+            To get the next page, pass next_cursor back as cursor. Use filter to
+            return only matching transactions and fields to return only some fields.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            query = Transaction.Query(budget=budget, month=month, filter=filter)
+            return await Transaction.Paginate(
+                ctx, client, query, page_size, cursor, fields
+            )
 
         @mcp.tool()
         async def get_transactions_for_payee(
@@ -223,11 +924,44 @@ class Transaction(BaseModel):
             payee: Payee | None = None,
             budget: Budget | None = None,
             since: str | None = None,
-        ) -> list[Transaction] | Transaction | YNABClient.Error:
-            """Fetch transactions for a specific payee from YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
-            return await Transaction.Get(
-                ynab=client, budget=budget, payee=payee, since=since
+            filter: Transaction.Filter | None = None,
+            fields: list[str] | None = None,
+            page_size: int | None = None,
+            cursor: str | None = None,
+        ) -> Transaction.Page | YNABClient.Error:
+            """
+            Fetch transactions for a specific payee from YNAB API, one page at a time.
+            To get the next page, pass next_cursor back as cursor. Use filter to
+            return only matching transactions and fields to return only some fields.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            query = Transaction.Query(
+                budget=budget, payee=payee, since=since, filter=filter
+            )
+            return await Transaction.Paginate(
+                ctx, client, query, page_size, cursor, fields
+            )
+
+        @mcp.tool()
+        async def search_transactions(
+            ctx: Context[ServerSession, AppContext],
+            query: str,
+            budget: Budget | None = None,
+            filter: Transaction.Filter | None = None,
+            fields: list[str] | None = None,
+            page_size: int | None = None,
+            cursor: str | None = None,
+        ) -> Transaction.Page | YNABClient.Error:
+            """
+            Search transactions by words in their payee name, memo and imported
+            payee names, best match first. Words match in part ("amaz") and despite
+            typos. Combine with filter for dates and amounts, e.g. a refund is a
+            positive amount. One page at a time; pass next_cursor back as cursor.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            search = Transaction.Query(search=query, budget=budget, filter=filter)
+            return await Transaction.Paginate(
+                ctx, client, search, page_size, cursor, fields
             )
 
         @mcp.tool()
@@ -235,7 +969,18 @@ class Transaction(BaseModel):
             ctx: Context[ServerSession, AppContext],
             budget: Budget | None = None,
             since: str | None = None,
-        ) -> list[Transaction] | Transaction | YNABClient.Error:
-            """Fetch all transactions from YNAB API."""
-            client = ctx.request_context.lifespan_context.ynab
-            return await Transaction.Get(ynab=client, budget=budget, since=since)
+            filter: Transaction.Filter | None = None,
+            fields: list[str] | None = None,
+            page_size: int | None = None,
+            cursor: str | None = None,
+        ) -> Transaction.Page | YNABClient.Error:
+            """
+            Fetch all transactions from YNAB API, one page at a time. To get the next
+            page, pass next_cursor back as cursor. Use filter to return only matching
+            transactions and fields to return only some fields.
+            """
+            client = AppContext.Tenant(ctx).ynab
+            query = Transaction.Query(budget=budget, since=since, filter=filter)
+            return await Transaction.Paginate(
+                ctx, client, query, page_size, cursor, fields
+            )
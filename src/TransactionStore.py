@@ -0,0 +1,370 @@
+from __future__ import annotations
+from datetime import date
+from typing import Any, Iterable, Iterator, Mapping
+import sys
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    numpy = None
+
+
+class TransactionStore:
+    """
+    Columnar copy of a budget's transactions.
+
+    References to accounts, payees and categories and other repeated strings are
+    stored as integer codes into per-column tables, amounts as int64, dates as day
+    ordinals and memos as interned strings, instead of one dict per transaction.
+    Dicts are rebuilt only for the rows a caller reads.
+
+    The store only ever appends: an update adds a new row and retires the old one,
+    so a View keeps seeing exactly the rows it was taken over. Compacted drops the
+    retired rows into a new store once they outnumber the live ones.
+    """
+
+    class View:
+        """
+        An ordered selection of rows. Indexing with an int returns a dict, slicing
+        returns another View and iterating yields dicts. The masks returned by In,
+        Range, Contains and Split are combined and applied with Where.
+        """
+
+        def __init__(self, store: TransactionStore, indices: Any) -> None:
+            self._store = store
+            self._indices = indices
+
+        def __len__(self) -> int:
+            return len(self._indices)
+
+        def __getitem__(self, key: int | slice) -> Any:
+            if isinstance(key, slice):
+                return TransactionStore.View(self._store, self._indices[key])
+            return self._store._Rows(self._indices[key : key + 1 or None])[0]
+
+        def __iter__(self) -> Iterator[dict[str, Any]]:
+            for start in range(0, len(self._indices), 1024):
+                yield from self._store._Rows(self._indices[start : start + 1024])
+
+        def Where(self, *masks: Any) -> TransactionStore.View:
+            if not masks:
+                return self
+            mask = masks[0]
+            for other in masks[1:]:
+                mask = mask & other
+            return TransactionStore.View(self._store, self._indices[mask])
+
+        def SortedBy(self, column: str) -> TransactionStore.View:
+            """Rows in order of a numeric column (amount or date), ties kept in place."""
+            values = self._store._Numeric(column)[self._indices]
+            order = numpy.argsort(values, kind="stable")
+            return TransactionStore.View(self._store, self._indices[order])
+
+        def In(self, column: str, values: Iterable[Any]) -> Any:
+            """Rows whose column is one of values."""
+            store = self._store
+            if column in store._flags:
+                wanted = list({bool(x) for x in values})
+                return numpy.isin(store._flags[column][self._indices] > 0, wanted)
+            codes = [
+                store._label_codes[column][x]
+                for x in values
+                if x in store._label_codes[column]
+            ]
+            return numpy.isin(store._codes[column][self._indices], codes)
+
+        def Range(self, column: str, low: Any = None, high: Any = None) -> Any:
+            """
+            Rows whose column lies between low and high, inclusive. Date bounds are
+            ISO strings and compare as strings would, so "2024-03" as high excludes
+            March.
+            """
+            values = self._store._Numeric(column)[self._indices]
+            mask = numpy.ones(len(values), dtype=bool)
+            if column == "date":
+                low = None if low is None else TransactionStore._Bound(low, False)
+                high = None if high is None else TransactionStore._Bound(high, True)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+            return mask
+
+        def Contains(self, column: str, text: str) -> Any:
+            """Rows whose text column contains text, ignoring case."""
+            text = text.casefold()
+            strings = self._store._text[column]
+            return numpy.fromiter(
+                (
+                    text in strings[i].casefold() if strings[i] else False
+                    for i in self._indices.tolist()
+                ),
+                dtype=bool,
+                count=len(self._indices),
+            )
+
+        def Split(self) -> Any:
+            """Split transactions: rows with subtransactions that aren't deleted."""
+            return self._store._split[self._indices]
+
+        def Column(self, column: str) -> list[Any]:
+            """
+            One column's values as a list. "month" gives the YYYY-MM of each row's
+            date ("" without one).
+            """
+            store = self._store
+            if column in ("date", "month"):
+                ordinals = store._date[self._indices]
+                strings = numpy.datetime_as_string(
+                    (ordinals - TransactionStore._EPOCH).astype("datetime64[D]"),
+                    unit="D" if column == "date" else "M",
+                ).tolist()
+                if (ordinals < 0).any():
+                    empty = None if column == "date" else ""
+                    for i in numpy.flatnonzero(ordinals < 0).tolist():
+                        strings[i] = empty
+                return strings
+            if column == "amount":
+                return store._amount[self._indices].tolist()
+            if column in store._codes:
+                labels = store._labels[column]
+                return [labels[x] for x in store._codes[column][self._indices].tolist()]
+            if column in store._flags:
+                values = TransactionStore._FLAG_VALUES
+                return [values[x] for x in store._flags[column][self._indices].tolist()]
+            if column == "id":
+                return [store._ids[i] for i in self._indices.tolist()]
+            strings = store._text[column]
+            return [strings[i] for i in self._indices.tolist()]
+
+    # Columns with few distinct values, stored as codes; code 0 is None.
+    _CODED = (
+        "account_id",
+        "account_name",
+        "payee_id",
+        "payee_name",
+        "category_id",
+        "category_name",
+        "transfer_account_id",
+        "cleared",
+        "flag_color",
+        "flag_name",
+        "debt_transaction_type",
+    )
+    # Columns of mostly distinct strings, kept as Python lists.
+    _TEXT = (
+        "memo",
+        "import_id",
+        "import_payee_name",
+        "import_payee_name_original",
+        "transfer_transaction_id",
+        "matched_transaction_id",
+    )
+    _INTERNED = {"memo", "import_payee_name", "import_payee_name_original"}
+    # Booleans stored as 1 (true), 0 (false) or -1 (null).
+    _FLAGS = ("approved", "deleted")
+    _FLAG_VALUES = (False, True, None)
+    # date.toordinal() of 1970-01-01, numpy's datetime64 epoch.
+    _EPOCH = 719163
+    # Rough bytes a row holds outside the arrays (its id, index entry and text
+    # slots), and a split transaction's subtransactions.
+    _ROW_BYTES = 300
+    _SPLIT_BYTES = 1000
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._size = 0
+        self._retired = 0
+        self._index: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._amount = numpy.zeros(capacity, dtype=numpy.int64)
+        self._date = numpy.zeros(capacity, dtype=numpy.int32)
+        self._live = numpy.zeros(capacity, dtype=bool)
+        self._split = numpy.zeros(capacity, dtype=bool)
+        self._flags = {x: numpy.zeros(capacity, dtype=numpy.int8) for x in self._FLAGS}
+        self._codes = {x: numpy.zeros(capacity, dtype=numpy.int32) for x in self._CODED}
+        self._labels: dict[str, list[Any]] = {x: [None] for x in self._CODED}
+        self._label_codes: dict[str, dict[Any, int]] = {
+            x: {None: 0} for x in self._CODED
+        }
+        self._text: dict[str, list[str | None]] = {x: [] for x in self._TEXT}
+        self._subtransactions: dict[int, list[dict[str, Any]]] = {}
+        self._ordinals: dict[str, int] = {}
+        self._dates: dict[int, str] = {}
+
+    @staticmethod
+    def Supported() -> bool:
+        return numpy is not None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._index
+
+    def __setitem__(self, id: str, row: dict[str, Any]) -> None:
+        self.update({id: row})
+
+    def get(self, id: str, default: Any = None) -> dict[str, Any] | None:
+        if id not in self._index:
+            return default
+        return self._Rows(numpy.asarray([self._index[id]]))[0]
+
+    def pop(self, id: str, default: Any = None) -> dict[str, Any] | None:
+        row = self.get(id, default)
+        if id in self._index:
+            self._live[self._index.pop(id)] = False
+            self._retired += 1
+        return row
+
+    def clear(self) -> None:
+        self._live[: self._size] = False
+        self._retired += len(self._index)
+        self._index.clear()
+
+    def values(self) -> TransactionStore.View:
+        """Every live row, in the order they were added."""
+        return TransactionStore.View(self, numpy.flatnonzero(self._live[: self._size]))
+
+    def update(self, rows: Mapping[str, dict[str, Any]]) -> None:
+        """Add or replace rows by id, a column at a time."""
+        ids = list(rows)
+        values = list(rows.values())
+        start = self._size
+        end = start + len(values)
+        self._Reserve(end)
+        for id in ids:
+            if id in self._index:
+                self._live[self._index[id]] = False
+                self._retired += 1
+
+        self._amount[start:end] = [x.get("amount") or 0 for x in values]
+        self._date[start:end] = [self._Ordinal(x.get("date")) for x in values]
+        for column, array in self._flags.items():
+            array[start:end] = [
+                -1 if x.get(column) is None else int(bool(x[column])) for x in values
+            ]
+        for column, array in self._codes.items():
+            array[start:end] = self._Code(column, [x.get(column) for x in values])
+        for column, strings in self._text.items():
+            if column in self._INTERNED:
+                strings += [
+                    sys.intern(x[column]) if x.get(column) else x.get(column)
+                    for x in values
+                ]
+            else:
+                strings += [x.get(column) for x in values]
+        for i, row in enumerate(values, start):
+            if row.get("subtransactions"):
+                self._subtransactions[i] = row["subtransactions"]
+                self._split[i] = any(
+                    not x.get("deleted") for x in row["subtransactions"]
+                )
+        self._live[start:end] = True
+        self._ids += ids
+        self._index.update(zip(ids, range(start, end)))
+        self._size = end
+
+    def Select(self, ids: Iterable[str]) -> TransactionStore.View:
+        """The rows with ids, in the order given; ids not stored are skipped."""
+        index = self._index
+        return TransactionStore.View(
+            self,
+            numpy.fromiter((index[x] for x in ids if x in index), dtype=numpy.int64),
+        )
+
+    def Bytes(self) -> int:
+        """Estimated memory the store holds, retired rows included."""
+        arrays = (
+            self._amount,
+            self._date,
+            self._live,
+            self._split,
+            *self._flags.values(),
+            *self._codes.values(),
+        )
+        return (
+            sum(x.nbytes for x in arrays)
+            + self._size * self._ROW_BYTES
+            + len(self._subtransactions) * self._SPLIT_BYTES
+        )
+
+    def Compacted(self) -> TransactionStore:
+        """This store, or a copy without retired rows once they are the majority."""
+        if self._retired <= max(len(self._index), 1024):
+            return self
+        store = TransactionStore(capacity=max(len(self._index), 1024))
+        live = self.values()
+        store.update(dict(zip((self._ids[i] for i in live._indices.tolist()), live)))
+        return store
+
+    def _Reserve(self, size: int) -> None:
+        capacity = len(self._amount)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_amount", "_date", "_live", "_split"):
+            setattr(self, name, self._Grown(getattr(self, name), capacity))
+        for columns in (self._flags, self._codes):
+            for column, array in columns.items():
+                columns[column] = self._Grown(array, capacity)
+
+    @staticmethod
+    def _Grown(array: Any, capacity: int) -> Any:
+        grown = numpy.zeros(capacity, dtype=array.dtype)
+        grown[: len(array)] = array
+        return grown
+
+    def _Code(self, column: str, values: list[Any]) -> list[int]:
+        codes = self._label_codes[column]
+        labels = self._labels[column]
+        for value in dict.fromkeys(values):
+            if value not in codes:
+                codes[value] = len(labels)
+                labels.append(value)
+        return list(map(codes.__getitem__, values))
+
+    def _Ordinal(self, value: str | None) -> int:
+        if not value:
+            return -1
+        ordinal = self._ordinals.get(value)
+        if ordinal is None:
+            ordinal = self._ordinals[value] = date.fromisoformat(value).toordinal()
+            self._dates[ordinal] = value
+        return ordinal
+
+    @staticmethod
+    def _Bound(text: str, upper: bool) -> int:
+        # A partial date sorts before every full date it is a prefix of.
+        if len(text) >= 10:
+            return date.fromisoformat(text[:10]).toordinal()
+        ordinal = date.fromisoformat((text + "-01-01")[:10]).toordinal()
+        return ordinal - 1 if upper else ordinal
+
+    def _Numeric(self, column: str) -> Any:
+        if column == "amount":
+            return self._amount
+        if column == "date":
+            return self._date
+        raise ValueError(f"Cannot compare or sort by {column}")
+
+    def _Rows(self, indices: Any) -> list[dict[str, Any]]:
+        """Rebuild rows as the dicts YNAB returned, one column at a time."""
+        positions = indices.tolist()
+        columns: dict[str, list[Any]] = {
+            "id": [self._ids[i] for i in positions],
+            "date": [self._dates.get(x) for x in self._date[indices].tolist()],
+            "amount": self._amount[indices].tolist(),
+        }
+        for column, array in self._flags.items():
+            columns[column] = [self._FLAG_VALUES[x] for x in array[indices].tolist()]
+        for column, array in self._codes.items():
+            labels = self._labels[column]
+            columns[column] = [labels[x] for x in array[indices].tolist()]
+        for column, strings in self._text.items():
+            columns[column] = [strings[i] for i in positions]
+        columns["subtransactions"] = [
+            self._subtransactions.get(i, []) for i in positions
+        ]
+        names = list(columns)
+        return [dict(zip(names, values)) for values in zip(*columns.values())]
@@ -0,0 +1,133 @@
+from __future__ import annotations
+from asyncio import CancelledError, Task, get_running_loop, sleep, to_thread
+from ClientPool import ClientPool
+from importlib import import_module
+from RateLimiter import RateLimiter
+from typing import IO
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Background prefetch of the server token's budget reference data.
+
+    At startup the budget list is fetched and the budget's accounts, categories,
+    payees, months and transactions are loaded with one /budgets/{id} request.
+    Tool calls within the response cache's TTL of a load (30 to 300 seconds by
+    collection) are answered from the cache; later ones sync the local copy with
+    a small delta request instead of downloading it. Every interval seconds the
+    budget is loaded again, which keeps those deltas small. Requests are made at
+    background priority, behind any tool call, and a refresh is skipped while
+    fewer than reserve requests of the hourly quota are left.
+
+    The quota is per token, so only one process warms a token's budget: with
+    several workers, the one holding a lock file in the temporary directory, and
+    another once that one exits.
+    """
+
+    def __init__(
+        self,
+        clients: ClientPool,
+        budget_id: str = "last-used",
+        interval: float | None = None,
+        reserve: int | None = None,
+    ) -> None:
+        self._clients = clients
+        self._budget_id = budget_id
+        self._interval = interval or float(
+            os.environ.get("YNAB_WARMUP_INTERVAL", "600")
+        )
+        self._reserve = (
+            reserve
+            if reserve is not None
+            else int(os.environ.get("YNAB_WARMUP_RESERVE", "50"))
+        )
+        self._task: Task[None] | None = None
+        self._lock: IO[bytes] | None = None
+
+    @staticmethod
+    def FromEnvironment(clients: ClientPool) -> Warmup | None:
+        """
+        A Warmup when YNAB_WARMUP is set: to 1, true or yes for the last-used
+        budget, or to a budget id.
+        """
+        value = os.environ.get("YNAB_WARMUP", "").strip()
+        # Only the server's own token is known before a request arrives.
+        if value.lower() in ("", "0", "false", "no") or not os.environ.get(
+            "YNAB_API_TOKEN"
+        ):
+            return None
+        if value.lower() in ("1", "true", "yes"):
+            value = "last-used"
+        return Warmup(clients, value)
+
+    def Start(self) -> None:
+        if self._task is None:
+            self._task = get_running_loop().create_task(self._Run())
+
+    async def Stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except CancelledError:
+                pass
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+    async def _Run(self) -> None:
+        # The client's imports (numpy among them) would otherwise block the event
+        # loop while the server answers initialize.
+        await to_thread(import_module, "YNABClient")
+        while not self._Lead():
+            await sleep(self._interval)
+        while True:
+            try:
+                await self.Refresh()
+            except CancelledError:
+                raise
+            except Exception:
+                logger.exception("Warm-up refresh failed")
+            await sleep(self._interval)
+
+    def _Lead(self) -> bool:
+        """Take the lock that makes this process the one warming the budget."""
+        if fcntl is None:
+            return True
+        token = os.environ.get("YNAB_API_TOKEN", "")
+        digest = hashlib.sha256(f"{token}:{self._budget_id}".encode()).hexdigest()
+        path = os.path.join(tempfile.gettempdir(), f"ynab-warmup-{digest[:16]}.lock")
+        lock = open(path, "ab")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return False
+        self._lock = lock
+        return True
+
+    async def Refresh(self) -> bool:
+        """Sync the reference data now. False if skipped to save quota."""
+        with ClientPool.Scope():
+            ynab = self._clients.Get().ynab
+            if ynab.rate_limit.Report().remaining < self._reserve:
+                return False
+            start = time.perf_counter()
+            priority = RateLimiter.Priority.BACKGROUND
+            await ynab.Send("GET", "/budgets", priority=priority)
+            await ynab.Snapshot(self._budget_id, priority)
+            ynab.metrics.Stage("warmup", time.perf_counter() - start)
+            return True
@@ -1,13 +1,39 @@
 from __future__ import annotations
-from httpx import AsyncClient, Request, Response
-from pydantic import BaseModel
+from asyncio import Task, get_running_loop, shield, sleep
+from Coalescer import Coalescer
+from contextlib import AsyncExitStack
+from DeltaSync import DeltaSync
+from DuplicateIndex import DuplicateIndex
+from JSONStream import JSONStream
+from Metrics import Metrics
+from NameIndex import NameIndex
+from httpx import AsyncBaseTransport, AsyncClient, Limits, Request, Response, Timeout
+from pydantic import BaseModel, Field
+from RateLimiter import RateLimiter
+from ResponseCache import ResponseCache
+from Store import Store
+from TextIndex import TextIndex
+from TransactionStore import TransactionStore
 from typing import Any
 import os
+import time
 
 
 class YNABClient:
     _YNAB_API_BASE = "https://api.ynab.com/v1"
+    # Entities decoded from a streamed sync before they are merged.
+    _SYNC_BATCH = 1000
     _api_token: str
+    _base_url: str
+    _client: AsyncClient | None
+    sync: DeltaSync
+    updates: Coalescer
+    rate_limit: RateLimiter
+    cache: ResponseCache
+    metrics: Metrics
+    names: NameIndex
+    text: TextIndex
+    duplicates: DuplicateIndex
 
     class Exceptions:
         class UnexpectedError(Exception):
@@ -15,10 +41,13 @@ class YNABClient:
 
     class Response(BaseModel):
         data: dict[str, Any]
+        size: int = Field(default=0, exclude=True)
 
         @classmethod
-        def from_JSON(cls, response_json: dict[str, Any]) -> YNABClient.Response:
-            return cls(data=response_json.get("data", {}))
+        def from_JSON(
+            cls, response_json: dict[str, Any], size: int = 0
+        ) -> YNABClient.Response:
+            return cls(data=response_json.get("data", {}), size=size)
 
     class Error(BaseModel):
         id: str
@@ -34,7 +63,68 @@ class YNABClient:
                 detail=error.get("detail", ""),
             )
 
-    def __init__(self, api_token: str | None = None) -> None:
+    def __init__(
+        self,
+        api_token: str | None = None,
+        base_url: str | None = None,
+        limits: Limits | None = None,
+        timeout: Timeout | None = None,
+        http2: bool | None = None,
+        transport: AsyncBaseTransport | None = None,
+        store: Store | None = None,
+        metrics: Metrics | None = None,
+        tenant: str = "",
+    ) -> None:
+        """
+        Pool settings default to the YNAB_HTTP_* environment variables:
+        YNAB_HTTP_MAX_CONNECTIONS, YNAB_HTTP_MAX_KEEPALIVE, YNAB_HTTP_KEEPALIVE_EXPIRY,
+        YNAB_HTTP_TIMEOUT, YNAB_HTTP_CONNECT_TIMEOUT and YNAB_HTTP2. Synced collections
+        are persisted to YNAB_STORE_PATH when it is set, and transaction updates
+        arriving within YNAB_COALESCE_WINDOW_MS of each other share one request.
+        Requests are paced by YNAB_RATE_LIMIT per YNAB_RATE_LIMIT_PERIOD seconds and
+        429 responses are retried up to YNAB_MAX_RETRIES times. Reads are cached in
+        up to YNAB_CACHE_MAX_BYTES of memory. Requests are recorded in metrics, which
+        the server shares with its tools, under tenant.
+        """
+        self._client = None
+        self._base_url = (
+            base_url or os.environ.get("YNAB_API_BASE") or self._YNAB_API_BASE
+        ).rstrip("/")
+        self._limits = limits or Limits(
+            max_connections=int(os.environ.get("YNAB_HTTP_MAX_CONNECTIONS", "10")),
+            max_keepalive_connections=int(
+                os.environ.get("YNAB_HTTP_MAX_KEEPALIVE", "10")
+            ),
+            keepalive_expiry=float(os.environ.get("YNAB_HTTP_KEEPALIVE_EXPIRY", "60")),
+        )
+        self._timeout = timeout or Timeout(
+            float(os.environ.get("YNAB_HTTP_TIMEOUT", "30")),
+            connect=float(os.environ.get("YNAB_HTTP_CONNECT_TIMEOUT", "10")),
+        )
+        self._http2 = (
+            http2
+            if http2 is not None
+            else os.environ.get("YNAB_HTTP2", "").lower() in ("1", "true", "yes")
+        )
+        self._transport = transport
+        # In-flight GETs, with the cache generation each started at.
+        self._inflight: dict[
+            tuple[str, str, str], tuple[Task[YNABClient.Response | Error], int]
+        ] = {}
+        self._store = store or Store.FromEnvironment()
+        self.sync = DeltaSync(self._store)
+        self.names = NameIndex()
+        self.sync.Listen(self.names.Update)
+        self.text = TextIndex()
+        self.sync.Listen(self.text.Update)
+        self.duplicates = DuplicateIndex()
+        self.sync.Listen(self.duplicates.Update)
+        self.updates = Coalescer()
+        self.rate_limit = RateLimiter()
+        self.cache = ResponseCache()
+        self.metrics = metrics or Metrics()
+        self.tenant = tenant
+
         if api_token:
             self._api_token = api_token
             return
@@ -43,6 +133,35 @@ class YNABClient:
             raise ValueError("Missing YNAB_API_TOKEN environment variable")
         self._api_token = environment_token
 
+    async def __aenter__(self) -> YNABClient:
+        self.Open()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.Close()
+
+    def Open(self) -> AsyncClient:
+        """Create the pooled HTTP client, reused by every request until Close."""
+        if self._client is None or self._client.is_closed:
+            self._client = AsyncClient(
+                base_url=self._base_url,
+                headers=self._get_headers(),
+                limits=self._limits,
+                timeout=self._timeout,
+                http2=self._http2,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def Close(self) -> None:
+        """Close the pooled HTTP client, its keep-alive connections and the store."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._store is not None:
+            self._store.Close()
+            self._store = None
+
     def _get_headers(self) -> dict[str, str]:
         return {
             "Authorization": f"Bearer {self._api_token}",
@@ -50,21 +169,235 @@ class YNABClient:
         }
 
     async def Send(
-        self, method: str, path: str, json: dict[str, Any] | None = None
+        self,
+        method: str,
+        path: str,
+        json: dict[str, Any] | None = None,
+        priority: int | None = None,
+        cache: bool = True,
     ) -> YNABClient.Response | Error:
-        """Send request to YNAB API."""
-        url: str = f'{self._YNAB_API_BASE}/{path.strip("/")}'
-        async with AsyncClient() as client:
-            request: Request = client.build_request(
-                method, url, headers=self._get_headers(), json=json
+        """
+        Send request to YNAB API. Requests wait for rate-limit quota, writes ahead of
+        reads unless a priority is given, and 429s are retried with backoff. Identical
+        GETs already in flight share that request and its parsed Response. Successful
+        GETs are cached, and writes invalidate the cached reads they affect. A GET
+        that was in flight when a write was made is neither shared nor cached.
+        """
+        key_path = "/" + path.strip("/")
+        url: str = f"{self._base_url}{key_path}"
+        if method != "GET":
+            try:
+                return await self._Send(method, url, json, priority)
+            finally:
+                self.cache.Invalidate(key_path)
+
+        if cache:
+            cached = self.cache.Get(key_path)
+            if cached is not None:
+                return cached
+
+        key = (method, url, self._api_token)
+        generation = self.cache.Generation(key_path)
+        task, started = self._inflight.get(key, (None, generation))
+        if task is None or started != generation:
+            task = get_running_loop().create_task(
+                self._Send(method, url, json, priority)
             )
-            response: Response = await client.send(request)
-            response_json: dict[str, Any] = response.json()
-            if response.is_success:
-                return YNABClient.Response.from_JSON(response_json)
-            elif "error" in response_json:
-                return YNABClient.Error.from_JSON(response_json)
-            response.raise_for_status()
-            raise YNABClient.Exceptions.UnexpectedError(
-                f"Unexpected error: {response_json}"
+            self._inflight[key] = (task, generation)
+
+            def forget(done: Task[YNABClient.Response | YNABClient.Error]) -> None:
+                if self._inflight.get(key, (None, 0))[0] is done:
+                    del self._inflight[key]
+                if cache and not done.cancelled() and done.exception() is None:
+                    result = done.result()
+                    if isinstance(result, YNABClient.Response):
+                        self.cache.Put(key_path, result, result.size, generation)
+
+            task.add_done_callback(forget)
+        # Shielded so a cancelled caller doesn't cancel the request for the others.
+        return await shield(task)
+
+    async def _Send(
+        self,
+        method: str,
+        url: str,
+        json: dict[str, Any] | None,
+        priority: int | None,
+    ) -> YNABClient.Response | Error:
+        return self._Result(await self._Request(method, url, json, priority))
+
+    async def _Request(
+        self,
+        method: str,
+        url: str,
+        json: dict[str, Any] | None,
+        priority: int | None,
+        stream: bool = False,
+    ) -> Response:
+        """Send one request within the rate limit, retrying 429s with backoff."""
+        client = self.Open()
+        if priority is None:
+            priority = (
+                RateLimiter.Priority.READ
+                if method == "GET"
+                else RateLimiter.Priority.WRITE
+            )
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            await self.rate_limit.Acquire(priority)
+            sent = time.perf_counter()
+            self.metrics.Stage("rate_limit_wait", sent - start)
+            request: Request = client.build_request(method, url, json=json)
+            response: Response = await client.send(request, stream=stream)
+            rate_limit = response.headers.get("X-Rate-Limit")
+            self.metrics.Request(
+                method,
+                url,
+                response.status_code,
+                time.perf_counter() - sent,
+                rate_limit,
+                self.tenant,
+            )
+            if not stream:
+                self.metrics.Received(method, url, len(response.content))
+            self.rate_limit.Update(rate_limit)
+            if response.status_code != 429 or attempt >= self.rate_limit.max_retries:
+                return response
+            await response.aclose()
+            await sleep(
+                self.rate_limit.Backoff(attempt, response.headers.get("Retry-After"))
+            )
+            attempt += 1
+
+    def _Result(self, response: Response) -> YNABClient.Response | Error:
+        start = time.perf_counter()
+        response_json: dict[str, Any] = response.json()
+        self.metrics.Stage("decode", time.perf_counter() - start)
+        if response.is_success:
+            return YNABClient.Response.from_JSON(response_json, len(response.content))
+        elif "error" in response_json:
+            return YNABClient.Error.from_JSON(response_json)
+        response.raise_for_status()
+        raise YNABClient.Exceptions.UnexpectedError(
+            f"Unexpected error: {response_json}"
+        )
+
+    async def Sync(
+        self, path: str, collection: str, priority: int | None = None
+    ) -> list[dict[str, Any]] | TransactionStore.View | YNABClient.Error:
+        """
+        Return every entity in a collection, fetching only what changed since the
+        previous call for the same path. Within the cache TTL for the collection, and
+        until a write invalidates it, the local copy is returned without a request.
+        Requests wait for rate-limit quota at priority, as in Send.
+        """
+        key_path = "/" + path.strip("/")
+        async with self.sync.Lock(key_path):
+            rows = self.cache.Get(key_path)
+            if rows is not None:
+                return self._Copy(rows)
+            generation = self.cache.Generation(key_path)
+            knowledge = self.sync.Knowledge(key_path)
+            url = f"{self._base_url}{key_path}"
+            if knowledge is not None:
+                url += f"?last_knowledge_of_server={knowledge}"
+            # The body is decoded as it arrives and merged in batches, so a full
+            # download never holds more than one batch of decoded entities.
+            response = await self._Request("GET", url, None, priority, stream=True)
+            try:
+                if not response.is_success:
+                    await response.aread()
+                    self.metrics.Received("GET", url, len(response.content))
+                    return self._Result(response)
+                start = time.perf_counter()
+                stream = JSONStream(response.aiter_bytes())
+                full = knowledge is None
+                batch: list[dict[str, Any]] = []
+                async for key, entity in stream.Items():
+                    if key != collection:
+                        continue
+                    batch.append(entity)
+                    if len(batch) >= self._SYNC_BATCH:
+                        self.sync.Extend(key_path, collection, batch, full)
+                        full = False
+                        batch = []
+            finally:
+                await response.aclose()
+            # Reading the body, decoding it and merging it overlap in a streamed sync.
+            self.metrics.Stage("stream_sync", time.perf_counter() - start)
+            self.metrics.Received("GET", url, stream.size)
+            data = stream.rest.get("data", {})
+            if collection not in data:
+                raise YNABClient.Exceptions.UnexpectedError(
+                    f"Unexpected response format. No {collection} data found."
+                )
+            if batch or full:
+                self.sync.Extend(key_path, collection, batch, full)
+            if "server_knowledge" in data:
+                self.sync.Commit(key_path, data["server_knowledge"])
+            rows = self.sync.Rows(key_path)
+            self.cache.Put(key_path, rows, self.sync.Bytes(key_path), generation)
+            return self._Copy(rows)
+
+    async def Snapshot(
+        self, budget_id: str, priority: int | None = None
+    ) -> dict[str, Any] | YNABClient.Error:
+        """
+        Bring the local copies of a budget's accounts, payees, categories, months
+        and transactions up to date with one /budgets/{id} request, instead of one
+        per collection, and cache them as Sync would. The first call downloads the
+        whole budget; later ones ask for what changed since the oldest of the
+        copies. Returns the budget's own fields and its server_knowledge.
+        """
+        path = f"/budgets/{budget_id}"
+        paths = [f"{path}/{x}" for x in DeltaSync.BUDGET_COLLECTIONS]
+        async with AsyncExitStack() as locks:
+            for resource_path in paths:
+                await locks.enter_async_context(self.sync.Lock(resource_path))
+            generation = self.cache.Generation(path)
+            known = [self.sync.Knowledge(x) for x in paths]
+            knowledge = None if None in known else min(known)
+            url = f"{self._base_url}{path}"
+            if knowledge is not None:
+                url += f"?last_knowledge_of_server={knowledge}"
+            response = await self._Request("GET", url, None, priority, stream=True)
+            try:
+                if not response.is_success:
+                    await response.aread()
+                    self.metrics.Received("GET", url, len(response.content))
+                    return self._Result(response)
+                start = time.perf_counter()
+                stream = JSONStream(response.aiter_bytes(), at=("data", "budget"))
+                collections: dict[str, list[dict[str, Any]]] = {}
+                async for key, entity in stream.Items():
+                    collections.setdefault(key, []).append(entity)
+            finally:
+                await response.aclose()
+            self.metrics.Received("GET", url, stream.size)
+            data = stream.rest.get("data", {})
+            if "budget" not in data:
+                raise YNABClient.Exceptions.UnexpectedError(
+                    "Unexpected response format. No budget data found."
+                )
+            merged = self.sync.MergeBudget(
+                path, collections, knowledge is None, data.get("server_knowledge")
             )
+            self.metrics.Stage("stream_sync", time.perf_counter() - start)
+
+            for resource_path in merged.values():
+                self.cache.Put(
+                    resource_path,
+                    self.sync.Rows(resource_path),
+                    self.sync.Bytes(resource_path),
+                    generation,
+                )
+        budget = {k: v for k, v in data["budget"].items() if not isinstance(v, list)}
+        return {**budget, "server_knowledge": data.get("server_knowledge")}
+
+    @staticmethod
+    def _Copy(
+        rows: list[dict[str, Any]] | TransactionStore.View,
+    ) -> list[dict[str, Any]] | TransactionStore.View:
+        # Views never change once taken; lists are shared with the cache.
+        return rows if isinstance(rows, TransactionStore.View) else list(rows)
@@ -1,38 +1,136 @@
-from Account import Account
+import time
+
+started = time.perf_counter()
+
+# Only what answering initialize needs is imported here. Tool modules, and numpy
+# and the YNAB client with them, are imported by register_tools on first use.
 from AppContext import AppContext
-from Budget import Budget
-from Category import Category
+from ClientPool import ClientPool
 from contextlib import asynccontextmanager
+from LazyFastMCP import LazyFastMCP
 from mcp.server.fastmcp import FastMCP
-from Month import Month
-from Payee import Payee
-from Transaction import Transaction
-from YNABClient import YNABClient
+from Metrics import Metrics
+from SharedContext import SharedContext
+from starlette.applications import Starlette
+from Warmup import Warmup
+import os
+
+metrics = Metrics()
+
+
+def new_client(token: str):
+    from Store import Store
+    from YNABClient import YNABClient
+
+    return YNABClient(
+        api_token=token,
+        metrics=metrics,
+        store=Store.FromEnvironment(ClientPool.Prefix(token)),
+        tenant=ClientPool.Prefix(token).rstrip(":"),
+    )
+
+
+def new_context() -> AppContext:
+    clients = ClientPool(new_client)
+    return AppContext(clients=clients, warmup=Warmup.FromEnvironment(clients))
+
+
+# Every session, over stdio or HTTP, uses the same pool of per-token clients, and
+# the server token's reference data is prefetched in the background when
+# YNAB_WARMUP is set.
+shared = SharedContext(new_context)
 
 
 @asynccontextmanager
 async def app_lifespan(server: FastMCP):
-    ynab = YNABClient()
-    try:
-        yield AppContext(ynab=ynab)
-    finally:
-        pass
+    async with shared.Hold() as context:
+        yield context
+
+
+def register_tools(mcp: FastMCP) -> None:
+    from Account import Account
+    from Budget import Budget
+    from BudgetSnapshot import BudgetSnapshot
+    from Category import Category
+    from CategoryHistory import CategoryHistory
+    from Month import Month
+    from Payee import Payee
+    from Resolve import Resolve
+    from Status import Status
+    from Summary import Summary
+    from Transaction import Transaction
 
+    # Register all tools, timing each call and holding its client until it ends
+    metrics.Instrument(mcp)
+    ClientPool.Instrument(mcp)
+    Transaction.RegisterTools(mcp)
+    Budget.RegisterTools(mcp)
+    BudgetSnapshot.RegisterTools(mcp)
+    Category.RegisterTools(mcp)
+    CategoryHistory.RegisterTools(mcp)
+    Month.RegisterTools(mcp)
+    Account.RegisterTools(mcp)
+    Payee.RegisterTools(mcp)
+    Resolve.RegisterTools(mcp)
+    Status.RegisterTools(mcp)
+    Summary.RegisterTools(mcp)
+    Metrics.RegisterTools(mcp, metrics)
 
-# Initialize FastMCP server
-mcp = FastMCP(
+
+# Initialize FastMCP server. YNAB_TRANSPORT selects stdio (the default),
+# streamable-http or sse; the HTTP transports listen on YNAB_HOST:YNAB_PORT with
+# YNAB_WORKERS processes.
+workers = int(os.environ.get("YNAB_WORKERS", "1"))
+mcp = LazyFastMCP(
     "ynab",
+    register=register_tools,
+    on_register=lambda seconds: metrics.Stage("register_tools", seconds),
     lifespan=app_lifespan,
+    host=os.environ.get("YNAB_HOST", "127.0.0.1"),
+    port=int(os.environ.get("YNAB_PORT", "8000")),
+    # Sessions live in the process that created them, so with several workers any
+    # worker must be able to serve any request.
+    stateless_http=workers > 1
+    or os.environ.get("YNAB_STATELESS", "").lower() in ("1", "true", "yes"),
 )
+metrics.Stage("startup_import", time.perf_counter() - started)
+
+
+def http_app() -> Starlette:
+    """The ASGI app for the HTTP transports, holding the shared context while up."""
+    if os.environ.get("YNAB_TRANSPORT") == "sse":
+        app = mcp.sse_app()
+    else:
+        app = mcp.streamable_http_app()
+    lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def hold(app: Starlette):
+        async with shared.Hold(), lifespan(app):
+            yield
+
+    app.router.lifespan_context = hold
+    return app
 
-# Register all tools
-Transaction.RegisterTools(mcp)
-Budget.RegisterTools(mcp)
-Category.RegisterTools(mcp)
-Month.RegisterTools(mcp)
-Account.RegisterTools(mcp)
-Payee.RegisterTools(mcp)
 
 if __name__ == "__main__":
-    # Initialize and run the server
-    mcp.run(transport="stdio")
+    transport = os.environ.get("YNAB_TRANSPORT", "stdio")
+    if transport == "stdio":
+        # Initialize and run the server
+        mcp.run(transport="stdio")
+    elif transport not in ("streamable-http", "sse"):
+        raise ValueError(f"Unknown YNAB_TRANSPORT: {transport}")
+    elif workers > 1 and transport == "sse":
+        raise ValueError("YNAB_WORKERS > 1 requires YNAB_TRANSPORT=streamable-http")
+    else:
+        import uvicorn
+
+        uvicorn.run(
+            # Worker processes import the app themselves.
+            "main:http_app" if workers > 1 else http_app(),
+            factory=workers > 1,
+            host=mcp.settings.host,
+            port=mcp.settings.port,
+            workers=workers,
+            log_level=mcp.settings.log_level.lower(),
+        )
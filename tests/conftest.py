@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The server's modules import each other by their flat names from src.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("YNAB_API_TOKEN", "test-token")
+os.environ.pop("YNAB_STORE_PATH", None)
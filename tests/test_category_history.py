@@ -0,0 +1,70 @@
+import asyncio
+
+import httpx
+
+from Category import Category
+from CategoryHistory import CategoryHistory
+from Month import Month
+from YNABClient import YNABClient
+
+
+def month(month: str, budgeted: int) -> dict:
+    category = {"id": "c", "name": "Food", "budgeted": budgeted, "activity": 0}
+    return {"month": month, "categories": [{**category, "balance": budgeted}]}
+
+
+MONTHS = {"2024-01-01": month("2024-01-01", 10), "2024-02-01": month("2024-02-01", 20)}
+
+
+def history(handler, snapshot: bool) -> CategoryHistory:
+    async def main() -> CategoryHistory:
+        async with YNABClient(transport=httpx.MockTransport(handler)) as ynab:
+            if snapshot:
+                await ynab.Snapshot("last-used")
+            return await CategoryHistory.Get(
+                ynab,
+                [Category(id="c")],
+                Month(month="2023-12-01"),
+                Month(month="2024-02-01"),
+            )
+
+    return asyncio.run(main())
+
+
+def test_months_are_fetched_one_request_each():
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        key = request.url.path.rsplit("/", 1)[1]
+        data = MONTHS.get(key, {"month": key, "categories": []})
+        return httpx.Response(200, json={"data": {"month": data}})
+
+    result = history(handler, snapshot=False)
+    assert result.months == ["2023-12-01", "2024-01-01", "2024-02-01"]
+    assert result.categories[0].budgeted == [None, 10, 20]
+    assert result.categories[0].name == "Food"
+    assert sorted(requests) == [
+        f"/v1/budgets/last-used/months/{x}"
+        for x in ("2023-12-01", "2024-01-01", "2024-02-01")
+    ]
+
+
+def test_months_held_locally_are_not_fetched():
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path.endswith("/budgets/last-used"):
+            budget = {"id": "b", "name": "Budget", "months": list(MONTHS.values())}
+            data = {"budget": budget, "server_knowledge": 1}
+        else:
+            data = {"month": {"month": "2023-12-01", "categories": []}}
+        return httpx.Response(200, json={"data": data})
+
+    result = history(handler, snapshot=True)
+    assert result.categories[0].budgeted == [None, 10, 20]
+    assert requests == [
+        "/v1/budgets/last-used",
+        "/v1/budgets/last-used/months/2023-12-01",
+    ]
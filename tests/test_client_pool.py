@@ -0,0 +1,55 @@
+import asyncio
+
+from ClientPool import ClientPool
+
+
+class FakeClient:
+    def __init__(self, token: str) -> None:
+        self.token = token
+        self.closed = False
+
+    def Open(self) -> None:
+        pass
+
+    async def Close(self) -> None:
+        self.closed = True
+
+
+def test_default_token_is_not_evicted_when_idle():
+    async def main() -> None:
+        pool = ClientPool(FakeClient, idle=0.01, default_token="owner")
+        owner = pool.Get().ynab
+        other = pool.Get("other").ynab
+        await asyncio.sleep(0.02)
+        assert pool.Get("third").ynab is not other
+        assert pool.Get().ynab is owner
+        await asyncio.sleep(0)
+        assert other.closed and not owner.closed
+
+    asyncio.run(main())
+
+
+def test_evicted_client_closes_on_last_release():
+    async def main() -> None:
+        pool = ClientPool(FakeClient, max_tenants=1, default_token="owner")
+        with ClientPool.Scope():
+            held = pool.Get("a").ynab
+            pool.Get("b")
+            await asyncio.sleep(0)
+            assert not held.closed
+        await asyncio.sleep(0)
+        assert held.closed
+        await pool.Close()
+
+    asyncio.run(main())
+
+
+def test_unheld_evicted_client_closes_at_once():
+    async def main() -> None:
+        pool = ClientPool(FakeClient, max_tenants=1, default_token="owner")
+        first = pool.Get("a").ynab
+        pool.Get("b")
+        await asyncio.sleep(0)
+        assert first.closed
+
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+import asyncio
+
+from Coalescer import Coalescer
+
+
+def test_items_within_window_share_one_flush():
+    batches: list[list[int]] = []
+
+    async def flush(items: list[int]) -> list[int]:
+        batches.append(items)
+        return [x * 10 for x in items]
+
+    async def main() -> list[int]:
+        coalescer = Coalescer(window=0.01)
+        return list(
+            await asyncio.gather(*(coalescer.Submit("k", x, flush) for x in range(3)))
+        )
+
+    assert asyncio.run(main()) == [0, 10, 20]
+    assert batches == [[0, 1, 2]]
+
+
+def test_full_batch_flushes_without_waiting():
+    batches: list[list[int]] = []
+
+    async def flush(items: list[int]) -> list[int]:
+        batches.append(items)
+        return items
+
+    async def main() -> None:
+        coalescer = Coalescer(window=60, max_batch=2)
+        await asyncio.wait_for(
+            asyncio.gather(*(coalescer.Submit("k", x, flush) for x in range(2))), 1
+        )
+
+    asyncio.run(main())
+    assert batches == [[0, 1]]
+
+
+def test_flush_error_reaches_every_submitter():
+    async def flush(items: list[int]) -> list[int]:
+        raise RuntimeError("boom")
+
+    async def main() -> list[object]:
+        coalescer = Coalescer(window=0.01)
+        return await asyncio.gather(
+            *(coalescer.Submit("k", x, flush) for x in range(2)),
+            return_exceptions=True,
+        )
+
+    assert [str(x) for x in asyncio.run(main())] == ["boom", "boom"]
@@ -0,0 +1,37 @@
+import asyncio
+
+import httpx
+
+from Transaction import Transaction
+from YNABClient import YNABClient
+
+
+def test_payee_id_matches_imported_payee_name():
+    # Imported without a payee match, so only its imported name says who it was.
+    imported = {
+        "id": "old",
+        "account_id": "acc",
+        "amount": -4500,
+        "date": "2024-05-01",
+        "payee_id": None,
+        "import_payee_name": "COFFEE CO #123",
+    }
+    payees = [{"id": "p", "name": "Coffee Co #123"}]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/payees"):
+            data = {"payees": payees, "server_knowledge": 1}
+        else:
+            data = {"transactions": [imported], "server_knowledge": 1}
+        return httpx.Response(200, json={"data": data})
+
+    async def main() -> list:
+        async with YNABClient(transport=httpx.MockTransport(handler)) as ynab:
+            candidate = Transaction(
+                account_id="acc", amount=-4500, date="2024-05-02", payee_id="p"
+            )
+            return await Transaction.Duplicates(ynab, [candidate])
+
+    [duplicate] = asyncio.run(main())
+    assert duplicate.transaction_id == "old"
+    assert duplicate.reason == "amount_date_payee"
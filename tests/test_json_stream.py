@@ -0,0 +1,84 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from JSONStream import JSONStream
+
+
+async def chunked(parts: list[bytes]):
+    for part in parts:
+        yield part
+
+
+def decode(parts: list[bytes], at: tuple[str, ...] = ("data",)) -> tuple[list, dict]:
+    async def main() -> tuple[list, dict]:
+        stream = JSONStream(chunked(parts), at)
+        items = [x async for x in stream.Items()]
+        return items, stream.rest
+
+    return asyncio.run(main())
+
+
+def split(body: bytes, rng: random.Random) -> list[bytes]:
+    parts, start = [], 0
+    while start < len(body):
+        size = rng.randint(1, 8)
+        parts.append(body[start : start + size])
+        start += size
+    return parts
+
+
+@pytest.mark.parametrize(
+    "parts",
+    [
+        [b'{"data": {"transactions": [], "server_knowledge": 1.', b"5}}"],
+        [b'{"data": {"transactions": [], "server_knowledge": 1e', b"3}}"],
+        [b'{"data": {"transactions": [], "server_knowledge": -', b"2}}"],
+        [b'{"data": {"transactions": [], "server_knowledge": 12', b"34}}"],
+    ],
+)
+def test_number_split_across_chunks(parts):
+    body = json.loads(b"".join(parts))
+    assert decode(parts) == ([], body)
+
+
+def test_random_chunks_match_json_loads():
+    rng = random.Random(0)
+    for _ in range(200):
+        transactions = [
+            {
+                "id": f"t{i}",
+                "amount": rng.randint(-(10**9), 10**9),
+                "rate": rng.choice([0.5, -1.25e-3, 3e10, 7.75, -0.0]),
+                "memo": rng.choice([None, "café ☕", 'quote " and \\ slash', ""]),
+                "approved": rng.choice([True, False]),
+                "subtransactions": [{"amount": rng.randint(-99, 99)}],
+            }
+            for i in range(rng.randint(0, 5))
+        ]
+        # Numbers decoded on their own, as array elements and members, are the
+        # ones a chunk boundary can cut short.
+        numbers = [
+            rng.choice([rng.randint(-(10**6), 10**6), rng.uniform(-1e3, 1e3), 2.5e-7])
+            for _ in range(rng.randint(0, 5))
+        ]
+        document = {
+            "data": {
+                "transactions": transactions,
+                "amounts": numbers,
+                "server_knowledge": rng.choice([rng.randint(0, 10**6), 1.5, 1e3]),
+            }
+        }
+        body = json.dumps(document, ensure_ascii=rng.random() < 0.5).encode()
+        items, rest = decode(split(body, rng))
+        assert [x for key, x in items if key == "transactions"] == transactions
+        assert [x for key, x in items if key == "amounts"] == numbers
+        data = {**document["data"], "transactions": [], "amounts": []}
+        assert rest == {**document, "data": data}
+
+
+def test_truncated_number_at_end_is_an_error():
+    with pytest.raises(ValueError):
+        decode([b'{"data": {"server_knowledge": 1.'])
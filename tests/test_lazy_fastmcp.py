@@ -0,0 +1,81 @@
+import asyncio
+
+from mcp.server.fastmcp import FastMCP
+
+from LazyFastMCP import LazyFastMCP
+
+
+def server(source, registered: list[str]) -> LazyFastMCP:
+    def register(mcp: FastMCP) -> None:
+        registered.append("tools")
+
+        @mcp.tool()
+        async def add(a: int, b: int) -> int:
+            return a + b
+
+    mcp = LazyFastMCP("test", register=register)
+    # Key the cache on a stand-in for the source directory.
+    mcp._source = str(source)
+    return mcp
+
+
+def names(mcp: LazyFastMCP) -> list[str]:
+    return [x.name for x in asyncio.run(mcp.list_tools())]
+
+
+def setup(tmp_path, monkeypatch):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "Tool.py").write_text("VERSION = 1\n")
+    cache = tmp_path / "cache" / "tools.json"
+    monkeypatch.setenv("YNAB_TOOL_CACHE", str(cache))
+    return source, cache
+
+
+def test_tools_are_listed_from_the_cache(tmp_path, monkeypatch):
+    source, cache = setup(tmp_path, monkeypatch)
+    registered: list[str] = []
+    assert names(server(source, registered)) == ["add"]
+    assert registered == ["tools"] and cache.exists()
+
+    mcp = server(source, registered)
+    assert names(mcp) == ["add"]
+    assert registered == ["tools"]
+    # Calling a tool still registers it.
+    assert asyncio.run(mcp.call_tool("add", {"a": 1, "b": 2}))
+    assert registered == ["tools", "tools"]
+
+
+def test_source_changes_invalidate_the_cache(tmp_path, monkeypatch):
+    source, cache = setup(tmp_path, monkeypatch)
+    registered: list[str] = []
+    names(server(source, registered))
+    (source / "Tool.py").write_text("VERSION = 2\n")
+    assert names(server(source, registered)) == ["add"]
+    assert registered == ["tools", "tools"]
+    (source / "New.py").write_text("")
+    names(server(source, registered))
+    assert len(registered) == 3
+    # The rewritten cache matches again.
+    names(server(source, registered))
+    assert len(registered) == 3
+
+
+def test_unreadable_cache_is_rebuilt(tmp_path, monkeypatch):
+    source, cache = setup(tmp_path, monkeypatch)
+    cache.parent.mkdir()
+    cache.write_text("stale\n[]")
+    registered: list[str] = []
+    assert names(server(source, registered)) == ["add"]
+    assert registered == ["tools"]
+    assert not cache.read_text().startswith("stale")
+
+
+def test_empty_setting_disables_the_cache(tmp_path, monkeypatch):
+    source, cache = setup(tmp_path, monkeypatch)
+    monkeypatch.setenv("YNAB_TOOL_CACHE", "")
+    registered: list[str] = []
+    names(server(source, registered))
+    names(server(source, registered))
+    assert registered == ["tools", "tools"]
+    assert not cache.parent.exists()
@@ -0,0 +1,73 @@
+from NameIndex import NameIndex
+
+PAYEES = "/budgets/b/payees"
+CATEGORIES = "/budgets/b/categories"
+
+
+def index() -> NameIndex:
+    names = NameIndex()
+    names.Update(
+        PAYEES,
+        {
+            "p1": {"name": "Café Rouge"},
+            "p2": {"name": "Cafe Rouge Express"},
+            "p3": {"name": "Le Café Rouge"},
+            "p4": {"name": "Hardware Store", "transfer_account_id": None},
+        },
+        [],
+    )
+    names.Update(
+        CATEGORIES,
+        {
+            "c1": {"name": "Groceries", "category_group_name": "Bills"},
+            "c2": {"name": "Dining Out", "hidden": True},
+        },
+        [],
+    )
+    return names
+
+
+def test_exact_then_prefix_then_contains():
+    matches = index().Search([PAYEES], "cafe rouge")
+    assert [(x.entry.id, x.score) for x in matches] == [
+        ("p1", 1.0),
+        ("p2", 0.9),
+        ("p3", 0.8),
+    ]
+
+
+def test_misspellings_score_by_trigrams():
+    matches = index().Search([PAYEES, CATEGORIES], "grocerys")
+    assert matches[0].entry.id == "c1"
+    assert matches[0].entry.kind == "category"
+    assert 0.3 <= matches[0].score < 0.8
+    assert matches[0].entry.extra == {"category_group_name": "Bills", "hidden": None}
+
+
+def test_limit_keeps_the_best():
+    names = NameIndex()
+    names.Update(PAYEES, {f"p{i}": {"name": f"Store {i}"} for i in range(100)}, [])
+    names.Update(PAYEES, {"exact": {"name": "Store"}}, [])
+    matches = names.Search([PAYEES], "store", limit=3)
+    assert len(matches) == 3
+    assert matches[0].entry.id == "exact"
+    # Ties go to the shorter name, then alphabetically.
+    assert [x.entry.name for x in matches[1:]] == ["Store 0", "Store 1"]
+
+
+def test_only_the_given_paths_are_searched():
+    names = index()
+    assert names.Search([CATEGORIES], "rouge") == []
+    assert names.Search([PAYEES], "") == []
+
+
+def test_renames_and_deletes():
+    names = index()
+    names.Update(PAYEES, {"p1": {"name": "Bistro"}}, ["p2", "p3"])
+    assert names.Search([PAYEES], "cafe rouge") == []
+    assert [x.entry.id for x in names.Search([PAYEES], "bistro")] == ["p1"]
+    names.Update(PAYEES, {"p9": {"name": "Bakery"}}, [], replace=True)
+    assert names.Search([PAYEES], "bistro") == []
+    names.Forget(PAYEES)
+    assert names.Search([PAYEES], "bakery") == []
+    assert names.Search([CATEGORIES], "groceries")
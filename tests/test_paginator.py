@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from Paginator import Paginator
+
+ROWS = [{"id": str(i)} for i in range(5)]
+IDS = [x["id"] for x in ROWS]
+QUERY = {"budget": "last-used", "since": "2024-01-01"}
+
+
+def test_small_results_have_no_cursor():
+    page = Paginator(page_size=10).Serve(ROWS, IDS, QUERY)
+    assert page.rows == ROWS
+    assert page.next_cursor is None
+    assert page.total == 5
+
+
+def test_cursor_is_served_by_another_paginator():
+    first = Paginator(page_size=2).Serve(ROWS, IDS, QUERY, ["id"])
+    assert first.rows == ROWS[:2]
+
+    # Another worker, with nothing in memory, reads the same cursor.
+    other = Paginator(page_size=100)
+    position = other.Read(first.next_cursor)
+    assert position.query == QUERY
+    assert position.meta == ["id"]
+
+    rows = []
+    cursor = first.next_cursor
+    while cursor:
+        page = other.Serve(ROWS, IDS, position.query, position.meta, position)
+        rows += page.rows
+        cursor = page.next_cursor
+        if cursor:
+            position = other.Read(cursor)
+    assert first.rows + rows == ROWS
+
+
+def test_cursor_is_refused_when_results_change():
+    first = Paginator(page_size=2).Serve(ROWS, IDS, QUERY)
+    position = Paginator().Read(first.next_cursor)
+    changed = ROWS[1:]
+    with pytest.raises(Paginator.Exceptions.InvalidCursor, match="changed"):
+        Paginator().Serve(changed, [x["id"] for x in changed], QUERY, None, position)
+
+
+def test_cursor_expires(monkeypatch):
+    pages = Paginator(page_size=2, ttl=60)
+    cursor = pages.Serve(ROWS, IDS, QUERY).next_cursor
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    with pytest.raises(Paginator.Exceptions.InvalidCursor, match="expired"):
+        pages.Read(cursor)
+
+
+def test_next_cursor_keeps_first_expiry():
+    pages = Paginator(page_size=2)
+    first = pages.Read(pages.Serve(ROWS, IDS, QUERY).next_cursor)
+    second = pages.Read(pages.Serve(ROWS, IDS, QUERY, None, first).next_cursor)
+    assert second.expires == first.expires
+    assert second.offset == 4
+
+
+@pytest.mark.parametrize("cursor", ["nonsense", "e30=", "W10="])
+def test_invalid_cursor(cursor):
+    with pytest.raises(Paginator.Exceptions.InvalidCursor):
+        Paginator().Read(cursor)
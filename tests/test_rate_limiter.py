@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+import pytest
+
+from RateLimiter import RateLimiter
+from YNABClient import YNABClient
+
+
+def test_waiting_requests_go_in_priority_order():
+    async def main() -> list[str]:
+        # One request per 20ms, and the first is spent up front.
+        limiter = RateLimiter(limit=1, period=0.02)
+        await limiter.Acquire()
+        order: list[str] = []
+
+        async def request(name: str, priority: int) -> None:
+            await limiter.Acquire(priority)
+            order.append(name)
+
+        await asyncio.gather(
+            request("background", RateLimiter.Priority.BACKGROUND),
+            request("read", RateLimiter.Priority.READ),
+            request("write", RateLimiter.Priority.WRITE),
+            request("second read", RateLimiter.Priority.READ),
+        )
+        return order
+
+    assert asyncio.run(main()) == ["write", "read", "second read", "background"]
+
+
+def test_header_corrects_the_bucket():
+    limiter = RateLimiter(limit=200, period=3600)
+    limiter.Update("150/200")
+    assert limiter.Report().remaining == 50
+    limiter.Update("250/200")
+    assert limiter.Report().remaining == 0
+    assert limiter.Report().seconds_until_next_request > 0
+    for header in (None, "", "nonsense", "a/b"):
+        limiter.Update(header)
+    assert limiter.Report().remaining == 0
+
+
+def test_backoff_honours_retry_after_and_caps_jitter():
+    limiter = RateLimiter(limit=200, period=3600)
+    assert limiter.Backoff(0, "7") == 7.0
+    assert all(0 <= limiter.Backoff(2) <= 4 for _ in range(50))
+    assert all(0 <= limiter.Backoff(10) <= 60 for _ in range(50))
+    assert limiter.Report().retries == 101
+
+
+@pytest.mark.parametrize("throttled, status", [(2, 200), (5, 429)])
+def test_429s_are_retried_up_to_max_retries(throttled, status):
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if len(calls) <= throttled:
+            return httpx.Response(
+                429,
+                headers={"Retry-After": "0"},
+                json={"error": {"id": "429", "name": "too_many_requests"}},
+            )
+        return httpx.Response(
+            200, headers={"X-Rate-Limit": "1/200"}, json={"data": {"budgets": []}}
+        )
+
+    async def main() -> YNABClient.Response | YNABClient.Error:
+        async with YNABClient(transport=httpx.MockTransport(handler)) as ynab:
+            ynab.rate_limit.max_retries = 3
+            return await ynab.Send("GET", "/budgets")
+
+    result = asyncio.run(main())
+    if status == 200:
+        assert isinstance(result, YNABClient.Response)
+        assert len(calls) == 3
+    else:
+        assert isinstance(result, YNABClient.Error)
+        assert result.id == "429"
+        assert len(calls) == 4
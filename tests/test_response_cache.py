@@ -0,0 +1,98 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ResponseCache import ResponseCache
+from TransactionStore import TransactionStore
+from YNABClient import YNABClient
+
+
+def test_put_skipped_after_invalidate():
+    cache = ResponseCache()
+    generation = cache.Generation("/budgets/b/accounts")
+    cache.Invalidate("/budgets/b/transactions")
+    cache.Put("/budgets/b/accounts", "stale", 1, generation)
+    assert cache.Get("/budgets/b/accounts") is None
+
+
+def test_put_kept_after_other_budget_write():
+    cache = ResponseCache()
+    generation = cache.Generation("/budgets/b/accounts")
+    cache.Invalidate("/budgets/other/transactions")
+    cache.Put("/budgets/b/accounts", "fresh", 1, generation)
+    assert cache.Get("/budgets/b/accounts") == "fresh"
+
+
+def test_last_used_read_sees_any_write():
+    cache = ResponseCache()
+    generation = cache.Generation("/budgets/last-used/accounts")
+    cache.Invalidate("/budgets/b/transactions")
+    cache.Put("/budgets/last-used/accounts", "stale", 1, generation)
+    assert cache.Get("/budgets/last-used/accounts") is None
+
+
+def test_write_during_sync_is_not_lost():
+    transactions = [{"id": "a", "date": "2024-01-01", "amount": 1}]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            transactions.append({"id": "b", "date": "2024-01-02", "amount": 2})
+            return httpx.Response(201, json={"data": {"transaction": {}}})
+        rows = list(transactions)
+        await asyncio.sleep(0.05)
+        return httpx.Response(
+            200, json={"data": {"transactions": rows, "server_knowledge": 1}}
+        )
+
+    async def run() -> list[str]:
+        async with YNABClient(transport=httpx.MockTransport(handler)) as ynab:
+            path = "/budgets/last-used/transactions"
+            read = asyncio.create_task(ynab.Sync(path, "transactions"))
+            await asyncio.sleep(0.01)
+            await ynab.Send("POST", path, json={})
+            await read
+            return sorted(x["id"] for x in await ynab.Sync(path, "transactions"))
+
+    assert asyncio.run(run()) == ["a", "b"]
+
+
+def test_delta_syncs_do_not_grow_cached_size():
+    payees = [{"id": f"p{i}", "name": f"Payee {i}"} for i in range(50)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        delta = "last_knowledge_of_server" in str(request.url)
+        rows = payees[:1] if delta else payees
+        return httpx.Response(
+            200, json={"data": {"payees": rows, "server_knowledge": 1}}
+        )
+
+    async def run() -> list[int]:
+        async with YNABClient(transport=httpx.MockTransport(handler)) as ynab:
+            sizes = []
+            for _ in range(3):
+                await ynab.Sync("/budgets/b/payees", "payees")
+                sizes.append(ynab.cache.Report().bytes)
+                ynab.cache.Invalidate("/budgets/b/payees")
+            return sizes
+
+    sizes = asyncio.run(run())
+    assert sizes[0] == sizes[1] == sizes[2] > 0
+
+
+@pytest.mark.skipif(not TransactionStore.Supported(), reason="needs numpy")
+def test_large_transaction_store_fits_default_cache():
+    store = TransactionStore()
+    store.update(
+        {
+            f"t{i}": {
+                "id": f"t{i}",
+                "amount": i,
+                "date": "2024-01-01",
+                "memo": f"memo {i}",
+                "payee_id": f"p{i % 500}",
+            }
+            for i in range(100_000)
+        }
+    )
+    assert 0 < store.Bytes() < ResponseCache().Report().max_bytes
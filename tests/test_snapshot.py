@@ -0,0 +1,112 @@
+import asyncio
+
+import httpx
+
+from YNABClient import YNABClient
+
+PATH = "/budgets/b"
+
+FULL = {
+    "id": "b",
+    "name": "Home",
+    "currency_format": {"iso_code": "EUR"},
+    "accounts": [{"id": "acc", "name": "Checking"}],
+    "payees": [{"id": "p1", "name": "Grocer"}, {"id": "p2", "name": "Landlord"}],
+    "category_groups": [{"id": "g", "name": "Bills"}],
+    "categories": [{"id": "food", "name": "Food", "category_group_id": "g"}],
+    "months": [
+        {
+            "month": "2024-01-01",
+            "income": 100,
+            "categories": [{"id": "food", "name": "Food", "budgeted": 50}],
+        }
+    ],
+    "transactions": [
+        {"id": "t1", "amount": -30, "account_id": "acc", "payee_id": "p1"},
+        {"id": "t2", "amount": -20, "account_id": "acc", "category_id": "food"},
+    ],
+    "subtransactions": [
+        {"id": "s1", "transaction_id": "t1", "amount": -10, "category_id": "food"},
+    ],
+}
+
+DELTA = {
+    "id": "b",
+    "name": "Home",
+    "payees": [{"id": "p2", "name": "Landlord", "deleted": True}],
+    "months": [
+        {
+            "month": "2024-01-01",
+            "income": 100,
+            "categories": [{"id": "food", "name": "Food", "budgeted": 75}],
+        }
+    ],
+    # A new split part arrives without its transaction.
+    "subtransactions": [
+        {"id": "s2", "transaction_id": "t1", "amount": -20, "payee_id": "p1"},
+    ],
+}
+
+
+def snapshots(responses: list[httpx.Response]):
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        return responses.pop(0)
+
+    async def main():
+        async with YNABClient(transport=httpx.MockTransport(handler)) as ynab:
+            results = [await ynab.Snapshot("b") for _ in range(len(responses))]
+            return ynab, results
+
+    ynab, results = asyncio.run(main())
+    return ynab, results, requests
+
+
+def budget(data: dict, knowledge: int) -> httpx.Response:
+    return httpx.Response(
+        200, json={"data": {"budget": data, "server_knowledge": knowledge}}
+    )
+
+
+def test_full_then_delta():
+    ynab, results, requests = snapshots([budget(FULL, 5), budget(DELTA, 6)])
+    assert requests[0].endswith("/budgets/b")
+    assert requests[1].endswith("/budgets/b?last_knowledge_of_server=5")
+    assert results[0] == {
+        "id": "b",
+        "name": "Home",
+        "currency_format": {"iso_code": "EUR"},
+        "server_knowledge": 5,
+    }
+
+    categories = ynab.sync.Rows(f"{PATH}/categories")
+    assert [(x["id"], x["category_group_name"]) for x in categories] == [
+        ("food", "Bills")
+    ]
+    assert [x["id"] for x in ynab.sync.Rows(f"{PATH}/payees")] == ["p1"]
+    assert [x["budgeted"] for x in ynab.sync.Rows(f"{PATH}/month_categories")] == [75]
+    assert "categories" not in ynab.sync.Rows(f"{PATH}/months")[0]
+
+    transactions = {x["id"]: x for x in ynab.sync.Rows(f"{PATH}/transactions")}
+    assert transactions["t1"]["payee_name"] == "Grocer"
+    assert transactions["t1"]["account_name"] == "Checking"
+    assert transactions["t2"]["category_name"] == "Food"
+    parts = transactions["t1"]["subtransactions"]
+    assert [(x["id"], x["amount"]) for x in parts] == [("s1", -10), ("s2", -20)]
+    assert parts[0]["category_name"] == "Food"
+    assert parts[1]["payee_name"] == "Grocer"
+
+    for resource in ("accounts", "payees", "categories", "months", "transactions"):
+        assert ynab.sync.Knowledge(f"{PATH}/{resource}") == 6
+        assert ynab.cache.Get(f"{PATH}/{resource}") is not None
+
+
+def test_error_leaves_the_copies_alone():
+    error = {"error": {"id": "404.2", "name": "resource_not_found", "detail": "x"}}
+    ynab, results, _ = snapshots([httpx.Response(404, json=error)])
+    assert isinstance(results[0], YNABClient.Error)
+    assert results[0].id == "404.2"
+    assert ynab.sync.Knowledge(f"{PATH}/transactions") is None
+    assert ynab.cache.Get(f"{PATH}/transactions") is None
@@ -0,0 +1,97 @@
+import pytest
+
+from Summary import Summary
+from TransactionStore import TransactionStore
+
+ROWS = [
+    {
+        "id": "a",
+        "amount": -1000,
+        "date": "2024-01-03",
+        "category_id": "food",
+        "category_name": "Food",
+        "payee_id": "p1",
+        "payee_name": "Cafe",
+    },
+    {
+        "id": "b",
+        "amount": -3000,
+        "date": "2024-02-10",
+        "category_id": "food",
+        "category_name": "Food",
+        "payee_id": "p2",
+        "payee_name": "Grocer",
+    },
+    {
+        "id": "c",
+        "amount": 5000,
+        "date": "2024-02-01",
+        "category_id": "income",
+        "category_name": "Income",
+        "payee_id": "p3",
+        "payee_name": "Employer",
+    },
+    {
+        "id": "d",
+        "amount": -6000,
+        "date": "2024-02-20",
+        "category_id": None,
+        "payee_id": "p2",
+        "payee_name": "Grocer",
+        "subtransactions": [
+            {
+                "id": "d1",
+                "amount": -4000,
+                "category_id": "food",
+                "category_name": "Food",
+            },
+            {
+                "id": "d2",
+                "amount": -2000,
+                "category_id": "home",
+                "category_name": "Home",
+            },
+        ],
+    },
+]
+
+
+def totals(summary: Summary) -> dict:
+    return {
+        tuple(x.group): (x.total, x.inflow, x.outflow, x.count) for x in summary.rows
+    }
+
+
+def sources():
+    yield [dict(x) for x in ROWS]
+    if TransactionStore.Supported():
+        store = TransactionStore()
+        store.update({x["id"]: x for x in ROWS})
+        yield store.values()
+
+
+@pytest.mark.parametrize("rows", list(sources()))
+def test_splits_are_totalled_by_their_parts(rows):
+    summary = Summary.Summarize(rows, ["category"])
+    assert totals(summary) == {
+        ("food",): (-8000, 0, -8000, 3),
+        ("income",): (5000, 5000, 0, 1),
+        ("home",): (-2000, 0, -2000, 1),
+    }
+    # Largest totals first, with names alongside ids.
+    assert summary.rows[0].names == ["Food"]
+    assert summary.transaction_count == 5
+
+
+@pytest.mark.parametrize("rows", list(sources()))
+def test_months_are_in_order(rows):
+    summary = Summary.Summarize(rows, ["month"])
+    assert [x.group for x in summary.rows] == [["2024-01"], ["2024-02"]]
+    assert (summary.rows[1].total, summary.rows[1].count) == (-4000, 4)
+
+
+def test_unknown_grouping_is_rejected():
+    with pytest.raises(ValueError, match="Choose from"):
+        Summary.Summarize(ROWS, ["colour"])
+    with pytest.raises(ValueError):
+        Summary.Summarize(ROWS, [])
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+import pytest
+
+from AppContext import AppContext
+from ClientPool import ClientPool
+from Metrics import Metrics
+
+
+def context(headers: dict[str, str] | None) -> SimpleNamespace:
+    clients = ClientPool(lambda token: SimpleNamespace(token=token, Open=lambda: None))
+    request = SimpleNamespace(headers=headers) if headers is not None else None
+    return SimpleNamespace(
+        request_context=SimpleNamespace(
+            request=request, lifespan_context=AppContext(clients=clients)
+        )
+    )
+
+
+def test_http_request_without_token_is_refused(monkeypatch):
+    monkeypatch.delenv("YNAB_ALLOW_SERVER_TOKEN", raising=False)
+    with pytest.raises(ValueError, match="Missing YNAB token"):
+        AppContext.Tenant(context({}))
+
+
+def test_http_request_may_opt_in_to_server_token(monkeypatch):
+    monkeypatch.setenv("YNAB_ALLOW_SERVER_TOKEN", "1")
+    assert AppContext.Tenant(context({})).ynab.token == "test-token"
+
+
+def test_http_request_uses_its_own_token():
+    headers = {"authorization": "Bearer mine"}
+    assert AppContext.Tenant(context(headers)).ynab.token == "mine"
+
+
+def test_stdio_uses_server_token():
+    assert AppContext.Tenant(context(None)).ynab.token == "test-token"
+
+
+def test_rate_limit_is_reported_per_tenant():
+    metrics = Metrics()
+    metrics.Request("GET", "/budgets", 200, 0.1, "10/200", tenant="a")
+    metrics.Request("GET", "/budgets", 200, 0.1, "150/200", tenant="b")
+    assert metrics.Get("a").rate_limit.used == 10
+    assert metrics.Get("b").rate_limit.used == 150
+    assert metrics.Get("c").rate_limit.used is None
+    assert metrics.Get(None).rate_limit.used is None
+    assert 'ynab_mcp_rate_limit_used{tenant="a"} 10' in metrics.Prometheus()
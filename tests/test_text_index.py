@@ -0,0 +1,85 @@
+from TextIndex import TextIndex
+
+PATH = "/budgets/b/transactions"
+
+
+def index(rows: list[dict]) -> TextIndex:
+    text = TextIndex()
+    text.Update(PATH, {x["id"]: x for x in rows}, [])
+    return text
+
+
+def ranked(text: TextIndex, query: str) -> list[str]:
+    scores = text.Search(PATH, query)
+    return sorted(scores, key=lambda x: (-scores[x], x))
+
+
+def test_exact_words_rank_above_prefixes_and_typos():
+    text = index(
+        [
+            {"id": "groceries", "payee_name": "Groceries"},
+            {"id": "grocery", "payee_name": "Grocery Outlet"},
+            {"id": "typo", "memo": "grocerise"},
+            {"id": "other", "payee_name": "Cinema"},
+        ]
+    )
+    assert ranked(text, "groceries")[0] == "groceries"
+    assert ranked(text, "grocery")[0] == "grocery"
+    # A partial word matches every word it starts, equally.
+    scores = text.Search(PATH, "grocer")
+    assert set(scores) == {"groceries", "grocery", "typo"}
+    assert len(set(scores.values())) == 1
+    # A misspelled query still finds the closest word, below an exact match.
+    scores = text.Search(PATH, "grocries")
+    assert set(scores) == {"groceries"}
+    assert scores["groceries"] < text.Search(PATH, "groceries")["groceries"]
+
+
+def test_rare_words_count_for_more():
+    rows = [{"id": f"c{i}", "memo": "coffee"} for i in range(20)]
+    rows += [
+        {"id": "rare", "memo": "coffee beans"},
+        {"id": "common", "memo": "coffee coffee"},
+    ]
+    text = index(rows)
+    scores = text.Search(PATH, "coffee beans")
+    assert ranked(text, "coffee beans")[0] == "rare"
+    assert scores["rare"] > 2 * scores["common"]
+
+
+def test_words_from_every_field_and_live_subtransactions():
+    text = index(
+        [
+            {
+                "id": "a",
+                "payee_name": "Store",
+                "import_payee_name_original": "STORE 123 CARD",
+                "subtransactions": [
+                    {"memo": "batteries"},
+                    {"memo": "candles", "deleted": True},
+                ],
+            }
+        ]
+    )
+    assert set(text.Search(PATH, "card")) == {"a"}
+    assert set(text.Search(PATH, "batteries")) == {"a"}
+    assert text.Search(PATH, "candles") == {}
+
+
+def test_updates_and_deletes_are_reindexed():
+    text = index([{"id": "a", "memo": "rent"}, {"id": "b", "memo": "rent"}])
+    text.Update(PATH, {"a": {"id": "a", "memo": "utilities"}}, ["b"])
+    assert text.Search(PATH, "rent") == {}
+    assert set(text.Search(PATH, "utilities")) == {"a"}
+    # Prefix lookups see words added after the first search.
+    text.Update(PATH, {"c": {"id": "c", "memo": "utility bill"}}, [])
+    assert set(text.Search(PATH, "util")) == {"a", "c"}
+
+
+def test_replace_starts_over_and_other_paths_are_ignored():
+    text = index([{"id": "a", "memo": "rent"}])
+    text.Update(PATH, {"b": {"id": "b", "memo": "rent"}}, [], replace=True)
+    assert set(text.Search(PATH, "rent")) == {"b"}
+    text.Update("/budgets/b/payees", {"p": {"id": "p", "memo": "rent"}}, [])
+    assert set(text.Search(PATH, "rent")) == {"b"}
+    assert text.Search("/budgets/other/transactions", "rent") == {}
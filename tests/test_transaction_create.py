@@ -0,0 +1,30 @@
+import asyncio
+import json
+
+import httpx
+
+from Transaction import Transaction
+from YNABClient import YNABClient
+
+
+def test_transaction_missing_from_response_gets_an_error():
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent = json.loads(request.content)["transactions"]
+        created = [{**sent[0], "id": "new"}]
+        return httpx.Response(
+            201,
+            json={"data": {"transactions": created, "duplicate_import_ids": []}},
+        )
+
+    async def main() -> list[Transaction.Result]:
+        async with YNABClient(transport=httpx.MockTransport(handler)) as ynab:
+            transactions = [
+                Transaction(account_id="a", amount=-100, date="2024-01-01"),
+                Transaction(account_id="a", amount=-200, date="2024-01-02"),
+            ]
+            return await Transaction.CreateMany(ynab, transactions)
+
+    created, missing = asyncio.run(main())
+    assert created.status == "created" and created.transaction.id == "new"
+    assert missing.status == "error" and missing.transaction is None
+    assert missing.error is not None and missing.error.id == "500"
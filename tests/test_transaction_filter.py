@@ -0,0 +1,89 @@
+import pytest
+
+from Transaction import Transaction
+from TransactionStore import TransactionStore
+
+pytestmark = pytest.mark.skipif(
+    not TransactionStore.Supported(), reason="TransactionStore needs numpy"
+)
+
+ROWS = [
+    {
+        "id": "a",
+        "date": "2024-01-05",
+        "amount": -1500,
+        "cleared": "cleared",
+        "approved": True,
+        "account_id": "checking",
+        "category_id": "food",
+        "payee_id": "cafe",
+        "memo": "Lunch with Ana",
+    },
+    {
+        "id": "b",
+        "date": "2024-02-10",
+        "amount": 250000,
+        "cleared": "reconciled",
+        "approved": True,
+        "account_id": "checking",
+        "category_id": "income",
+        "payee_id": "employer",
+        "memo": None,
+    },
+    {
+        "id": "c",
+        "date": "2024-02-29",
+        "amount": -30000,
+        "cleared": "uncleared",
+        "approved": False,
+        "account_id": "card",
+        "category_id": None,
+        "payee_id": "grocer",
+        "memo": "weekly LUNCH prep",
+    },
+    {
+        "id": "d",
+        "date": "2024-03-01",
+        "amount": 0,
+        "cleared": "uncleared",
+        "approved": False,
+        "account_id": "card",
+        "category_id": "food",
+        "payee_id": None,
+    },
+]
+
+FILTERS = [
+    ({}, "abcd"),
+    ({"start_date": "2024-02-10"}, "bcd"),
+    ({"end_date": "2024-02-29"}, "abc"),
+    ({"start_date": "2024-02-01", "end_date": "2024-02-29"}, "bc"),
+    ({"min_amount": 0}, "bd"),
+    ({"max_amount": -1500}, "ac"),
+    ({"min_amount": -30000, "max_amount": -30000}, "c"),
+    ({"cleared": ["uncleared", "reconciled"]}, "bcd"),
+    ({"approved": False}, "cd"),
+    ({"approved": True}, "ab"),
+    ({"account_ids": ["card"]}, "cd"),
+    ({"category_ids": ["food", "income"]}, "abd"),
+    ({"payee_ids": ["cafe", "grocer", "nobody"]}, "ac"),
+    ({"memo_contains": "lunch"}, "ac"),
+    ({"memo_contains": "ANA"}, "a"),
+    ({"account_ids": ["card"], "max_amount": -1, "memo_contains": "prep"}, "c"),
+    ({"start_date": "2025-01-01"}, ""),
+]
+
+
+def ids(rows) -> str:
+    return "".join(sorted(x["id"] for x in rows))
+
+
+@pytest.mark.parametrize("conditions, expected", FILTERS)
+def test_view_and_dict_rows_filter_alike(conditions, expected):
+    filter = Transaction.Filter(**conditions)
+    store = TransactionStore()
+    store.update({x["id"]: x for x in ROWS})
+    view = filter.Apply(store.values())
+    assert isinstance(view, TransactionStore.View)
+    assert ids(view) == expected
+    assert ids(filter.Apply([dict(x) for x in ROWS])) == expected
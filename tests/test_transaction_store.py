@@ -0,0 +1,66 @@
+import pytest
+
+from TransactionStore import TransactionStore
+
+pytestmark = pytest.mark.skipif(
+    not TransactionStore.Supported(), reason="TransactionStore needs numpy"
+)
+
+
+def row(id: str, amount: int, date: str, **fields) -> dict:
+    return {"id": id, "amount": amount, "date": date, **fields}
+
+
+def test_rows_round_trip():
+    store = TransactionStore()
+    transaction = row(
+        "a",
+        -1500,
+        "2024-03-05",
+        memo="lunch",
+        approved=True,
+        payee_name="Cafe",
+        subtransactions=[{"id": "s", "amount": -1500}],
+    )
+    store.update({"a": transaction})
+    stored = store.get("a")
+    assert {k: stored[k] for k in transaction} == transaction
+    assert store.get("missing") is None
+
+
+def test_update_replaces_and_view_keeps_its_rows():
+    store = TransactionStore()
+    store.update({"a": row("a", 1, "2024-01-01"), "b": row("b", 2, "2024-01-02")})
+    before = store.values()
+    store.update({"a": row("a", 10, "2024-01-01")})
+    store.pop("b")
+    assert [x["amount"] for x in before] == [1, 2]
+    assert [x["amount"] for x in store.values()] == [10]
+    assert len(store) == 1 and "b" not in store
+
+
+def test_masks_filter_and_sort():
+    store = TransactionStore()
+    store.update(
+        {
+            "a": row("a", 300, "2024-01-31", account_id="x"),
+            "b": row("b", 100, "2024-02-01", account_id="y"),
+            "c": row("c", 200, "2024-02-15", account_id="x"),
+        }
+    )
+    rows = store.values()
+    february = rows.Range("date", "2024-02", None)
+    assert [x["id"] for x in rows.Where(february)] == ["b", "c"]
+    in_x = rows.In("account_id", ["x"])
+    assert [x["id"] for x in rows.Where(in_x).SortedBy("amount")] == ["c", "a"]
+    assert rows.Column("month") == ["2024-01", "2024-02", "2024-02"]
+    assert [x["id"] for x in store.Select(["c", "zzz", "a"])] == ["c", "a"]
+
+
+def test_compacted_drops_retired_rows():
+    store = TransactionStore()
+    for i in range(3000):
+        store.update({"a": row("a", i, "2024-01-01")})
+    compacted = store.Compacted()
+    assert compacted is not store
+    assert [x["amount"] for x in compacted.values()] == [2999]
@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+import httpx
+
+from Transaction import Transaction
+from YNABClient import YNABClient
+
+
+def run(handler, *transactions: Transaction) -> list:
+    async def main() -> list:
+        async with YNABClient(transport=httpx.MockTransport(handler)) as ynab:
+            return list(await asyncio.gather(*(x.Update(ynab) for x in transactions)))
+
+    return asyncio.run(main())
+
+
+def test_rejected_batch_is_retried_per_transaction():
+    requests: list[tuple[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        body = json.loads(request.content)
+        if request.method == "PATCH":
+            error = {"id": "400", "name": "bad_request", "detail": "invalid memo"}
+            return httpx.Response(400, json={"error": error})
+        transaction = body["transaction"]
+        if transaction["id"] == "bad":
+            error = {"id": "400", "name": "bad_request", "detail": "invalid memo"}
+            return httpx.Response(400, json={"error": error})
+        return httpx.Response(200, json={"data": {"transaction": transaction}})
+
+    good, bad = run(handler, Transaction(id="good", memo="a"), Transaction(id="bad"))
+    assert isinstance(good, Transaction) and good.memo == "a"
+    assert isinstance(bad, YNABClient.Error) and bad.detail == "invalid memo"
+    assert requests[0] == ("PATCH", "/v1/budgets/last-used/transactions")
+    assert sorted(requests[1:]) == [
+        ("PUT", "/v1/budgets/last-used/transactions/bad"),
+        ("PUT", "/v1/budgets/last-used/transactions/good"),
+    ]
+
+
+def test_missing_transaction_is_reported_per_item():
+    def handler(request: httpx.Request) -> httpx.Response:
+        rows = [
+            x for x in json.loads(request.content)["transactions"] if x["id"] != "gone"
+        ]
+        return httpx.Response(200, json={"data": {"transactions": rows}})
+
+    kept, gone = run(handler, Transaction(id="kept"), Transaction(id="gone"))
+    assert isinstance(kept, Transaction) and kept.id == "kept"
+    assert isinstance(gone, YNABClient.Error) and "gone" in gone.detail
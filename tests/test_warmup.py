@@ -0,0 +1,19 @@
+import asyncio
+
+import pytest
+
+import Warmup as module
+from ClientPool import ClientPool
+from Warmup import Warmup
+
+
+@pytest.mark.skipif(module.fcntl is None, reason="needs fcntl")
+def test_only_one_process_leads_the_warmup(tmp_path, monkeypatch):
+    monkeypatch.setattr(module.tempfile, "gettempdir", lambda: str(tmp_path))
+    pool = ClientPool(lambda token: None)
+    first, second = Warmup(pool, "b"), Warmup(pool, "b")
+    assert first._Lead()
+    assert not second._Lead()
+    assert Warmup(pool, "other")._Lead()
+    asyncio.run(first.Stop())
+    assert second._Lead()